@@ -1,64 +1,252 @@
 import ast
+import hashlib
+import hmac
+import json
 import os
+import secrets
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+# Persistent verdicts, keyed by SHA-256 of the source. Kept outside the tool tree (owner-only
+# permissions) and HMAC-signed per entry, so a writable file cannot pre-approve a source.
+STATE_DIR = os.path.join(os.path.expanduser("~"), ".cycos")
+VERDICTS_PATH = os.getenv("TOOL_INSPECTOR_VERDICTS_PATH") or os.path.join(STATE_DIR, "inspector_verdicts.jsonl")
+# Signing key: TOOL_INSPECTOR_KEY, else a random key generated once into this owner-only file
+KEY_PATH = os.getenv("TOOL_INSPECTOR_KEY_PATH") or os.path.join(STATE_DIR, "inspector.key")
+# Below this many uncached files a process pool costs more than it saves
+POOL_THRESHOLD = 64
+
+def _scan_source(source: bytes, forbidden_imports, forbidden_functions) -> List[str]:
+    """
+    All violations in a file's raw bytes, in one pass over the AST (process-pool entry point).
+    Parsing the bytes honours coding cookies like the interpreter does; undecodable files fail to parse.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        return [f"Failed to parse: {e}"]
+    violations = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Name) and (func.id in forbidden_functions or func.id == "__import__"):
+                violations.append((node.lineno, f"Security Violation: Forbidden function '{func.id}' (line {node.lineno})"))
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.split('.')[0] in forbidden_imports:
+                    violations.append((node.lineno, f"Security Violation: Forbidden import '{alias.name}' (line {node.lineno})"))
+        elif isinstance(node, ast.ImportFrom):
+            if node.module and node.module.split('.')[0] in forbidden_imports:
+                violations.append((node.lineno, f"Security Violation: Forbidden import from '{node.module}' (line {node.lineno})"))
+    # ast.walk is breadth-first; report in source order
+    return [message for _, message in sorted(violations, key=lambda v: v[0])]
 
 class ToolInspector:
     """
     Security Validator for Dynamic Tools.
     Parses Python code AST to accept/reject based on safety rules.
+    Verdicts are cached by SHA-256 of the source and persisted, so unchanged files are never re-parsed.
     """
-    
+
     FORBIDDEN_IMPORTS = {
         "os", "subprocess", "sys", "socket", "shutil", "urllib"
     }
-    
+
     FORBIDDEN_FUNCTIONS = {
         "eval", "exec", "compile", "open"
     }
 
+    def __init__(self, verdicts_path: Optional[str] = VERDICTS_PATH, key: Optional[bytes] = None):
+        self.verdicts_path = verdicts_path
+        self._key = key or (self._load_key() if verdicts_path else None)
+        self._lock = threading.Lock()
+        self._unsaved: Dict[str, List[str]] = {}
+        self._verdicts: Dict[str, List[str]] = self._load_verdicts()
+
+    @property
+    def rules_fingerprint(self) -> str:
+        """Changes whenever the rules (or the Python grammar) change, invalidating stored verdicts."""
+        rules = [sorted(self.FORBIDDEN_IMPORTS), sorted(self.FORBIDDEN_FUNCTIONS), list(sys.version_info[:2])]
+        return hashlib.sha256(json.dumps(rules).encode("utf-8")).hexdigest()
+
     def inspect_file(self, file_path: str) -> bool:
         """
         Returns True if the file is safe, False otherwise.
         """
+        violations = self.find_violations(file_path)
+        for violation in violations:
+            print(f"[Inspector] {violation} in {file_path}")
+        return not violations
+
+    def find_violations(self, file_path: str, save: bool = True) -> List[str]:
+        """All violations in a file (empty if it is safe). With save=False new verdicts wait for save()."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source = f.read()
-            
-            tree = ast.parse(source)
-            
-            for node in ast.walk(tree):
-                # Check imports
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if self._check_import(node):
-                        return False
-                
-                # Check function calls
-                if isinstance(node, ast.Call):
-                    if self._check_call(node):
-                        return False
-
-            return True
-
-        except Exception as e:
-            print(f"[Inspector] Failed to parse {file_path}: {e}")
-            return False
-
-    def _check_import(self, node) -> bool:
-        """Returns True if forbidden import found."""
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                if alias.name.split('.')[0] in self.FORBIDDEN_IMPORTS:
-                    print(f"[Inspector] Security Violation: Forbidden import '{alias.name}'")
-                    return True
-        elif isinstance(node, ast.ImportFrom):
-            if node.module and node.module.split('.')[0] in self.FORBIDDEN_IMPORTS:
-                print(f"[Inspector] Security Violation: Forbidden import from '{node.module}'")
-                return True
-        return False
-
-    def _check_call(self, node) -> bool:
-        """Returns True if forbidden function called."""
-        if isinstance(node.func, ast.Name):
-            if node.func.id in self.FORBIDDEN_FUNCTIONS or node.func.id == "__import__":
-                print(f"[Inspector] Security Violation: Forbidden function '{node.func.id}'")
-                return True
-        return False
+            digest, source = self._read(file_path)
+        except OSError as e:
+            return [f"Failed to read: {e}"]
+        violations = self._cached(digest)
+        if violations is None:
+            violations = _scan_source(source, self.FORBIDDEN_IMPORTS, self.FORBIDDEN_FUNCTIONS)
+            self._remember(digest, violations)
+            if save:
+                self.save()
+        return violations
+
+    def inspect_many(self, paths, max_workers: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Inspect files and directory trees (every *.py below them).
+        Returns {file_path: violations}; uncached files are scanned across a process pool.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        results: Dict[str, List[str]] = {}
+        pending: Dict[str, List[str]] = {}  # digest -> paths sharing that source
+        sources: Dict[str, bytes] = {}
+        for file_path in self._expand(paths):
+            try:
+                digest, source = self._read(file_path)
+            except OSError as e:
+                results[file_path] = [f"Failed to read: {e}"]
+                continue
+            violations = self._cached(digest)
+            if violations is not None:
+                results[file_path] = violations
+            else:
+                pending.setdefault(digest, []).append(file_path)
+                sources[digest] = source
+
+        if pending:
+            digests = list(pending)
+            args = ([sources[d] for d in digests], [self.FORBIDDEN_IMPORTS] * len(digests), [self.FORBIDDEN_FUNCTIONS] * len(digests))
+            workers = max_workers or os.cpu_count() or 1
+            if workers == 1 or len(digests) < POOL_THRESHOLD:
+                scanned = map(_scan_source, *args)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    scanned = list(pool.map(_scan_source, *args, chunksize=max(1, len(digests) // (workers * 4))))
+            for digest, violations in zip(digests, scanned):
+                self._remember(digest, violations)
+                for file_path in pending[digest]:
+                    results[file_path] = violations
+            self.save()  # once per batch
+        return results
+
+    def save(self):
+        """Append new verdicts to the verdict log, one signed line each, in a single write."""
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, {}
+        if not unsaved or not self.verdicts_path or not self._key:
+            return
+        rules = self.rules_fingerprint
+        lines = "".join(
+            json.dumps({"sha256": digest, "rules": rules, "violations": violations,
+                        "mac": self._sign(digest, rules, violations)}, separators=(",", ":")) + "\n"
+            for digest, violations in unsaved.items()
+        )
+        try:
+            os.makedirs(os.path.dirname(self.verdicts_path) or ".", mode=0o700, exist_ok=True)
+            fd = os.open(self.verdicts_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            with os.fdopen(fd, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"[Inspector] Could not write verdict store {self.verdicts_path}: {e}")
+
+    def _sign(self, digest: str, rules: str, violations: List[str]) -> str:
+        payload = json.dumps([digest, rules, violations], separators=(",", ":")).encode("utf-8")
+        return hmac.new(self._key, payload, hashlib.sha256).hexdigest()
+
+    def _load_verdicts(self) -> Dict[str, List[str]]:
+        """Signed verdicts for the current rules; unsigned or tampered lines are ignored."""
+        if not self.verdicts_path or not self._key:
+            return {}
+        verdicts: Dict[str, List[str]] = {}
+        rules = self.rules_fingerprint
+        rejected = 0
+        try:
+            with open(self.verdicts_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        digest, violations = entry["sha256"], entry["violations"]
+                        if entry["rules"] != rules:
+                            continue
+                        if not hmac.compare_digest(str(entry["mac"]), self._sign(digest, rules, violations)):
+                            rejected += 1
+                            continue
+                    except (ValueError, KeyError, TypeError):
+                        rejected += 1
+                        continue
+                    verdicts[digest] = violations
+        except OSError:
+            return {}
+        if rejected:
+            print(f"[Inspector] Ignored {rejected} unsigned or invalid entries in {self.verdicts_path}")
+        return verdicts
+
+    @staticmethod
+    def _load_key() -> Optional[bytes]:
+        key = os.getenv("TOOL_INSPECTOR_KEY")
+        if key:
+            return key.encode("utf-8")
+        try:
+            with open(KEY_PATH, "rb") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[Inspector] Cannot read signing key {KEY_PATH}, verdicts will not be persisted: {e}")
+            return None
+        try:
+            os.makedirs(os.path.dirname(KEY_PATH) or ".", mode=0o700, exist_ok=True)
+            key = secrets.token_hex(32).encode("ascii")
+            fd = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(key)
+            return key
+        except FileExistsError:  # created concurrently
+            with open(KEY_PATH, "rb") as f:
+                return f.read().strip()
+        except OSError as e:
+            print(f"[Inspector] Cannot create signing key {KEY_PATH}, verdicts will not be persisted: {e}")
+            return None
+
+    @staticmethod
+    def _read(file_path: str):
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        return hashlib.sha256(raw).hexdigest(), raw
+
+    @staticmethod
+    def _expand(paths: Iterable[str]) -> List[str]:
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, dirs, names in os.walk(path):
+                    dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith(".")]
+                    files.extend(os.path.join(root, n) for n in sorted(names) if n.endswith(".py"))
+            else:
+                files.append(path)
+        return files
+
+    def _cached(self, digest: str) -> Optional[List[str]]:
+        with self._lock:
+            return self._verdicts.get(digest)
+
+    def _remember(self, digest: str, violations: List[str]):
+        with self._lock:
+            self._verdicts[digest] = self._unsaved[digest] = list(violations)
+
+if __name__ == "__main__":
+    # Usage: python tool_inspector.py <draft.py or directory> [...]
+    if len(sys.argv) < 2:
+        print("Usage: python tool_inspector.py <path> [<path> ...]")
+        sys.exit(2)
+    report = ToolInspector().inspect_many(sys.argv[1:])
+    for path, found in sorted(report.items()):
+        print(f"{'FAIL' if found else 'PASS'}: {path}")
+        for violation in found:
+            print(f"    {violation}")
+    print(f"[Inspector] {sum(1 for v in report.values() if not v)}/{len(report)} files passed.")
+    sys.exit(1 if any(report.values()) else 0)
@@ -1,8 +1,14 @@
+import asyncio
 import requests
-from base_tool import BaseTool, ToolResponse
+from base_tool import BaseTool, CachePolicy, ToolResponse
 from cycos_utils import get_secret
 
+PROJECTS_URL = "https://api.todoist.com/rest/v2/projects"
+
 class TodoistProjectListTool(BaseTool):
+    # project lists change rarely; serve repeats from cache and refresh in the background
+    cache_policy = CachePolicy(ttl=30, key_fields=[], stale_ttl=300)
+
     @property
     def name(self) -> str:
         return "todoist_list_projects"
@@ -22,11 +28,31 @@ class TodoistProjectListTool(BaseTool):
 
         headers = {"Authorization": f"Bearer {api_key}"}
         try:
-            response = requests.get("https://api.todoist.com/rest/v2/projects", headers=headers)
+            # pooled session injected by the SkillLoader; plain requests when run standalone
+            http = self.http or requests
+            response = http.get(PROJECTS_URL, headers=headers)
             response.raise_for_status()
-            projects = response.json()
-            # Format output nicely
-            project_names = [p["name"] for p in projects]
-            return ToolResponse(success=True, message=f"Found {len(projects)} projects: {', '.join(project_names)}", data={"projects": projects})
+            return self._format(response.json())
         except Exception as e:
             return ToolResponse(success=False, message=f"API Error: {str(e)}")
+
+    async def aexecute(self, **kwargs) -> ToolResponse:
+        if self.http is None:
+            # no async client outside the SkillLoader; keep the blocking call off the event loop
+            return await asyncio.to_thread(self.execute, **kwargs)
+        api_key = get_secret("TODOIST_API_KEY")
+        if not api_key:
+            return ToolResponse(success=False, message="Missing TODOIST_API_KEY in environment.")
+
+        headers = {"Authorization": f"Bearer {api_key}"}
+        try:
+            response = await self.http.aget(PROJECTS_URL, headers=headers)
+            response.raise_for_status()
+            return self._format(response.json())
+        except Exception as e:
+            return ToolResponse(success=False, message=f"API Error: {str(e)}")
+
+    def _format(self, projects: list) -> ToolResponse:
+        # Format output nicely
+        project_names = [p["name"] for p in projects]
+        return ToolResponse(success=True, message=f"Found {len(projects)} projects: {', '.join(project_names)}", data={"projects": projects})
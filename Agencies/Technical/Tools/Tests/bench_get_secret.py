@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import time
+
+# Add directory to path to find modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+from cycos_utils import SecretsProvider
+
+CALLS = 200_000
+
+print("--- BENCHMARK: get_secret ---", flush=True)
+
+with tempfile.TemporaryDirectory() as tmp:
+    env_path = os.path.join(tmp, ".env")
+    with open(env_path, "w") as f:
+        for i in range(50):
+            f.write(f"SOME_SETTING_{i}=value-{i}\n")
+        f.write("TODOIST_API_KEY=bench-token\n")
+
+    secrets_dir = os.path.join(tmp, "secrets")
+    os.makedirs(secrets_dir)
+    with open(os.path.join(secrets_dir, "gemini_api_key"), "w") as f:
+        f.write("bench-gemini\n")
+
+    def legacy_get_secret(key):
+        # previous implementation: re-read and re-parse the .env file on every call
+        load_dotenv(env_path)
+        return os.getenv(key) or ""
+
+    legacy_calls = CALLS // 100
+    start = time.perf_counter()
+    for _ in range(legacy_calls):
+        legacy_get_secret("TODOIST_API_KEY")
+    legacy_rate = legacy_calls / (time.perf_counter() - start)
+    os.environ.pop("TODOIST_API_KEY", None)  # load_dotenv exported it
+
+    provider = SecretsProvider(env_path=env_path, secrets_dir=secrets_dir)
+    assert provider.get("TODOIST_API_KEY") == "bench-token"
+    assert provider.get("GEMINI_API_KEY") == "bench-gemini"
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        provider.get("TODOIST_API_KEY")
+    cached_rate = CALLS / (time.perf_counter() - start)
+
+    print(f"load_dotenv per call: {legacy_rate:>12,.0f} calls/s", flush=True)
+    print(f"SecretsProvider:      {cached_rate:>12,.0f} calls/s ({cached_rate / legacy_rate:.0f}x)", flush=True)
+
+    # Refresh on change
+    time.sleep(0.01)
+    with open(env_path, "a") as f:
+        f.write("TODOIST_API_KEY=rotated-token\n")
+    provider.refresh()
+    print(f"After rotation: {'PASS' if provider.get('TODOIST_API_KEY') == 'rotated-token' else 'FAIL'}", flush=True)
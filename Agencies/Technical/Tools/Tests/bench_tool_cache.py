@@ -0,0 +1,124 @@
+import asyncio
+import gc
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add directory to path to find modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from base_tool import BaseTool, CachePolicy, ToolResponse
+from skill_loader import SkillLoader
+
+CALLS = 200
+LATENCY = 0.05  # simulated upstream latency (seconds)
+
+
+class SlowProjectsTool(BaseTool):
+    name = "slow_projects"
+    description = "Pretends to call a slow upstream API."
+    input_schema = {"workspace": "Workspace id"}
+    cache_policy = CachePolicy(ttl=0.3, key_fields=["workspace"], stale_ttl=1.0)
+
+    def __init__(self):
+        self.upstream_calls = 0
+        self._lock = threading.Lock()
+
+    def execute(self, workspace: str = "", **kwargs) -> ToolResponse:
+        with self._lock:
+            self.upstream_calls += 1
+        time.sleep(LATENCY)
+        return ToolResponse(success=True, message=f"{workspace}: 2 projects")
+
+
+class SlowAsyncProjectsTool(SlowProjectsTool):
+    name = "slow_projects_async"
+
+    async def aexecute(self, workspace: str = "", **kwargs) -> ToolResponse:
+        self.upstream_calls += 1
+        await asyncio.sleep(LATENCY)
+        return ToolResponse(success=True, message=f"{workspace}: 2 projects")
+
+
+def check(label, condition):
+    print(f"{label}: {'PASS' if condition else 'FAIL'}", flush=True)
+
+
+loader = SkillLoader(os.path.dirname(__file__))
+sync_tool, async_tool = SlowProjectsTool(), SlowAsyncProjectsTool()
+for tool in (sync_tool, async_tool):
+    loader.loaded_tools[tool.name] = tool
+
+print(f"--- BENCHMARK: tool result cache ({CALLS} calls, {LATENCY * 1000:.0f} ms upstream) ---", flush=True)
+
+# Uncached baseline: every call goes upstream
+start = time.perf_counter()
+for _ in range(CALLS // 10):
+    loader._execute(sync_tool, {"workspace": "w1"})
+uncached_rate = (CALLS // 10) / (time.perf_counter() - start)
+
+sync_tool.upstream_calls = 0
+loader.run("slow_projects", workspace="w1")  # first call fills the cache
+start = time.perf_counter()
+for _ in range(CALLS):
+    loader.run("slow_projects", workspace="w1")
+cached_rate = CALLS / (time.perf_counter() - start)
+print(f"uncached: {uncached_rate:>12,.0f} calls/s", flush=True)
+print(f"cached:   {cached_rate:>12,.0f} calls/s ({cached_rate / uncached_rate:.0f}x)", flush=True)
+check("One upstream call", sync_tool.upstream_calls == 1)
+
+# Single-flight: a burst of concurrent identical calls on a cold key
+sync_tool.upstream_calls = 0
+with ThreadPoolExecutor(max_workers=32) as pool:
+    responses = list(pool.map(lambda _: loader.run("slow_projects", workspace="w2"), range(32)))
+check("Sync single-flight", sync_tool.upstream_calls == 1 and all(r.success for r in responses))
+
+
+async def burst():
+    results = await asyncio.gather(*(loader.arun("slow_projects_async", workspace="w3") for _ in range(32)))
+    return all(r.success for r in results)
+
+ok = asyncio.run(burst())
+check("Async single-flight", async_tool.upstream_calls == 1 and ok)
+
+# Stale-while-revalidate: past ttl the cached value is returned immediately and refreshed once
+time.sleep(0.35)
+sync_tool.upstream_calls = 0
+start = time.perf_counter()
+loader.run("slow_projects", workspace="w1")
+stale_latency = time.perf_counter() - start
+loader.run("slow_projects", workspace="w1")
+time.sleep(LATENCY * 2)
+check("Stale served without waiting", stale_latency < LATENCY / 2)
+check("One background refresh", sync_tool.upstream_calls == 1)
+
+stats = loader.cache_stats()["slow_projects"]
+print(f"Stats: {stats}", flush=True)
+check("Stats recorded", stats["hits"] > 0 and stats["stale_hits"] >= 1 and stats["coalesced"] > 0 and stats["revalidations"] == 1)
+
+# A failing background refresh is reported, never left as an unobserved task exception
+class FlakyAsyncTool(SlowAsyncProjectsTool):
+    name = "flaky_async"
+    cache_policy = CachePolicy(ttl=0.05, key_fields=["workspace"], stale_ttl=1.0)
+
+    async def aexecute(self, workspace: str = "", **kwargs) -> ToolResponse:
+        self.upstream_calls += 1
+        if self.upstream_calls > 1:
+            raise RuntimeError("upstream down")
+        return ToolResponse(success=True, message=f"{workspace}: 2 projects")
+
+
+async def failing_refresh():
+    unhandled = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+    await loader.arun("flaky_async", workspace="w4")
+    await asyncio.sleep(0.1)
+    stale = await loader.arun("flaky_async", workspace="w4")
+    await asyncio.sleep(0.05)
+    gc.collect()
+    return stale.success and not unhandled and not loader.cache._tasks
+
+loader.loaded_tools["flaky_async"] = FlakyAsyncTool()
+check("Failed refresh handled", asyncio.run(failing_refresh()))
@@ -0,0 +1,112 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add directory to path to find modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import requests
+from base_tool import BaseTool, ToolResponse
+from skill_loader import SkillLoader
+
+# Calls, concurrency and simulated upstream latency (seconds) can be given on the command line
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+LATENCY = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        body = b'[{"name": "Inbox"}, {"name": "Work"}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class BareRequestsTool(BaseTool):
+    name = "bare_requests"
+    description = "New connection per call (previous pattern)."
+    input_schema = {}
+
+    def execute(self, url: str = "", **kwargs) -> ToolResponse:
+        response = requests.get(url)
+        return ToolResponse(success=response.ok, message=str(len(response.json())))
+
+
+class PooledSyncTool(BaseTool):
+    name = "pooled_sync"
+    description = "Sync tool on the injected pooled session."
+    input_schema = {}
+
+    def execute(self, url: str = "", **kwargs) -> ToolResponse:
+        response = self.http.get(url)
+        return ToolResponse(success=response.ok, message=str(len(response.json())))
+
+
+class PooledAsyncTool(BaseTool):
+    name = "pooled_async"
+    description = "Async tool on the injected pooled client."
+    input_schema = {}
+
+    async def aexecute(self, url: str = "", **kwargs) -> ToolResponse:
+        response = await self.http.aget(url)
+        return ToolResponse(success=response.is_success, message=str(len(response.json())))
+
+
+async def measure(loader, name, url):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            response = await loader.arun(name, url=url)
+            assert response.success, response.message
+
+    await loader.arun(name, url=url)  # warm up
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(CALLS)))
+    return CALLS / (time.perf_counter() - start)
+
+
+def serve(port_queue):
+    ThreadingHTTPServer.request_queue_size = 128
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+async def main():
+    # the stub runs in its own process so it does not compete with the client for the GIL
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(port_queue,), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/projects"
+
+    loader = SkillLoader(os.path.dirname(__file__), max_workers=CONCURRENCY)
+    for tool in (BareRequestsTool(), PooledSyncTool(), PooledAsyncTool()):
+        tool.http = loader.http
+        loader.loaded_tools[tool.name] = tool
+
+    print(f"--- BENCHMARK: tool HTTP calls ({CALLS} calls, concurrency {CONCURRENCY}, {LATENCY * 1000:.0f} ms stub latency) ---", flush=True)
+    for name in ("bare_requests", "pooled_sync", "pooled_async"):
+        rate = await measure(loader, name, url)
+        print(f"{name:<15} {rate:>8,.0f} calls/s", flush=True)
+
+    await loader.aclose()
+    server.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
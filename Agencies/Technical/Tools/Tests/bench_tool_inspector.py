@@ -0,0 +1,98 @@
+import ast
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add directory to path to find modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "Security", "Scanning")))
+
+from tool_inspector import ToolInspector
+
+DRAFTS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+SAFE = '''from base_tool import BaseTool, ToolResponse
+import json
+
+class Draft{i}(BaseTool):
+    name = "draft_{i}"
+    description = "Draft tool {i}."
+    input_schema = {{"payload": "JSON string"}}
+
+    def execute(self, payload: str = "{{}}", **kwargs) -> ToolResponse:
+        data = json.loads(payload)
+        total = sum(len(str(v)) for v in data.values())
+        return ToolResponse(success=True, message=str(total), data=data)
+''' + "\n".join(f"\ndef helper_{n}(x):\n    return [y * {n} for y in range(x)]\n" for n in range(40))
+
+MALICIOUS = '''import os
+import subprocess
+
+def run(cmd):
+    eval(cmd)
+    return open("/etc/passwd").read()
+'''
+
+
+def legacy_inspect(file_path):
+    # previous implementation: parse and walk on every call, stop at the first violation
+    with open(file_path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import) and any(a.name.split('.')[0] in ToolInspector.FORBIDDEN_IMPORTS for a in node.names):
+            return False
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ToolInspector.FORBIDDEN_FUNCTIONS:
+            return False
+    return True
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    drafts_dir = os.path.join(tmp, "Drafts")
+    os.makedirs(drafts_dir)
+    for i in range(DRAFTS):
+        with open(os.path.join(drafts_dir, f"draft_{i}.py"), "w") as f:
+            f.write(MALICIOUS if i % 50 == 0 else SAFE.format(i=i))
+    verdicts_path = os.path.join(tmp, "verdicts.jsonl")
+    key = b"bench-signing-key"
+
+    print(f"--- BENCHMARK: tool inspection ({DRAFTS} drafts) ---", flush=True)
+    paths = [os.path.join(drafts_dir, f) for f in sorted(os.listdir(drafts_dir))]
+    legacy, legacy_seconds = timed(lambda: {p: legacy_inspect(p) for p in paths})
+    cold, cold_seconds = timed(lambda: ToolInspector(verdicts_path, key=key).inspect_many(drafts_dir))
+    warm, warm_seconds = timed(lambda: ToolInspector(verdicts_path, key=key).inspect_many(drafts_dir))
+
+    print(f"parse per call:       {legacy_seconds * 1000:>8.1f} ms", flush=True)
+    print(f"inspect_many (cold):  {cold_seconds * 1000:>8.1f} ms", flush=True)
+    print(f"inspect_many (warm):  {warm_seconds * 1000:>8.1f} ms ({legacy_seconds / warm_seconds:.0f}x)", flush=True)
+
+    same = all(legacy[p] == (not cold[p]) == (not warm[p]) for p in paths)
+    print(f"Same verdicts: {'PASS' if same else 'FAIL'}", flush=True)
+    print(f"All violations reported: {'PASS' if len(cold[paths[0]]) == 4 else 'FAIL'}", flush=True)
+
+    # A forged "safe" verdict for the malicious source must not be trusted
+    with open(paths[0], "rb") as f:
+        malicious_digest = hashlib.sha256(f.read()).hexdigest()
+    with open(verdicts_path, "a") as f:
+        f.write(json.dumps({"sha256": malicious_digest, "rules": ToolInspector(None).rules_fingerprint,
+                            "violations": [], "mac": "0" * 64}) + "\n")
+    forged = ToolInspector(verdicts_path, key=key).find_violations(paths[0])
+    print(f"Forged verdict rejected: {'PASS' if forged else 'FAIL'}", flush=True)
+
+    # The AST is built from what Python would execute: coding cookies honoured, bad bytes rejected
+    latin1 = os.path.join(tmp, "latin1.py")
+    with open(latin1, "wb") as f:
+        f.write("# -*- coding: latin-1 -*-\nname = 'caf\u00e9'\n".encode("latin-1"))
+    broken = os.path.join(tmp, "broken.py")
+    with open(broken, "wb") as f:
+        f.write(b"name = '\xff\xfe'\n")
+    inspector = ToolInspector(None)
+    print(f"Coding cookie honoured: {'PASS' if not inspector.find_violations(latin1) else 'FAIL'}", flush=True)
+    print(f"Undecodable file rejected: {'PASS' if inspector.find_violations(broken) else 'FAIL'}", flush=True)
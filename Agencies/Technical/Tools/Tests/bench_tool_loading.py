@@ -0,0 +1,94 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+# Add directory to path to find modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from base_tool import BaseTool
+from skill_loader import SkillLoader
+
+TOOLS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+TEMPLATE = '''from base_tool import BaseTool, ToolResponse
+
+HELP = """{padding}"""
+
+class Tool{i}(BaseTool):
+    @property
+    def name(self) -> str:
+        return "bench_tool_{i}"
+
+    @property
+    def description(self) -> str:
+        return "Benchmark tool number {i}."
+
+    @property
+    def input_schema(self) -> dict:
+        return {{"value": "Any string"}}
+
+    def execute(self, value: str = "", **kwargs) -> ToolResponse:
+        return ToolResponse(success=True, message=value)
+'''
+
+
+def legacy_load(tools_dir):
+    # previous implementation: import every file serially and instantiate everything
+    tools = {}
+    for filename in os.listdir(tools_dir):
+        if filename.endswith(".py"):
+            module_name = filename[:-3]
+            spec = importlib.util.spec_from_file_location(module_name, os.path.join(tools_dir, filename))
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+            for attr_name in dir(module):
+                attr = getattr(module, attr_name)
+                if isinstance(attr, type) and issubclass(attr, BaseTool) and attr is not BaseTool:
+                    tool = attr()
+                    tools[tool.name] = tool
+    return tools
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    tools_dir = os.path.join(tmp, "Active")
+    os.makedirs(tools_dir)
+    for i in range(TOOLS):
+        with open(os.path.join(tools_dir, f"tool_{i}.py"), "w") as f:
+            f.write(TEMPLATE.format(i=i, padding="usage notes " * 50))
+
+    print(f"--- BENCHMARK: tool loading ({TOOLS} tools) ---", flush=True)
+    legacy, legacy_seconds = timed(lambda: legacy_load(tools_dir))
+
+    cold = SkillLoader(tools_dir)
+    _, cold_seconds = timed(cold.load_tools)
+    warm = SkillLoader(tools_dir)
+    _, warm_seconds = timed(warm.load_tools)
+    tool, first_get = timed(lambda: warm.get_tool("bench_tool_7"))
+
+    print(f"serial import:  {legacy_seconds * 1000:>8.1f} ms", flush=True)
+    print(f"index (cold):   {cold_seconds * 1000:>8.1f} ms", flush=True)
+    print(f"index (warm):   {warm_seconds * 1000:>8.1f} ms ({legacy_seconds / warm_seconds:.0f}x)", flush=True)
+    print(f"first get_tool: {first_get * 1000:>8.1f} ms", flush=True)
+
+    print(f"All tools indexed: {'PASS' if set(warm.list_tools()) == set(legacy) else 'FAIL'}", flush=True)
+    print(f"Lazy import: {'PASS' if list(warm.loaded_tools) == ['bench_tool_7'] and tool.execute(value='ok').message == 'ok' else 'FAIL'}", flush=True)
+    # the legacy loader registered "tool_7"; the indexed loader must not reuse or replace it
+    module_name = type(tool).__module__
+    print(f"No bare module names: {'PASS' if module_name != 'tool_7' and sys.modules[module_name] is not sys.modules['tool_7'] else 'FAIL'}", flush=True)
+
+    # A tool whose BaseTool base is imported from another module cannot be resolved from source alone
+    with open(os.path.join(tools_dir, "derived_tool.py"), "w") as f:
+        f.write("from tool_7 import Tool7\n\nclass DerivedTool(Tool7):\n    name = 'derived_tool'\n")
+    sys.path.append(tools_dir)
+    derived = SkillLoader(tools_dir)
+    derived.load_tools()
+    print(f"Imported base class: {'PASS' if derived.get_tool('derived_tool') is not None else 'FAIL'}", flush=True)
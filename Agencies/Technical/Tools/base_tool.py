@@ -1,18 +1,41 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    from http_client import HttpClient
+
 @dataclass
 class ToolResponse:
     success: bool
     message: str
     data: Optional[Dict[str, Any]] = None
 
+@dataclass
+class CachePolicy:
+    """
+    Declares a tool idempotent so the SkillLoader may reuse its successful responses.
+    ttl: seconds a response is served as fresh.
+    key_fields: input_schema fields that identify a call (None = all arguments).
+    stale_ttl: extra seconds a response is served while it is refreshed in the background.
+    """
+    ttl: float
+    key_fields: Optional[List[str]] = None
+    stale_ttl: float = 0.0
+
 class BaseTool(ABC):
     """
     The Base Contract for all CyCOS Dynamic Tools.
     Any script in 'Active' MUST inherit from this class.
+    Implement `execute`, `aexecute`, or both; the SkillLoader runs sync tools on a
+    thread pool and awaits async ones directly.
     """
+
+    # Shared pooled HTTP client, injected by the SkillLoader
+    http: Optional["HttpClient"] = None
+
+    # Set to a CachePolicy to let the SkillLoader cache results (None = never cached)
+    cache_policy: Optional[CachePolicy] = None
     
     @property
     @abstractmethod
@@ -38,10 +61,21 @@ class BaseTool(ABC):
         """
         pass
 
-    @abstractmethod
     def execute(self, **kwargs) -> ToolResponse:
         """
         The main execution logic. 
         MUST return a ToolResponse object.
         """
-        pass
+        raise NotImplementedError(f"Tool '{self.name}' implements neither execute() nor aexecute().")
+
+    async def aexecute(self, **kwargs) -> ToolResponse:
+        """
+        Optional native async execution logic.
+        MUST return a ToolResponse object.
+        """
+        raise NotImplementedError(f"Tool '{self.name}' has no aexecute().")
+
+    @property
+    def is_async(self) -> bool:
+        """True if the tool provides its own aexecute()."""
+        return type(self).aexecute is not BaseTool.aexecute
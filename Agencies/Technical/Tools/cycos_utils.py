@@ -1,11 +1,79 @@
 import os
-from dotenv import load_dotenv
+import threading
+import time
+from typing import Dict, Optional
+from dotenv import dotenv_values
 
 # Hardcoded path to the single source of truth for secrets
-ENV_PATH = r"c:\CyCOS\System\Core\Manager\.env"
+ENV_PATH = os.getenv("CYCOS_ENV_PATH", r"c:\CyCOS\System\Core\Manager\.env")
+# Docker secrets mount point (see the `secrets:` section of docker-compose.yml)
+SECRETS_DIR = os.getenv("CYCOS_SECRETS_DIR", "/run/secrets")
+
+
+class SecretsProvider:
+    """
+    Resolves secrets from the process environment, then Docker secret files, then the .env file.
+    Files are parsed once and re-read only when their mtime changes; that check runs at most
+    every `check_interval` seconds, so lookups in between are pure in-memory dict reads.
+    """
+
+    def __init__(self, env_path: str = ENV_PATH, secrets_dir: str = SECRETS_DIR, check_interval: float = 5.0):
+        self.env_path = env_path
+        self.secrets_dir = secrets_dir
+        self.check_interval = check_interval
+        self._values: Dict[str, str] = {}
+        self._versions: Optional[tuple] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str:
+        value = os.environ.get(key)
+        if value:
+            return value
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+        return self._values.get(key, "")
+
+    def refresh(self, force: bool = False):
+        """Re-read the sources if any of them changed on disk (or always, with force)."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            versions = self._source_versions()
+            if versions == self._versions and not force:
+                return
+            values: Dict[str, str] = {}
+            if versions[0] is not None:
+                values.update({k: v for k, v in dotenv_values(self.env_path).items() if v is not None})
+            for name, _ in versions[1]:
+                try:
+                    with open(os.path.join(self.secrets_dir, name), 'r') as f:
+                        secret = f.read().strip()
+                except OSError:
+                    continue
+                # compose secret names are lowercase; tools ask for the upper-case env name
+                values[name] = secret
+                values[name.upper()] = secret
+            self._values = values
+            self._versions = versions
+
+    def _source_versions(self) -> tuple:
+        try:
+            env_version = os.stat(self.env_path).st_mtime_ns
+        except OSError:
+            env_version = None
+        secret_versions = []
+        try:
+            for entry in os.scandir(self.secrets_dir):
+                if entry.is_file():
+                    secret_versions.append((entry.name, entry.stat().st_mtime_ns))
+        except OSError:
+            pass
+        return env_version, tuple(sorted(secret_versions))
+
+
+secrets = SecretsProvider()
+
 
 def get_secret(key: str) -> str:
     """Safe way for tools to access secrets without importing os."""
-    load_dotenv(ENV_PATH)
-    val = os.getenv(key)
-    return val if val else ""
+    return secrets.get(key)
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # async tools need httpx; sync tools work without it
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Timeouts in seconds and pool sizes, overridable from the environment.
+# MAX_KEEPALIVE: idle connections kept for reuse (per host in the sync session, in total per async client).
+# MAX_CONNECTIONS: open connections per async client across all hosts; further requests wait for a free one.
+# The sync session does not cap open connections; the tool thread pool bounds them.
+CONNECT_TIMEOUT = float(os.getenv("CYCOS_HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("CYCOS_HTTP_READ_TIMEOUT", "30"))
+MAX_KEEPALIVE = int(os.getenv("CYCOS_HTTP_MAX_KEEPALIVE", "20"))
+MAX_CONNECTIONS = int(os.getenv("CYCOS_HTTP_MAX_CONNECTIONS", "100"))
+
+
+class HttpClient:
+    """
+    Shared HTTP client injected into tools as `self.http`.
+    Sync calls go through one keep-alive requests.Session, async calls through an httpx.AsyncClient per
+    event loop (HTTP/2 when `h2` is installed). Both reuse keep-alive connections and apply default timeouts.
+    Call `aclose()` on shutdown to release every pooled connection.
+    """
+
+    def __init__(self, connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 max_keepalive: int = MAX_KEEPALIVE, max_connections: int = MAX_CONNECTIONS):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_keepalive = max_keepalive
+        self.max_connections = max_connections
+        self._session: Optional[requests.Session] = None
+        self._async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=self.max_keepalive)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    @property
+    def async_client(self):
+        if httpx is None:
+            raise ImportError("httpx is required for async tools (pip install httpx)")
+        # pooled connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive),
+            )
+        return client
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    async def arequest(self, method: str, url: str, **kwargs):
+        return await self.async_client.request(method, url, **kwargs)
+
+    async def aget(self, url: str, **kwargs):
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs):
+        return await self.arequest("POST", url, **kwargs)
+
+    def close(self):
+        """Close the sync session (async clients need `aclose()`)."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self):
+        """Close the sync session and every async client, each on the loop that opened it."""
+        self.close()
+        current = asyncio.get_running_loop()
+        with self._lock:
+            clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        for loop, client in clients:
+            if loop is current:
+                await client.aclose()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+            # connections of a stopped loop cannot be used again; dropping the client is enough
@@ -1,52 +1,348 @@
+import ast
+import asyncio
+import functools
+import hashlib
 import importlib.util
+import json
 import os
 import sys
-from typing import Dict, Type
-from base_tool import BaseTool
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Type
+from base_tool import BaseTool, ToolResponse
+from http_client import HttpClient
+from tool_cache import ToolResultCache
+
+# Upper bound on cached tool responses across all tools
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("CYCOS_TOOL_CACHE_MAX_ENTRIES", "1024"))
+INDEX_VERSION = 1
+SCAN_CHUNK = 64
+TOOL_ATTRS = ("name", "description", "input_schema")
+# Bases that can never make a class a tool, so they need no import to rule out
+NON_TOOL_BASES = {"object", "ABC", "Exception", "dict", "list", "str", "Enum", "NamedTuple", "TypedDict", "Protocol", "Generic"}
+
+def _base_name(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+def _class_attrs(node: ast.ClassDef) -> Dict[str, Any]:
+    """Literal name/description/input_schema from class attributes or `return <literal>` properties."""
+    attrs = {}
+    for stmt in node.body:
+        if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+            attr, value = stmt.targets[0].id, stmt.value
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name) and stmt.value is not None:
+            attr, value = stmt.target.id, stmt.value
+        elif isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)) and stmt.name in TOOL_ATTRS:
+            body = [b for b in stmt.body if not (isinstance(b, ast.Expr) and isinstance(b.value, ast.Constant))]
+            if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+                raise ValueError(f"{node.name}.{stmt.name} is not a literal")
+            attr, value = stmt.name, body[0].value
+        else:
+            continue
+        if attr in TOOL_ATTRS:
+            attrs[attr] = ast.literal_eval(value)  # ValueError when computed at runtime
+    return attrs
+
+def scan_tool_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Find BaseTool subclasses in a file without importing it.
+    Returns {"tools": [{"class", "name", "description", "input_schema"}], "dynamic": bool}; `dynamic` means
+    some metadata is computed at runtime and the file has to be imported to be registered. None on parse errors.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=file_path)
+    except Exception as e:
+        print(f"[SkillLoader] Error scanning {file_path}: {e}")
+        return None
+
+    classes: Dict[str, Optional[Dict[str, Any]]] = {}
+    plain = set(NON_TOOL_BASES)  # names known not to be tools
+    tools: List[Dict[str, Any]] = []
+    dynamic = False
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = [_base_name(b) for b in node.bases]
+        # a base defined elsewhere (`from common import HelperBase`) may itself be a BaseTool subclass
+        # or supply the metadata; only an import can tell, so such files take the dynamic path
+        unresolved = any(b is None or (b != "BaseTool" and b not in classes and b not in plain) for b in bases)
+        if "BaseTool" not in bases and not any(b in classes for b in bases):
+            if unresolved:
+                dynamic = True
+            else:
+                plain.add(node.name)
+            continue
+        if any(b in classes and classes[b] is None for b in bases):
+            classes[node.name], dynamic = None, True
+            continue
+        attrs: Dict[str, Any] = {}
+        for base in reversed(bases):
+            attrs.update(classes.get(base) or {})
+        try:
+            attrs.update(_class_attrs(node))
+        except ValueError:
+            classes[node.name], dynamic = None, True
+            continue
+        classes[node.name] = attrs
+        if all(attr in attrs for attr in TOOL_ATTRS):
+            tools.append({"class": node.name, **{attr: attrs[attr] for attr in TOOL_ATTRS}})
+        elif unresolved:
+            dynamic = True
+        # otherwise: no full metadata and nothing else could supply it, an abstract helper
+    return {"tools": tools, "dynamic": dynamic}
+
+def _module_name(file_path: str) -> str:
+    # unique per path, so tools never shadow (or get shadowed by) same-named modules in sys.modules
+    digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:12]
+    return f"cycos_tool_{digest}_{os.path.splitext(os.path.basename(file_path))[0]}"
 
 class SkillLoader:
-    def __init__(self, tools_dir: str):
+    def __init__(self, tools_dir: str, http: Optional[HttpClient] = None, max_workers: int = 16, index_path: Optional[str] = None):
         self.tools_dir = tools_dir
+        # kept next to (not inside) the tools dir, like the skill index
+        self.index_path = index_path or os.path.join(
+            os.path.dirname(os.path.abspath(tools_dir)), f".{os.path.basename(os.path.normpath(tools_dir))}_index.json")
+        self.manifest: Dict[str, Dict[str, Any]] = {}
         self.loaded_tools: Dict[str, BaseTool] = {}
+        self.load_stats: Dict[str, Any] = {}
+        self.http = http or HttpClient()
+        self.cache = ToolResultCache(max_entries=TOOL_CACHE_MAX_ENTRIES)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._modules: Dict[str, Any] = {}
+        self._file_keys: Dict[str, list] = {}
+        self._tool_files: Dict[str, str] = {}
+        self._import_lock = threading.RLock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
 
     def load_tools(self):
-        """Scans the tools directory and loads all valid BaseTool implementations."""
+        """
+        Index the tools directory from source, without importing tools.
+        Unchanged files come from the manifest index, changed ones are scanned across the thread pool;
+        modules are imported on first get_tool().
+        """
+        started = time.perf_counter()
         if not os.path.exists(self.tools_dir):
             print(f"Tools directory not found: {self.tools_dir}")
             return
 
-        for filename in os.listdir(self.tools_dir):
-            if filename.endswith(".py") and filename != "__init__.py":
-                self._load_file(os.path.join(self.tools_dir, filename))
+        index = self._load_index()
+        cached = index.get("files", {})
+        entries: Dict[str, Dict[str, Any]] = {}
+        stale = []
+        for entry in os.scandir(self.tools_dir):
+            if not entry.name.endswith(".py") or entry.name == "__init__.py" or not entry.is_file():
+                continue
+            st = entry.stat()
+            key = [st.st_mtime_ns, st.st_size]
+            previous = cached.get(entry.name)
+            if previous and previous["key"] == key:
+                entries[entry.name] = previous
+            else:
+                stale.append((entry.name, key))
+
+        chunks = [stale[i:i + SCAN_CHUNK] for i in range(0, len(stale), SCAN_CHUNK)]
+        for chunk, scans in zip(chunks, self._executor.map(
+                lambda chunk: [scan_tool_file(os.path.join(self.tools_dir, filename)) for filename, _ in chunk], chunks)):
+            for (filename, key), scan in zip(chunk, scans):
+                entries[filename] = {"key": key, "scan": scan}
+
+        with self._import_lock:
+            present = {os.path.join(self.tools_dir, filename) for filename in entries}
+            for file_path in [f for f in self._file_keys if f not in present]:
+                self._forget(file_path)
+
+            manifest: Dict[str, Dict[str, Any]] = {}
+            for filename in sorted(entries):
+                file_path = os.path.join(self.tools_dir, filename)
+                key, scan = entries[filename]["key"], entries[filename]["scan"]
+                if self._file_keys.get(file_path, key) != key:
+                    self._forget(file_path)
+                self._file_keys[file_path] = key
+                if scan is None:
+                    continue
+                if scan["dynamic"]:
+                    if file_path not in self._modules:
+                        self._load_file(file_path)
+                    scan = {"tools": [{"class": type(tool).__name__, "name": tool.name, "description": tool.description,
+                                       "input_schema": tool.input_schema}
+                                      for name, tool in self.loaded_tools.items() if self._tool_files.get(name) == file_path]}
+                for tool in scan["tools"]:
+                    manifest[tool["name"]] = {"file": file_path, "class": tool["class"],
+                                              "description": tool["description"], "input_schema": tool["input_schema"]}
+            self.manifest = manifest
+
+        if stale or len(entries) != len(cached):
+            self._save_index({"version": INDEX_VERSION, "files": entries})
+
+        self.load_stats = {
+            "tools": len(self.manifest),
+            "scanned": len(stale),
+            "from_index": len(entries) - len(stale),
+            "seconds": time.perf_counter() - started
+        }
+        print(f"[SkillLoader] Indexed {self.load_stats['tools']} tools "
+              f"({self.load_stats['scanned']} scanned, {self.load_stats['from_index']} from index) "
+              f"in {self.load_stats['seconds'] * 1000:.1f} ms")
 
     def _load_file(self, file_path: str):
-        module_name = os.path.basename(file_path).replace(".py", "")
-        
+        """Import a tool file (once) and instantiate every BaseTool implementation in it."""
+        module = self._import(file_path)
+        if module is None:
+            return
+        for attr_name, attr in vars(module).items():
+            if isinstance(attr, type) and issubclass(attr, BaseTool) and attr is not BaseTool and attr.__module__ == module.__name__:
+                self._instantiate(attr, file_path)
+
+    def _import(self, file_path: str):
+        module = self._modules.get(file_path)
+        if module is not None:
+            return module
+        module_name = _module_name(file_path)
         try:
             spec = importlib.util.spec_from_file_location(module_name, file_path)
             if spec and spec.loader:
                 module = importlib.util.module_from_spec(spec)
                 sys.modules[module_name] = module
                 spec.loader.exec_module(module)
-                
-                # Scan for BaseTool subclasses
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if isinstance(attr, type) and issubclass(attr, BaseTool) and attr is not BaseTool:
-                        # Instantiate
-                        try:
-                            tool_instance = attr()
-                            self.loaded_tools[tool_instance.name] = tool_instance
-                            print(f"[SkillLoader] Loaded: {tool_instance.name}")
-                        except Exception as e:
-                            print(f"[SkillLoader] Failed to instantiate {attr_name}: {e}")
-
+                self._modules[file_path] = module
+                return module
         except Exception as e:
+            sys.modules.pop(module_name, None)
             print(f"[SkillLoader] Error loading {file_path}: {e}")
+        return None
+
+    def _instantiate(self, cls: Type[BaseTool], file_path: str) -> Optional[BaseTool]:
+        try:
+            tool_instance = cls()
+            tool_instance.http = self.http
+            self._check_cache_policy(tool_instance)
+            self.loaded_tools[tool_instance.name] = tool_instance
+            self._tool_files[tool_instance.name] = file_path
+            print(f"[SkillLoader] Loaded: {tool_instance.name}")
+            return tool_instance
+        except Exception as e:
+            print(f"[SkillLoader] Failed to instantiate {cls.__name__}: {e}")
+            return None
+
+    def _forget(self, file_path: str):
+        """Drop the imported module and tool instances of a file that changed or disappeared."""
+        self._file_keys.pop(file_path, None)
+        if self._modules.pop(file_path, None) is not None:
+            sys.modules.pop(_module_name(file_path), None)
+        for name in [n for n, f in self._tool_files.items() if f == file_path]:
+            del self._tool_files[name]
+            self.loaded_tools.pop(name, None)
+            self.cache.invalidate(name)
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and index.get("tools_dir") == os.path.abspath(self.tools_dir):
+                return index
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_index(self, index: Dict[str, Any]):
+        index["tools_dir"] = os.path.abspath(self.tools_dir)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[SkillLoader] Could not write tool index {self.index_path}: {e}")
+
+    @staticmethod
+    def _check_cache_policy(tool: BaseTool):
+        policy = tool.cache_policy
+        if policy is None or policy.key_fields is None:
+            return
+        unknown = set(policy.key_fields) - set(tool.input_schema)
+        if unknown:
+            print(f"[SkillLoader] Warning: {tool.name} cache key fields not in input_schema: {sorted(unknown)}")
 
     def get_tool(self, name: str) -> Optional[BaseTool]:
-        return self.loaded_tools.get(name)
+        """Return a tool instance, importing its file on first use."""
+        tool = self.loaded_tools.get(name)
+        if tool is not None:
+            return tool
+        entry = self.manifest.get(name)
+        if entry is None:
+            return None
+        with self._import_lock:
+            tool = self.loaded_tools.get(name)
+            if tool is None:
+                module = self._import(entry["file"])
+                cls = getattr(module, entry["class"], None) if module is not None else None
+                if cls is not None:
+                    tool = self._instantiate(cls, entry["file"])
+            return tool
+
+    async def arun(self, name: str, **kwargs) -> ToolResponse:
+        """Execute a tool from async code: async tools are awaited, sync tools run on the thread pool."""
+        tool = self.get_tool(name)
+        if tool is None:
+            return ToolResponse(success=False, message=f"Tool '{name}' not found.")
+        if tool.cache_policy is not None:
+            return await self.cache.arun(tool, kwargs, lambda: self._aexecute(tool, kwargs))
+        return await self._aexecute(tool, kwargs)
+
+    def run(self, name: str, **kwargs) -> ToolResponse:
+        """Execute a tool from sync code; async-only tools run on the loader's background loop."""
+        tool = self.get_tool(name)
+        if tool is None:
+            return ToolResponse(success=False, message=f"Tool '{name}' not found.")
+        if tool.cache_policy is not None:
+            return self.cache.run(tool, kwargs, lambda: self._execute(tool, kwargs), self._executor.submit)
+        return self._execute(tool, kwargs)
+
+    async def _aexecute(self, tool: BaseTool, kwargs: Dict) -> ToolResponse:
+        if tool.is_async:
+            return await tool.aexecute(**kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(tool.execute, **kwargs))
+
+    def _execute(self, tool: BaseTool, kwargs: Dict) -> ToolResponse:
+        if tool.is_async and type(tool).execute is BaseTool.execute:
+            return asyncio.run_coroutine_threadsafe(tool.aexecute(**kwargs), self._background_loop()).result()
+        return tool.execute(**kwargs)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-tool result cache counters (hits, stale_hits, misses, coalesced, ...)."""
+        return self.cache.stats()
+
+    async def aclose(self):
+        """Shutdown: close pooled HTTP connections, the background loop and the thread pool."""
+        await self.http.aclose()
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        self._executor.shutdown(wait=False)
+
+    def close(self):
+        """Sync counterpart of aclose(), for callers without a running event loop."""
+        asyncio.run(self.aclose())
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        # one long-lived loop, so the async HTTP pool is reused across sync calls
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="tool-loop", daemon=True).start()
+            return self._loop
 
     def list_tools(self) -> Dict[str, str]:
-        """Returns name: description mapping."""
-        return {t.name: t.description for t in self.loaded_tools.values()}
+        """Returns name: description mapping (from the index; nothing is imported)."""
+        tools = {name: entry["description"] for name, entry in self.manifest.items()}
+        tools.update({t.name: t.description for t in self.loaded_tools.values()})
+        return tools
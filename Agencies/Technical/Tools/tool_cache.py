@@ -0,0 +1,184 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from base_tool import BaseTool, CachePolicy, ToolResponse
+
+STAT_FIELDS = ("hits", "stale_hits", "misses", "coalesced", "revalidations", "errors", "evictions")
+
+
+class ToolResultCache:
+    """
+    LRU + TTL cache of successful ToolResponses for tools that declare a CachePolicy.
+    - Entries older than `ttl` but within `stale_ttl` more are served while one background call refreshes them.
+    - Concurrent identical calls (sync or async) share one upstream execution (single-flight).
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[ToolResponse, float]]" = OrderedDict()
+        self._inflight: Dict[tuple, Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._tasks: Set[asyncio.Task] = set()  # running async revalidations
+
+    @staticmethod
+    def key(tool: BaseTool, policy: CachePolicy, kwargs: Dict[str, Any]) -> tuple:
+        fields = policy.key_fields if policy.key_fields is not None else sorted(kwargs)
+        return (tool.name, json.dumps({f: kwargs.get(f) for f in fields}, sort_keys=True, default=repr))
+
+    def run(self, tool: BaseTool, kwargs: Dict[str, Any], compute: Callable[[], ToolResponse],
+            background: Callable[[Callable[[], None]], Any]) -> ToolResponse:
+        """Serve a sync call; `background` schedules stale revalidations (e.g. on a thread pool)."""
+        policy = tool.cache_policy
+        key = self.key(tool, policy, kwargs)
+        cached = self._lookup(tool.name, key, policy)
+        if cached is not None:
+            response, fresh = cached
+            if not fresh:
+                future = self._begin(key)
+                if future is not None:
+                    self._count(tool.name, "revalidations")
+                    background(lambda: self._revalidate(tool.name, key, future, compute))
+            return response
+
+        future = self._begin(key)
+        if future is None:
+            self._count(tool.name, "coalesced")
+            return self._inflight_result(key, compute)
+        return self._settle(tool.name, key, future, compute)
+
+    async def arun(self, tool: BaseTool, kwargs: Dict[str, Any], compute: Callable[[], Awaitable[ToolResponse]]) -> ToolResponse:
+        """Serve an async call; stale revalidations run as tasks on the current loop."""
+        policy = tool.cache_policy
+        key = self.key(tool, policy, kwargs)
+        cached = self._lookup(tool.name, key, policy)
+        if cached is not None:
+            response, fresh = cached
+            if not fresh:
+                future = self._begin(key)
+                if future is not None:
+                    self._count(tool.name, "revalidations")
+                    task = asyncio.ensure_future(self._arevalidate(tool.name, key, future, compute))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            return response
+
+        future = self._begin(key)
+        if future is None:
+            self._count(tool.name, "coalesced")
+            with self._lock:
+                inflight = self._inflight.get(key)
+            if inflight is None:  # finished between the two checks
+                return await compute()
+            return await asyncio.wrap_future(inflight)
+        return await self._asettle(tool.name, key, future, compute)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-tool counters plus the number of cached entries."""
+        with self._lock:
+            result = {name: dict(counts, entries=0) for name, counts in self._stats.items()}
+            for name, _ in self._entries:
+                result.setdefault(name, dict.fromkeys(STAT_FIELDS, 0)).setdefault("entries", 0)
+                result[name]["entries"] += 1
+            return result
+
+    def invalidate(self, tool_name: Optional[str] = None):
+        """Drop cached results for one tool, or all of them."""
+        with self._lock:
+            for key in [k for k in self._entries if tool_name is None or k[0] == tool_name]:
+                del self._entries[key]
+
+    def _lookup(self, tool_name: str, key: tuple, policy: CachePolicy) -> Optional[Tuple[ToolResponse, bool]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, stored = entry
+                age = time.monotonic() - stored
+                if age <= policy.ttl:
+                    self._entries.move_to_end(key)
+                    self._count_locked(tool_name, "hits")
+                    return response, True
+                if age <= policy.ttl + policy.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._count_locked(tool_name, "stale_hits")
+                    return response, False
+                del self._entries[key]
+            self._count_locked(tool_name, "misses")
+        return None
+
+    def _begin(self, key: tuple) -> Optional[Future]:
+        """Claim the upstream call for a key; None if another caller already owns it."""
+        with self._lock:
+            if key in self._inflight:
+                return None
+            future = self._inflight[key] = Future()
+            return future
+
+    def _inflight_result(self, key: tuple, compute: Callable[[], ToolResponse]) -> ToolResponse:
+        with self._lock:
+            inflight = self._inflight.get(key)
+        if inflight is None:  # finished between the two checks
+            return compute()
+        return inflight.result()
+
+    def _settle(self, tool_name: str, key: tuple, future: Future, compute: Callable[[], ToolResponse]) -> ToolResponse:
+        try:
+            response = compute()
+        except BaseException as e:
+            self._finish(tool_name, key, future, error=e)
+            raise
+        self._finish(tool_name, key, future, response=response)
+        return response
+
+    def _revalidate(self, tool_name: str, key: tuple, future: Future, compute: Callable[[], ToolResponse]):
+        # nobody awaits a background refresh; report its failure here (the stale entry stays until it expires)
+        try:
+            self._settle(tool_name, key, future, compute)
+        except Exception as e:
+            print(f"[ToolCache] Background refresh of '{tool_name}' failed: {e}")
+
+    async def _arevalidate(self, tool_name: str, key: tuple, future: Future, compute: Callable[[], Awaitable[ToolResponse]]):
+        try:
+            await self._asettle(tool_name, key, future, compute)
+        except Exception as e:
+            print(f"[ToolCache] Background refresh of '{tool_name}' failed: {e}")
+
+    async def _asettle(self, tool_name: str, key: tuple, future: Future, compute: Callable[[], Awaitable[ToolResponse]]) -> ToolResponse:
+        try:
+            response = await compute()
+        except BaseException as e:
+            self._finish(tool_name, key, future, error=e)
+            raise
+        self._finish(tool_name, key, future, response=response)
+        return response
+
+    def _finish(self, tool_name: str, key: tuple, future: Future,
+                response: Optional[ToolResponse] = None, error: Optional[BaseException] = None):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is not None or response is None or not response.success:
+                self._count_locked(tool_name, "errors")
+            else:
+                self._entries[key] = (response, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._count_locked(evicted[0], "evictions")
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(response)
+
+    def _count(self, tool_name: str, field: str):
+        with self._lock:
+            self._count_locked(tool_name, field)
+
+    def _count_locked(self, tool_name: str, field: str):
+        counts = self._stats.get(tool_name)
+        if counts is None:
+            counts = self._stats[tool_name] = dict.fromkeys(STAT_FIELDS, 0)
+        counts[field] += 1
@@ -0,0 +1,71 @@
+"""
+Benchmark: N single POST /execute calls vs. one POST /execute/batch call with the same N tasks.
+
+Runs in-process against the FastAPI app by default; pass --url to hit a running server (requires httpx).
+
+    python bench_execute_batch.py --tasks 1000 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+# Execution layer modules live one directory up
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def make_tasks(count, sessions):
+    return [
+        {"task": f"benchmark task {i}", "session_id": f"bench-{i % sessions}"}
+        for i in range(count)
+    ]
+
+
+async def run(args):
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=300)
+    else:
+        from main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=300)
+        await app.router.startup()  # ASGITransport does not run lifespan events; this discovers the skills
+
+    tasks = make_tasks(args.tasks, args.sessions)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def single(payload):
+        async with semaphore:
+            response = await client.post("/execute", json=payload)
+            response.raise_for_status()
+
+    async with client:
+        await client.post("/execute", json=tasks[0])  # warm up
+
+        start = time.perf_counter()
+        await asyncio.gather(*(single(t) for t in tasks))
+        singles = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = await client.post("/execute/batch", json={"tasks": tasks})
+        response.raise_for_status()
+        batched = time.perf_counter() - start
+        results = response.json()["results"]
+    if not args.url:
+        await app.router.shutdown()
+
+    print(f"--- EXECUTE BATCH BENCHMARK ({args.tasks} tasks, {args.sessions} sessions) ---")
+    print(f"Single calls:    {singles:.2f}s ({args.tasks / singles:.0f} tasks/s, concurrency {args.concurrency})")
+    print(f"One batch call:  {batched:.2f}s ({args.tasks / batched:.0f} tasks/s)")
+    print(f"Speedup:         {singles / batched:.1f}x")
+    print(f"Batch failures:  {sum(1 for r in results if r['status'] != 'success')}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--url", help="base URL of a running execution server")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,96 @@
+"""
+Benchmark: skill discovery start-up cost, cold scan vs. warm start from the manifest index.
+
+    python bench_skill_discovery.py --skills 5000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from skill_manager import SkillManager
+
+
+def make_manifest(folder, name):
+    with open(os.path.join(folder, "manifest.json"), "w") as f:
+        json.dump({"name": name, "description": "late manifest", "entry_point": "main.py"}, f)
+
+
+def make_skills(root, count):
+    for i in range(count):
+        folder = os.path.join(root, f"skill_{i:05d}")
+        os.makedirs(folder)
+        with open(os.path.join(folder, "manifest.json"), "w") as f:
+            json.dump({
+                "name": f"Skill {i}",
+                "description": "synthetic skill " * 20,
+                "entry_point": "main.py",
+                "trigger_keywords": [f"task {i} alpha", f"task {i} beta", f"task {i} gamma"],
+            }, f)
+        with open(os.path.join(folder, "main.py"), "w") as f:
+            f.write("def run(params):\n    return {'message': 'ok'}\n")
+
+
+def timed_discovery(skills_dir, index_path):
+    manager = SkillManager(skills_dir, index_path=index_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.discover_skills()
+    manager.shutdown()
+    return manager.discovery_stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skills", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        skills_dir = os.path.join(tmp, "Skills")
+        os.makedirs(skills_dir)
+        start = time.perf_counter()
+        make_skills(skills_dir, args.skills)
+        print(f"--- SKILL DISCOVERY BENCHMARK ({args.skills} skills, generated in {time.perf_counter() - start:.1f}s) ---")
+
+        index_path = os.path.join(tmp, "index.json")
+        cold = timed_discovery(skills_dir, index_path)
+        warm = timed_discovery(skills_dir, index_path)
+
+        os.utime(os.path.join(skills_dir, "skill_00000", "manifest.json"))
+        touched = timed_discovery(skills_dir, index_path)
+
+        # A folder that exists before its manifest is written (the root mtime does not change)
+        pending = os.path.join(skills_dir, "skill_pending")
+        os.makedirs(pending)
+        timed_discovery(skills_dir, index_path)
+        make_manifest(pending, "Pending")
+        added = timed_discovery(skills_dir, index_path)
+
+        print(f"Cold scan:       {cold['seconds'] * 1000:.1f} ms ({cold['parsed']} parsed)")
+        print(f"Warm start:      {warm['seconds'] * 1000:.1f} ms ({warm['from_index']} from index)")
+        print(f"One edited:      {touched['seconds'] * 1000:.1f} ms ({touched['parsed']} parsed)")
+        print(f"Manifest added to existing folder: {'PASS' if added['skills'] == args.skills + 1 else 'FAIL'}")
+
+        # Same case through the hot-reload watcher
+        watched = os.path.join(skills_dir, "skill_watched")
+        os.makedirs(watched)
+        manager = SkillManager(skills_dir, index_path=index_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.discover_skills()
+            manager.watch(interval=0.05)
+            make_manifest(watched, "Watched")
+            deadline = time.monotonic() + 5
+            while "skill_watched" not in manager.registry and time.monotonic() < deadline:
+                time.sleep(0.05)
+            manager.stop_watching()
+        manager.shutdown()
+        print(f"Manifest added to existing folder (watcher): {'PASS' if 'skill_watched' in manager.registry else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: trigger matching for /execute, linear keyword scan vs. the precompiled SkillRouter.
+
+    python bench_skill_router.py --skills 5000 --triggers-per-skill 10 --tasks 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from skill_router import SkillRouter
+
+VOCAB = [
+    "deploy", "build", "scan", "report", "summarize", "convert", "fetch", "sync", "backup", "restore",
+    "invoice", "calendar", "email", "pdf", "image", "research", "todo", "project", "budget", "ticket",
+    "docker", "python", "notes", "meeting", "weather", "news", "stock", "translate", "schedule", "audit",
+]
+
+
+def make_triggers(skills, per_skill, rnd):
+    triggers = {}
+    for i in range(skills):
+        triggers[f"skill_{i:05d}"] = [
+            " ".join(rnd.sample(VOCAB, rnd.randint(1, 2))) + f" {rnd.randint(0, 9999):04d}"
+            for _ in range(per_skill)
+        ]
+    return triggers
+
+
+def make_tasks(triggers, count, rnd):
+    all_triggers = [t for ts in triggers.values() for t in ts]
+    tasks = []
+    for _ in range(count):
+        words = rnd.choices(VOCAB, k=30)
+        if rnd.random() < 0.5:
+            words.insert(rnd.randint(0, len(words)), rnd.choice(all_triggers))
+        tasks.append(" ".join(words).capitalize())
+    return tasks
+
+
+def linear_match(skill_list, task):
+    # the original /execute matching loop
+    task_lower = task.lower()
+    for s in skill_list:
+        if any(keyword in task_lower for keyword in s["triggers"]):
+            return s["id"]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skills", type=int, default=5000)
+    parser.add_argument("--triggers-per-skill", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=200)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    triggers = make_triggers(args.skills, args.triggers_per_skill, rnd)
+    tasks = make_tasks(triggers, args.tasks, rnd)
+    skill_list = [{"id": k, "triggers": v} for k, v in triggers.items()]
+
+    start = time.perf_counter()
+    router = SkillRouter(triggers)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    linear = [linear_match(skill_list, t) for t in tasks]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [router.match(t) for t in tasks]
+    indexed_time = time.perf_counter() - start
+
+    agree = sum(1 for a, b in zip(linear, indexed) if (a is None) == (b is None))
+    print(f"--- SKILL ROUTER BENCHMARK ({args.skills} skills, {args.skills * args.triggers_per_skill} triggers) ---")
+    print(f"Index build:     {build * 1000:.1f} ms")
+    print(f"Linear scan:     {linear_time / len(tasks) * 1000:.3f} ms/task")
+    print(f"Router match:    {indexed_time / len(tasks) * 1000:.3f} ms/task")
+    print(f"Speedup:         {linear_time / indexed_time:.1f}x")
+    print(f"Match/no-match agreement: {agree}/{len(tasks)}")
+
+
+if __name__ == "__main__":
+    main()
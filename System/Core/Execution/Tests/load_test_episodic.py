@@ -0,0 +1,83 @@
+"""
+Load test: drive /execute with many sessions and report memory use and latency.
+
+Runs in-process against the FastAPI app by default; pass --url to hit a running server.
+Select the episodic backend with EPISODIC_STORE=memory|sqlite before running (requires httpx).
+
+    python load_test_episodic.py --sessions 10000 --turns 3 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+# Execution layer modules live one directory up
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def rss_mb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return float("nan")
+
+
+async def run(args):
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        memory = None
+    else:
+        from main import app
+        from memory_manager import memory
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest")
+        await app.router.startup()  # ASGITransport does not run lifespan events; this discovers the skills
+
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(session_index, turn):
+        payload = {"task": f"turn {turn} of session {session_index}", "session_id": f"load-{session_index}"}
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/execute", json=payload)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    async with client:
+        for turn in range(args.turns):
+            await asyncio.gather(*(one(i, turn) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+    if not args.url:
+        await app.router.shutdown()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"--- EPISODIC LOAD TEST ({os.getenv('EPISODIC_STORE', 'memory')}) ---")
+    print(f"Requests:        {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"Latency p50:     {percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"Latency p99:     {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"Python heap peak: {peak / 1024 / 1024:.1f} MB (max RSS {rss_mb():.1f} MB)")
+    if not args.url:
+        print(f"Sessions held:   {memory.episodic.session_count()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--url", help="base URL of a running execution server")
+    asyncio.run(run(parser.parse_args()))
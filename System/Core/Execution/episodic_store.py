@@ -0,0 +1,281 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, List, Tuple
+
+# Minimum seconds between idle-session sweeps of the SQLite store
+PRUNE_INTERVAL = 60.0
+
+
+class EpisodicStore(ABC):
+    """Storage contract for per-session conversation history."""
+
+    @abstractmethod
+    def append(self, session_id: str, role: str, content: str):
+        """Add a message to the end of a session."""
+
+    def append_many(self, events: Iterable[Tuple[str, str, str]]):
+        """Add (session_id, role, content) events in order; backends override this to batch the writes."""
+        for session_id, role, content in events:
+            self.append(session_id, role, content)
+
+    @abstractmethod
+    def recent(self, session_id: str, limit: int) -> List[dict]:
+        """Return the last `limit` messages of a session, oldest first."""
+
+    @abstractmethod
+    def session_count(self) -> int:
+        """Number of sessions currently held by the store."""
+
+    # Async variants for request handlers; in-process backends answer inline, blocking ones override these
+    async def aappend(self, session_id: str, role: str, content: str):
+        self.append(session_id, role, content)
+
+    async def aappend_many(self, events: Iterable[Tuple[str, str, str]]):
+        self.append_many(events)
+
+    async def arecent(self, session_id: str, limit: int) -> List[dict]:
+        return self.recent(session_id, limit)
+
+
+class RingBufferEpisodicStore(EpisodicStore):
+    """In-process store: a bounded ring buffer per session, idle sessions evicted LRU."""
+
+    def __init__(self, session_cap: int = 200, max_sessions: int = 10000):
+        self.session_cap = session_cap
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Deque[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def append(self, session_id: str, role: str, content: str):
+        with self._lock:
+            events = self._sessions.get(session_id)
+            if events is None:
+                events = self._sessions[session_id] = deque(maxlen=self.session_cap)
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            events.append({"role": role, "content": content})
+
+    def recent(self, session_id: str, limit: int) -> List[dict]:
+        with self._lock:
+            events = self._sessions.get(session_id)
+            if not events or limit <= 0:
+                return []
+            self._sessions.move_to_end(session_id)
+            start = max(0, len(events) - limit)
+            # copies, so callers can't edit the stored events outside the lock
+            return [dict(events[i]) for i in range(start, len(events))]
+
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteEpisodicStore(EpisodicStore):
+    """
+    Persistent store shared by all workers: SQLite in WAL mode, indexed by (session_id, seq).
+    Async calls run on a small dedicated thread pool (one connection per thread), never on the event loop.
+    Sessions idle for longer than `session_ttl` seconds, and the least recently active ones beyond
+    `max_sessions`, are pruned by a sweep that runs at most every PRUNE_INTERVAL seconds (0 disables either).
+    """
+
+    def __init__(self, db_path: str, session_cap: int = 200, threads: int = 4, max_sessions: int = 0,
+                 session_ttl: float = 0):
+        self.db_path = db_path
+        self.session_cap = session_cap
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self._next_prune = 0.0
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="episodic")
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS episodic_events ("
+            "session_id TEXT NOT NULL, seq INTEGER NOT NULL, role TEXT NOT NULL, "
+            "content TEXT NOT NULL, created REAL NOT NULL, "
+            "PRIMARY KEY (session_id, seq)) WITHOUT ROWID"
+        )
+        # Session counter kept next to the events, so metrics scrapes read one row
+        conn.execute("CREATE TABLE IF NOT EXISTS episodic_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute(
+            "INSERT OR IGNORE INTO episodic_meta (key, value) "
+            "SELECT 'sessions', COUNT(DISTINCT session_id) FROM episodic_events"
+        )
+        # Last activity per session, for pruning idle sessions (backfilled for databases that predate it)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS episodic_sessions ("
+            "session_id TEXT PRIMARY KEY, last_active REAL NOT NULL) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS episodic_sessions_last_active ON episodic_sessions (last_active)")
+        conn.execute(
+            "INSERT OR IGNORE INTO episodic_sessions (session_id, last_active) "
+            "SELECT session_id, MAX(created) FROM episodic_events GROUP BY session_id"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def append(self, session_id: str, role: str, content: str):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT MAX(seq) FROM episodic_events WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            seq = (row[0] or 0) + 1
+            conn.execute(
+                "INSERT INTO episodic_events (session_id, seq, role, content, created) VALUES (?, ?, ?, ?, ?)",
+                (session_id, seq, role, content, time.time()),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO episodic_sessions (session_id, last_active) VALUES (?, ?)",
+                (session_id, time.time()),
+            )
+            if seq == 1:
+                conn.execute("UPDATE episodic_meta SET value = value + 1 WHERE key = 'sessions'")
+            if seq > self.session_cap:
+                conn.execute(
+                    "DELETE FROM episodic_events WHERE session_id = ? AND seq <= ?",
+                    (session_id, seq - self.session_cap),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._maybe_prune()
+
+    def append_many(self, events: Iterable[Tuple[str, str, str]]):
+        """One transaction for the whole batch, with one sequence lookup and one prune per session."""
+        events = list(events)
+        if not events:
+            return
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            next_seq: Dict[str, int] = {}
+            new_sessions = 0
+            rows = []
+            now = time.time()
+            for session_id, role, content in events:
+                seq = next_seq.get(session_id)
+                if seq is None:
+                    row = conn.execute(
+                        "SELECT MAX(seq) FROM episodic_events WHERE session_id = ?", (session_id,)
+                    ).fetchone()
+                    seq = (row[0] or 0) + 1
+                    if seq == 1:
+                        new_sessions += 1
+                next_seq[session_id] = seq + 1
+                rows.append((session_id, seq, role, content, now))
+            conn.executemany(
+                "INSERT INTO episodic_events (session_id, seq, role, content, created) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "DELETE FROM episodic_events WHERE session_id = ? AND seq <= ?",
+                [(session_id, seq - 1 - self.session_cap) for session_id, seq in next_seq.items()
+                 if seq - 1 > self.session_cap],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO episodic_sessions (session_id, last_active) VALUES (?, ?)",
+                [(session_id, now) for session_id in next_seq],
+            )
+            if new_sessions:
+                conn.execute("UPDATE episodic_meta SET value = value + ? WHERE key = 'sessions'", (new_sessions,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._maybe_prune()
+
+    def recent(self, session_id: str, limit: int) -> List[dict]:
+        if limit <= 0:
+            return []
+        rows = self._connection().execute(
+            "SELECT role, content FROM episodic_events WHERE session_id = ? ORDER BY seq DESC LIMIT ?",
+            (session_id, limit),
+        ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def session_count(self) -> int:
+        row = self._connection().execute("SELECT value FROM episodic_meta WHERE key = 'sessions'").fetchone()
+        return row[0] if row else 0
+
+    def prune(self) -> int:
+        """Drop sessions idle past session_ttl, then the least recently active beyond max_sessions."""
+        if self.session_ttl <= 0 and self.max_sessions <= 0:
+            return 0
+        cutoff = time.time() - self.session_ttl if self.session_ttl > 0 else 0
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stale = [row[0] for row in conn.execute(
+                "SELECT session_id FROM episodic_sessions WHERE last_active < ?", (cutoff,)
+            )]
+            if self.max_sessions > 0:
+                count = conn.execute("SELECT value FROM episodic_meta WHERE key = 'sessions'").fetchone()[0]
+                excess = count - len(stale) - self.max_sessions
+                if excess > 0:
+                    stale += [row[0] for row in conn.execute(
+                        "SELECT session_id FROM episodic_sessions WHERE last_active >= ? "
+                        "ORDER BY last_active LIMIT ?",
+                        (cutoff, excess),
+                    )]
+            if stale:
+                conn.executemany("DELETE FROM episodic_events WHERE session_id = ?", [(s,) for s in stale])
+                conn.executemany("DELETE FROM episodic_sessions WHERE session_id = ?", [(s,) for s in stale])
+                conn.execute("UPDATE episodic_meta SET value = MAX(0, value - ?) WHERE key = 'sessions'", (len(stale),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(stale)
+
+    def _maybe_prune(self):
+        now = time.time()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + PRUNE_INTERVAL
+        try:
+            self.prune()
+        except sqlite3.Error as e:
+            print(f"[Episodic] Pruning idle sessions failed: {e}")
+
+    async def aappend(self, session_id: str, role: str, content: str):
+        await self._run(self.append, session_id, role, content)
+
+    async def aappend_many(self, events: Iterable[Tuple[str, str, str]]):
+        await self._run(self.append_many, list(events))
+
+    async def arecent(self, session_id: str, limit: int) -> List[dict]:
+        return await self._run(self.recent, session_id, limit)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+
+def create_episodic_store(base_path: str) -> EpisodicStore:
+    """Select the episodic backend from the environment (EPISODIC_STORE=memory|sqlite)."""
+    backend = os.getenv("EPISODIC_STORE", "memory").lower()
+    session_cap = int(os.getenv("EPISODIC_SESSION_CAP", "200"))
+    max_sessions = int(os.getenv("EPISODIC_MAX_SESSIONS", "10000"))
+    if backend == "sqlite":
+        db_path = os.getenv("EPISODIC_DB_PATH") or os.path.join(base_path, "Episodic", "episodic.db")
+        threads = int(os.getenv("EPISODIC_DB_THREADS", "4"))
+        session_ttl = float(os.getenv("EPISODIC_SESSION_TTL", "0"))
+        return SQLiteEpisodicStore(db_path, session_cap=session_cap, threads=threads,
+                                   max_sessions=max_sessions, session_ttl=session_ttl)
+    return RingBufferEpisodicStore(session_cap=session_cap, max_sessions=max_sessions)
@@ -0,0 +1,253 @@
+import asyncio
+import itertools
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+TERMINAL_STATES = ("succeeded", "failed")
+# A running job whose owner has not renewed its lease for this long is considered abandoned
+LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# How often watchers re-read a job, and the queue looks for jobs submitted or released by other processes
+WATCH_POLL_SECONDS = 1.0
+POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+
+
+class JobQueue:
+    """
+    Priority job queue persisted in SQLite and executed by a bounded pool of asyncio workers.
+    Jobs are claimed atomically and held under a renewable lease, so several processes can share one
+    database: a job runs once, and only jobs whose owner stopped renewing its lease are queued again.
+    Jobs queued by other processes are picked up by polling every `poll_seconds`.
+    Database calls run on a small dedicated thread pool, so a lock held by another process never
+    stalls the event loop.
+    """
+
+    def __init__(self, db_path: str, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]], workers: int = 4,
+                 lease_seconds: float = LEASE_SECONDS, poll_seconds: float = POLL_SECONDS):
+        self.db_path = db_path
+        self.handler = handler
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jobs")
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._queued: set = set()  # ids currently in the local queue
+        self._tasks: List[asyncio.Task] = []
+        self._order = itertools.count()
+        self._watchers: Dict[str, List[asyncio.Queue]] = {}
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, priority INTEGER NOT NULL, status TEXT NOT NULL, "
+            "request TEXT NOT NULL, result TEXT, error TEXT, "
+            "created REAL NOT NULL, started REAL, finished REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, priority, created)")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    async def start(self):
+        """Start the workers on the running loop and reload queued and abandoned jobs."""
+        self._queue = asyncio.PriorityQueue()
+        await self._db(self._requeue_expired)
+        await self._pick_up()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.ensure_future(self._renew_leases()))
+        self._tasks.append(asyncio.ensure_future(self._poll()))
+        print(f"[JobQueue] Started {self.workers} workers, {self._queue.qsize()} jobs queued")
+
+    async def stop(self):
+        """Cancel the workers and hand this process's interrupted jobs back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._db(lambda: self._connection().execute(
+            "UPDATE jobs SET status = 'queued', started = NULL, owner = NULL, heartbeat = NULL "
+            "WHERE status = 'running' AND owner = ?",
+            (self.owner,),
+        ))
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, request: Dict[str, Any], priority: int = 0) -> Dict[str, Any]:
+        """Persist a job and queue it; higher priority runs first, FIFO within a priority."""
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() must be awaited before jobs are submitted")
+        job_id = uuid.uuid4().hex
+        await self._db(lambda: self._connection().execute(
+            "INSERT INTO jobs (id, priority, status, request, created) VALUES (?, ?, 'queued', ?, ?)",
+            (job_id, priority, json.dumps(request), time.time()),
+        ))
+        self._enqueue(job_id, priority)
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._db(self._get, job_id)
+
+    def _get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT id, priority, status, result, error, created, started, finished FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "priority": row[1],
+            "status": row[2],
+            "result": json.loads(row[3]) if row[3] else None,
+            "error": row[4],
+            "created": row[5],
+            "started": row[6],
+            "finished": row[7],
+        }
+
+    def queued_count(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def watch(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the job's state now and after every change, until it finishes.
+        Changes made in this process are pushed immediately; the database is polled for the rest.
+        """
+        updates: asyncio.Queue = asyncio.Queue()
+        self._watchers.setdefault(job_id, []).append(updates)
+        try:
+            job = await self.get(job_id)
+            while job is not None:
+                yield job
+                if job["status"] in TERMINAL_STATES:
+                    break
+                previous = job
+                while job == previous:
+                    try:
+                        job = await asyncio.wait_for(updates.get(), WATCH_POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        job = await self.get(job_id)
+        finally:
+            self._watchers[job_id].remove(updates)
+            if not self._watchers[job_id]:
+                del self._watchers[job_id]
+
+    async def _db(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _enqueue(self, job_id: str, priority: int):
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait((-priority, next(self._order), job_id))
+
+    async def _pick_up(self):
+        """Queue jobs waiting in the database that are not queued here yet (e.g. submitted elsewhere)."""
+        rows = await self._db(lambda: self._connection().execute(
+            "SELECT id, priority FROM jobs WHERE status = 'queued' ORDER BY created"
+        ).fetchall())
+        for job_id, priority in rows:
+            self._enqueue(job_id, priority)
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self._pick_up()
+            except sqlite3.Error as e:
+                print(f"[JobQueue] Polling for new jobs failed: {e}")
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"[JobQueue] Job {job_id} could not be recorded: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        request = await self._db(self._claim, job_id)
+        if request is None:
+            return
+        await self._notify(job_id)
+        try:
+            result = await self.handler(request)
+            await self._db(self._finish, job_id, "succeeded", json.dumps(result), None)
+        except Exception as e:
+            error = getattr(e, "detail", None) or str(e) or type(e).__name__
+            await self._db(self._finish, job_id, "failed", None, str(error))
+        await self._notify(job_id)
+
+    def _claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Atomic claim: only one worker (in any process) moves a job out of 'queued'; returns its request."""
+        conn = self._connection()
+        now = time.time()
+        claimed = conn.execute(
+            "UPDATE jobs SET status = 'running', started = ?, owner = ?, heartbeat = ? WHERE id = ? AND status = 'queued'",
+            (now, self.owner, now, job_id),
+        ).rowcount
+        if not claimed:
+            return None
+        row = conn.execute("SELECT request FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0])
+
+    def _finish(self, job_id: str, status: str, result: Optional[str], error: Optional[str]):
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished = ? WHERE id = ? AND owner = ?",
+            (status, result, error, time.time(), job_id, self.owner),
+        )
+
+    async def _renew_leases(self):
+        """Keep this process's running jobs leased, and pick up jobs whose owner went away."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self._db(lambda: self._connection().execute(
+                    "UPDATE jobs SET heartbeat = ? WHERE status = 'running' AND owner = ?", (time.time(), self.owner)
+                ))
+                for job_id, priority in await self._db(self._requeue_expired):
+                    self._enqueue(job_id, priority)
+            except sqlite3.Error as e:
+                print(f"[JobQueue] Lease renewal failed: {e}")
+
+    def _requeue_expired(self) -> List[tuple]:
+        """Queue running jobs whose lease has lapsed; returns the (id, priority) pairs this call took over."""
+        conn = self._connection()
+        cutoff = time.time() - self.lease_seconds
+        requeued = []
+        for job_id, priority in conn.execute(
+            "SELECT id, priority FROM jobs WHERE status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)", (cutoff,)
+        ).fetchall():
+            if conn.execute(
+                "UPDATE jobs SET status = 'queued', started = NULL, owner = NULL, heartbeat = NULL "
+                "WHERE id = ? AND status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)",
+                (job_id, cutoff),
+            ).rowcount:
+                requeued.append((job_id, priority))
+        return requeued
+
+    async def _notify(self, job_id: str):
+        watchers = self._watchers.get(job_id)
+        if watchers:
+            job = await self.get(job_id)
+            for updates in watchers:
+                updates.put_nowait(job)
@@ -1,19 +1,108 @@
-from fastapi import FastAPI, HTTPException
+import time
+_process_started = time.perf_counter()
+
+import asyncio
+import json
+import os
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+from typing import Dict, List, Optional
 import uvicorn
 from memory_manager import memory
 from skill_manager import skills
+from job_queue import JobQueue
+import metrics
 
 app = FastAPI(title="Vibe Coding Master Execution Layer")
+startup_stats: dict = {}
+
+# Global cap on concurrently executing tasks across all /execute/batch calls
+BATCH_CONCURRENCY = int(os.getenv("EXECUTE_BATCH_CONCURRENCY", "32"))
+_batch_slots: Optional[asyncio.Semaphore] = None
+
+@app.on_event("startup")
+async def report_startup():
+    skills.discover_skills()
+    startup_stats["ready_seconds"] = time.perf_counter() - _process_started
+    startup_stats["skill_discovery"] = skills.discovery_stats
+    await jobs.start()
+    reload_interval = float(os.getenv("SKILL_HOT_RELOAD_INTERVAL", "2"))
+    if reload_interval > 0:
+        skills.watch(reload_interval)
+    print(f"[Execution] Ready in {startup_stats['ready_seconds'] * 1000:.0f} ms "
+          f"(skill discovery {skills.discovery_stats.get('seconds', 0) * 1000:.0f} ms)")
+
+@app.on_event("shutdown")
+async def stop_skills():
+    await jobs.stop()
+    skills.shutdown()
+
+# Per-request sampling profiler: send "X-Profile: 1", fetch the result from /metrics/profiles/{X-Profile-Id}.
+# Off unless METRICS_PROFILING=1: the header is unauthenticated and the sampler walks every thread's stack.
+PROFILING_ENABLED = os.getenv("METRICS_PROFILING", "0") == "1"
+
+def _route_label(request: Request) -> str:
+    # route templates, not raw paths, keep label cardinality bounded (/jobs/{job_id})
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+@app.middleware("http")
+async def instrument(request: Request, call_next):
+    profiler = None
+    if PROFILING_ENABLED and request.headers.get("x-profile", "").lower() in ("1", "true"):
+        profiler = metrics.SamplingProfiler()
+        profiler.start()
+    metrics.requests_in_flight.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        if status >= 500:
+            # handled failures (HTTPException 504 on skill timeouts, ...) never reach the except below
+            metrics.errors_total.inc(route=_route_label(request), type=f"http_{status}")
+    except Exception as e:
+        metrics.errors_total.inc(route=_route_label(request), type=type(e).__name__)
+        raise
+    finally:
+        # streaming responses are measured up to their headers
+        route = _route_label(request)
+        metrics.requests_in_flight.dec()
+        metrics.request_seconds.observe(time.perf_counter() - start, route=route, method=request.method)
+        metrics.requests_total.inc(route=route, method=request.method, status=status)
+        if profiler:
+            profiler.stop()
+    if profiler:
+        response.headers["X-Profile-Id"] = metrics.profiles.add(profiler.collapsed())
+    return response
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """Collapsed stacks (flamegraph.pl / speedscope format) sampled while the profiled request ran."""
+    profile = metrics.profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found.")
+    return PlainTextResponse(profile)
 
 class TaskRequest(BaseModel):
     task: str
     session_id: str = "default_session"
     context: dict = {}
+    include_system_context: bool = False
 
 @app.get("/")
 async def root():
-    return {"status": "online", "service": "Vibe Coding Master Execution Layer"}
+    return {"status": "online", "service": "Vibe Coding Master Execution Layer", "startup": startup_stats}
+
+@app.get("/system_context")
+async def system_context():
+    text, context_hash = memory.get_system_context()
+    return {"system_context_hash": context_hash, "system_context": text}
 
 @app.get("/skills")
 async def list_skills():
@@ -21,43 +110,238 @@ async def list_skills():
 
 @app.post("/execute")
 async def execute_task(request: TaskRequest):
+    return await _execute(request)
+
+async def _execute(request: TaskRequest) -> dict:
     # 1. Retrieve Episodic context for the session
-    history = memory.get_episodic_context(request.session_id)
-    
-    # 2. Get high-level TELOS context
-    system_context = memory.get_system_prompt_context()
+    with metrics.stage("episodic_context"):
+        history = await memory.aget_episodic_context(request.session_id)
     
-    # 3. Pattern Match for Skills
-    task_lower = request.task.lower()
-    matched_skill = None
+    # 2. Get high-level TELOS context (cached, rebuilt only when the policy/goal files change)
+    with metrics.stage("system_context"):
+        system_context, system_context_hash = memory.get_system_context()
     
-    for s in skills.list_skills():
-        if any(keyword in task_lower for keyword in s["triggers"]):
-            matched_skill = s["id"]
-            break
+    # 3. Pattern Match for Skills (single pass over the precompiled trigger index)
+    with metrics.stage("skill_match"):
+        matched_skill = skills.match_skill(request.task)
 
     if matched_skill:
-        # Execute the specific skill
-        response_data = skills.execute_skill(matched_skill, request.context)
+        # Execute the specific skill off the event loop (executor, limits and timeout come from its manifest)
+        try:
+            with metrics.stage("skill_execute"):
+                response_data = await skills.execute_skill_async(matched_skill, request.context)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail=f"Skill '{matched_skill}' timed out.")
         response_message = response_data.get("message", "Skill executed.")
     else:
         # Fallback to standard LLM logic (placeholder)
         response_message = f"Task '{request.task}' processed with session context."
     
     # 4. Memory Updates
-    memory.add_episodic_event(request.session_id, "user", request.task)
-    memory.add_episodic_event(request.session_id, "assistant", response_message)
+    with metrics.stage("memory_write"):
+        await memory.aadd_episodic_events([(request.session_id, "user", request.task),
+                                           (request.session_id, "assistant", response_message)])
     
-    return {
+    response = {
         "status": "success",
         "session_id": request.session_id,
         "matched_skill": matched_skill,
         "history_length": len(history),
-        "system_context": system_context,
+        "system_context_hash": system_context_hash,
         "message": response_message
     }
+    # the full text is served by GET /system_context; only inline it on request
+    if request.include_system_context:
+        response["system_context"] = system_context
+    return response
+
+@app.post("/execute/stream")
+async def execute_task_stream(request: TaskRequest, http_request: Request, format: str = "ndjson"):
+    """Like /execute, but streams start/progress/partial/result events as NDJSON or server-sent events."""
+    sse = format == "sse" or "text/event-stream" in http_request.headers.get("accept", "")
+    history = await memory.aget_episodic_context(request.session_id)
+    system_context, system_context_hash = memory.get_system_context()
+    matched_skill = skills.match_skill(request.task)
+
+    # The user turn is recorded before any work starts, the assistant turn as soon as it is known
+    await memory.aadd_episodic_event(request.session_id, "user", request.task)
+
+    async def events():
+        yield {"event": "start", "data": {
+            "session_id": request.session_id,
+            "matched_skill": matched_skill,
+            "history_length": len(history),
+            "system_context_hash": system_context_hash
+        }}
+        partial = []
+        response_message = None
+        try:
+            if matched_skill:
+                try:
+                    async for event in skills.stream_skill(matched_skill, request.context):
+                        if event["event"] == "result":
+                            response_message = (event["data"] or {}).get("message", "Skill executed.")
+                            event = {"event": "result", "data": {"status": "success", "message": response_message}}
+                        elif event["event"] == "partial" and "text" in event["data"]:
+                            partial.append(str(event["data"]["text"]))
+                        yield event
+                except asyncio.TimeoutError:
+                    yield {"event": "error", "data": {"status_code": 504, "detail": f"Skill '{matched_skill}' timed out."}}
+                except Exception as e:
+                    # headers are already sent: report the failure as a terminal event instead of cutting the stream
+                    print(f"[Execution] Skill '{matched_skill}' failed mid-stream: {e}")
+                    yield {"event": "error", "data": {"status_code": 500, "detail": f"Skill '{matched_skill}' failed: {e}"}}
+            else:
+                # Fallback to standard LLM logic (placeholder)
+                response_message = f"Task '{request.task}' processed with session context."
+                yield {"event": "result", "data": {"status": "success", "message": response_message}}
+        finally:
+            # also runs when the client disconnects mid-stream: keep what was produced so far
+            if response_message is None:
+                response_message = "".join(partial) + " [interrupted]"
+            await memory.aadd_episodic_event(request.session_id, "assistant", response_message)
+
+    async def encode():
+        async for event in events():
+            payload = json.dumps(event["data"])
+            if sse:
+                yield f"event: {event['event']}\ndata: {payload}\n\n"
+            else:
+                yield json.dumps({"event": event["event"], "data": event["data"]}) + "\n"
+
+    return StreamingResponse(encode(), media_type="text/event-stream" if sse else "application/x-ndjson")
+
+class BatchRequest(BaseModel):
+    tasks: List[TaskRequest]
+    stream: bool = False
+
+@app.post("/execute/batch")
+async def execute_batch(batch: BatchRequest):
+    """
+    Run many tasks in one call: one routing pass, one import per matched skill, concurrent execution
+    under EXECUTE_BATCH_CONCURRENCY and one episodic write for the whole batch.
+    Histories are read once per session before execution, so tasks in a batch don't see each other.
+    """
+    global _batch_slots
+    if _batch_slots is None:
+        _batch_slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    tasks = batch.tasks
+    matched = skills.match_skills([t.task for t in tasks])
+    system_context, system_context_hash = memory.get_system_context()
+    session_ids = list({t.session_id for t in tasks})
+    histories = await asyncio.gather(*(memory.aget_episodic_context(sid) for sid in session_ids))
+    history_lengths = {sid: len(history) for sid, history in zip(session_ids, histories)}
+
+    groups: Dict[str, List[int]] = {}
+    for index, skill in enumerate(matched):
+        if skill:
+            groups.setdefault(skill, []).append(index)
+    await asyncio.gather(*(skills.preload(skill) for skill in groups), return_exceptions=True)
+
+    async def run_one(index: int):
+        request, matched_skill = tasks[index], matched[index]
+        async with _batch_slots:
+            if matched_skill:
+                try:
+                    response_data = await skills.execute_skill_async(matched_skill, request.context)
+                except asyncio.TimeoutError:
+                    return index, {"status": "error", "status_code": 504, "session_id": request.session_id,
+                                   "matched_skill": matched_skill, "detail": f"Skill '{matched_skill}' timed out."}
+                except Exception as e:
+                    return index, {"status": "error", "status_code": 500, "session_id": request.session_id,
+                                   "matched_skill": matched_skill, "detail": str(e)}
+                response_message = (response_data or {}).get("message", "Skill executed.")
+            else:
+                # Fallback to standard LLM logic (placeholder)
+                response_message = f"Task '{request.task}' processed with session context."
+        response = {
+            "status": "success",
+            "session_id": request.session_id,
+            "matched_skill": matched_skill,
+            "history_length": history_lengths[request.session_id],
+            "system_context_hash": system_context_hash,
+            "message": response_message
+        }
+        if request.include_system_context:
+            response["system_context"] = system_context
+        return index, response
+
+    # group members run back to back so each skill's module and semaphore stay hot
+    runs = [asyncio.ensure_future(run_one(index)) for group in groups.values() for index in group]
+    runs += [asyncio.ensure_future(run_one(index)) for index, skill in enumerate(matched) if not skill]
+
+    async def record(results: Dict[int, dict]):
+        events = []
+        for index in sorted(results):
+            if results[index]["status"] == "success":
+                events.append((tasks[index].session_id, "user", tasks[index].task))
+                events.append((tasks[index].session_id, "assistant", results[index]["message"]))
+        await memory.aadd_episodic_events(events)
+
+    if not batch.stream:
+        results = dict(await asyncio.gather(*runs))
+        await record(results)
+        return {"results": [results[index] for index in range(len(tasks))]}
+
+    async def stream():
+        results: Dict[int, dict] = {}
+        try:
+            for run in asyncio.as_completed(runs):
+                index, response = await run
+                results[index] = response
+                yield json.dumps({"index": index, **response}) + "\n"
+        finally:
+            for run in runs:
+                run.cancel()
+            await record(results)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+class JobRequest(TaskRequest):
+    priority: int = 0
+
+async def _run_job(payload: dict) -> dict:
+    return await _execute(TaskRequest(**payload))
+
+jobs = JobQueue(
+    db_path=os.getenv("JOB_QUEUE_DB_PATH") or os.path.join(memory.base_path, "Jobs", "jobs.db"),
+    handler=_run_job,
+    workers=int(os.getenv("JOB_WORKERS", "4"))
+)
+
+metrics.registry.register(metrics.Gauge(
+    "episodic_sessions", "Sessions held by the episodic store.", callback=memory.episodic.session_count))
+metrics.registry.register(metrics.Gauge(
+    "skills_registered", "Skills currently registered.", callback=lambda: len(skills.registry)))
+metrics.registry.register(metrics.Gauge(
+    "jobs_queued", "Jobs waiting for a worker.", callback=jobs.queued_count))
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """Queue a task and return its job id immediately; poll GET /jobs/{id} or stream GET /jobs/{id}/events."""
+    payload = request.dict(exclude={"priority"})
+    return await jobs.submit(payload, priority=request.priority)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-sent events with the job's state on every change, ending once it has finished."""
+    if await jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+
+    async def stream():
+        async for job in jobs.watch(job_id):
+            yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
 
 if __name__ == "__main__":
-    # Ensure skills are discovered on startup
-    skills.discover_skills()
+    # Skills are discovered by the startup hook
     uvicorn.run(app, host="0.0.0.0", port=8000)
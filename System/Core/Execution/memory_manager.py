@@ -1,59 +1,126 @@
 import os
 import json
-from typing import Dict, List
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
+from episodic_store import create_episodic_store
+from semantic_memory import SemanticMemory
 
 class MemoryManager:
     def __init__(self, base_path: str):
         self.base_path = base_path
-        self.episodic_memory: Dict[str, List[dict]] = {}
+        self.episodic = create_episodic_store(base_path)
         
         # Initialize Semantic Memory (ChromaDB)
         self.chroma_client = chromadb.PersistentClient(
             path=os.path.join(base_path, "Semantic", "VectorStore")
         )
+        # Chroma's default embedder, held explicitly so queries can be embedded (and cached) up front
+        embedding_function = embedding_functions.DefaultEmbeddingFunction()
         self.collection = self.chroma_client.get_or_create_collection(
-            name="assistant_knowledge"
+            name="assistant_knowledge",
+            embedding_function=embedding_function
         )
+        self.semantic = SemanticMemory(self.collection, embedding_function)
         
         # Load TELOS Goals
         self.goals_path = os.path.join(base_path, "Semantic", "Goals")
+        self.policy_path = os.path.abspath(os.path.join(base_path, "..", "System", "Policy", "System_Policy.md"))
+        self._file_cache: Dict[str, Tuple[Optional[tuple], Any]] = {}
+        self._context_lock = threading.Lock()
+        self._context: Optional[Tuple[tuple, str, str]] = None
         self.directives = self._load_json("Directives.json")
         self.objectives = self._load_json("Objectives.json")
 
+    def _read_cached(self, path: str, parse: Callable[[str], Any], default: Any) -> Tuple[Optional[tuple], Any]:
+        """Return (file version, parsed content), re-reading only when mtime or size changed."""
+        try:
+            st = os.stat(path)
+            version = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            version = None
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached
+        value = default
+        if version is not None:
+            try:
+                with open(path, 'r') as f:
+                    value = parse(f.read())
+            except (OSError, ValueError) as e:
+                # e.g. a half-written or malformed Directives.json: keep serving the last good value;
+                # caching it under the new version logs once per change instead of failing every request
+                value = cached[1] if cached is not None else default
+                print(f"[MemoryManager] Could not parse {path}, keeping the last good version: {e}")
+        self._file_cache[path] = (version, value)
+        return version, value
+
     def _load_json(self, filename: str) -> dict:
-        path = os.path.join(self.goals_path, filename)
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                return json.load(f)
-        return {}
+        return self._read_cached(os.path.join(self.goals_path, filename), json.loads, {})[1]
 
     def get_episodic_context(self, session_id: str, limit: int = 5) -> List[dict]:
         """Retrieve recent conversation history for a session."""
-        return self.episodic_memory.get(session_id, [])[-limit:]
+        return self.episodic.recent(session_id, limit)
 
     def add_episodic_event(self, session_id: str, role: str, content: str):
         """Add a new message to the session context."""
-        if session_id not in self.episodic_memory:
-            self.episodic_memory[session_id] = []
-        self.episodic_memory[session_id].append({"role": role, "content": content})
+        self.episodic.append(session_id, role, content)
+
+    def add_episodic_events(self, events: List[Tuple[str, str, str]]):
+        """Add many (session_id, role, content) messages in one batched write."""
+        self.episodic.append_many(events)
+
+    async def aget_episodic_context(self, session_id: str, limit: int = 5) -> List[dict]:
+        """Like get_episodic_context, without blocking the event loop on a persistent store."""
+        return await self.episodic.arecent(session_id, limit)
+
+    async def aadd_episodic_event(self, session_id: str, role: str, content: str):
+        await self.episodic.aappend(session_id, role, content)
+
+    async def aadd_episodic_events(self, events: List[Tuple[str, str, str]]):
+        await self.episodic.aappend_many(events)
 
     def query_semantic_memory(self, query: str, n_results: int = 3) -> List[str]:
         """Search long-term knowledge using vector similarity."""
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results
-        )
-        return results['documents'][0] if results['documents'] else []
+        return self.semantic.query(query, n_results)
+
+    async def aquery_semantic_memory(self, query: str, n_results: int = 3) -> List[str]:
+        """Search long-term knowledge without blocking the event loop; concurrent queries are batched."""
+        return await self.semantic.aquery(query, n_results)
+
+    def ingest_semantic_documents(self, ids: List[str], documents: List[str], embeddings: Optional[List[List[float]]] = None,
+                                  metadatas: Optional[List[dict]] = None, batch_size: int = 1000) -> int:
+        """Bulk upsert into long-term knowledge, optionally with precomputed embeddings."""
+        return self.semantic.ingest(ids, documents, embeddings, metadatas, batch_size)
+
+    def get_system_context(self) -> Tuple[str, str]:
+        """Return (system context, sha256 of it), rebuilt only when the policy or goal files change on disk."""
+        with self._context_lock:
+            policy_version, policy = self._read_cached(self.policy_path, str, None)
+            directives_version, self.directives = self._read_cached(
+                os.path.join(self.goals_path, "Directives.json"), json.loads, {})
+            objectives_version, self.objectives = self._read_cached(
+                os.path.join(self.goals_path, "Objectives.json"), json.loads, {})
+            versions = (policy_version, directives_version, objectives_version)
+
+            if self._context is None or self._context[0] != versions:
+                if policy is not None:
+                    text = f"CyCOS Prime Directive:\n{policy}\n"
+                else:
+                    text = "CyCOS Prime Directive: None found."
+                if self.directives:
+                    text += f"\nTELOS Directives:\n{json.dumps(self.directives, indent=2)}\n"
+                if self.objectives:
+                    text += f"\nTELOS Objectives:\n{json.dumps(self.objectives, indent=2)}\n"
+                self._context = (versions, text, hashlib.sha256(text.encode("utf-8")).hexdigest())
+            return self._context[1], self._context[2]
 
     def get_system_prompt_context(self) -> str:
-        """Construct the system context using the root System_Policy.md."""
-        policy_path = os.path.abspath(os.path.join(self.base_path, "..", "System", "Policy", "System_Policy.md"))
-        if os.path.exists(policy_path):
-            with open(policy_path, 'r') as f:
-                return f"CyCOS Prime Directive:\n{f.read()}\n"
-        return "CyCOS Prime Directive: None found."
+        """Construct the system context using the root System_Policy.md and the TELOS goals."""
+        return self.get_system_context()[0]
 
 # Singleton instance for the execution layer
 # Redirecting to root Memory plane
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class SemanticMemory:
+    """
+    Query and ingest front-end for a ChromaDB collection.
+
+    Queries are embedded up front so results can be cached by query-embedding hash and
+    collection version. The version is bumped by every write made through this object and whenever
+    the store's document count changes (checked at most every `store_check_interval` seconds), which
+    catches other workers' inserts; cached results also expire after `result_ttl` seconds, which bounds
+    staleness from in-place updates made elsewhere.
+    Concurrent async queries arriving within `window` seconds share one multi-query call.
+    """
+
+    def __init__(self, collection, embedding_function: Callable[[List[str]], Sequence[Sequence[float]]],
+                 window: float = 0.005, max_batch: int = 64, cache_size: int = 4096,
+                 result_ttl: float = 30.0, store_check_interval: float = 1.0):
+        self.collection = collection
+        self.embedding_function = embedding_function
+        self.window = window
+        self.max_batch = max_batch
+        self.result_ttl = result_ttl
+        self.store_check_interval = store_check_interval
+        self.version = 0
+        self._store_count: Optional[int] = None
+        self._store_checked = 0.0
+        self._lock = threading.Lock()
+        self._embeddings: "OrderedDict[str, list]" = OrderedDict()
+        self._results: "OrderedDict[Tuple[str, int], Tuple[int, List[str], float]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._pending: Dict[asyncio.AbstractEventLoop, List[Tuple[str, int, asyncio.Future]]] = {}
+
+    def query(self, query: str, n_results: int = 3) -> List[str]:
+        """Blocking single query (goes through the same cache)."""
+        return self.query_many([query], [n_results])[0]
+
+    async def aquery(self, query: str, n_results: int = 3) -> List[str]:
+        """Coalesce with other concurrent queries and run the batch off the event loop."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(loop, [])
+        pending.append((query, n_results, future))
+        if len(pending) == 1:
+            loop.call_later(self.window, self._flush, loop)
+        elif len(pending) >= self.max_batch:
+            self._flush(loop)
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        batch = self._pending.pop(loop, [])
+        if batch:
+            loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[str, int, asyncio.Future]]):
+        try:
+            results = await asyncio.to_thread(self.query_many, [q for q, _, _ in batch], [n for _, n, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), documents in zip(batch, results):
+            if not future.done():
+                future.set_result(documents)
+
+    def query_many(self, queries: List[str], n_results: List[int]) -> List[List[str]]:
+        """Answer several queries with at most one embedding call and one collection.query call."""
+        embeddings = self._embed(queries)
+        self._check_store()
+        version = self.version
+        keys = [(self._hash(e), version) for e in embeddings]
+        results: List[Optional[List[str]]] = [None] * len(queries)
+        misses: Dict[Tuple[str, int], List[int]] = {}
+        fresh_after = time.monotonic() - self.result_ttl
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._results.get(key)
+                # a cached top-k also answers any smaller k, and a short result means nothing more exists
+                if cached is not None and cached[2] >= fresh_after and (cached[0] >= n_results[i] or len(cached[1]) < cached[0]):
+                    self._results.move_to_end(key)
+                    results[i] = cached[1][:n_results[i]]
+                else:
+                    misses.setdefault(key, []).append(i)
+
+        if misses:
+            miss_keys = list(misses)
+            fetch_n = max(n_results[i] for indexes in misses.values() for i in indexes)
+            response = self.collection.query(
+                query_embeddings=[embeddings[misses[key][0]] for key in miss_keys],
+                n_results=fetch_n
+            )
+            documents = response.get("documents") or [[] for _ in miss_keys]
+            with self._lock:
+                for key, docs in zip(miss_keys, documents):
+                    docs = list(docs or [])
+                    for i in misses[key]:
+                        results[i] = docs[:n_results[i]]
+                    if key[1] == self.version:
+                        self._remember(self._results, key, (fetch_n, docs, time.monotonic()))
+        return results  # type: ignore[return-value]
+
+    def ingest(self, ids: List[str], documents: List[str], embeddings: Optional[List[Sequence[float]]] = None,
+               metadatas: Optional[List[Dict[str, Any]]] = None, batch_size: int = 1000) -> int:
+        """Upsert documents in large batches, embedding them here unless precomputed embeddings are given."""
+        if not (len(ids) == len(documents) and (embeddings is None or len(embeddings) == len(ids))
+                and (metadatas is None or len(metadatas) == len(ids))):
+            raise ValueError("ids, documents, embeddings and metadatas must have the same length")
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            batch_embeddings = embeddings[start:end] if embeddings is not None else self.embedding_function(documents[start:end])
+            self.collection.upsert(
+                ids=ids[start:end],
+                documents=documents[start:end],
+                embeddings=[list(e) for e in batch_embeddings],
+                metadatas=metadatas[start:end] if metadatas is not None else None
+            )
+            self.invalidate()
+        return len(ids)
+
+    def invalidate(self):
+        """Bump the collection version after a write so older cached results are never served."""
+        with self._lock:
+            self.version += 1
+            self._results.clear()
+
+    def _check_store(self):
+        """Invalidate when the store's document count changed, e.g. through another worker's writes."""
+        now = time.monotonic()
+        if now - self._store_checked < self.store_check_interval:
+            return
+        self._store_checked = now
+        try:
+            count = self.collection.count()
+        except Exception as e:
+            print(f"[SemanticMemory] Could not read collection count, relying on the result TTL: {e}")
+            return
+        if count != self._store_count:
+            if self._store_count is not None:
+                self.invalidate()
+            self._store_count = count
+
+    def _embed(self, texts: List[str]) -> List[list]:
+        found: Dict[str, list] = {}
+        with self._lock:
+            for text in texts:
+                vector = self._embeddings.get(text)
+                if vector is not None:
+                    self._embeddings.move_to_end(text)
+                    found[text] = vector
+        missing = list(dict.fromkeys(t for t in texts if t not in found))
+        if missing:
+            vectors = [list(map(float, v)) for v in self.embedding_function(missing)]
+            with self._lock:
+                for text, vector in zip(missing, vectors):
+                    found[text] = vector
+                    self._remember(self._embeddings, text, vector)
+        return [found[t] for t in texts]
+
+    def _remember(self, cache: OrderedDict, key, value):
+        cache[key] = value
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _hash(embedding: Sequence[float]) -> str:
+        return hashlib.sha256(array("f", embedding).tobytes()).hexdigest()
@@ -1,66 +1,549 @@
 import os
 import json
+import asyncio
+import functools
+import hashlib
+import inspect
+import threading
+import time
 import importlib.util
-from typing import Dict, Any
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import AsyncIterator, Dict, Any, List, Optional
+from skill_router import SkillRouter
+import metrics
+
+EXECUTORS = ("inline", "thread", "process")
+INDEX_VERSION = 1
+DISCOVERY_CHUNK = 64
+STREAM_EVENTS = ("progress", "partial", "result")
+
+# Modules loaded inside process-pool workers: entry point path -> (version, module)
+_process_modules: Dict[str, Any] = {}
+
+def _load_module(name: str, module_path: str):
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _module_key(module_path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(module_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _run_in_process(name: str, module_path: str, version: Optional[tuple], params: Dict[str, Any]):
+    """Process-pool entry: load the skill once per worker (and per version) and call its run()."""
+    cached = _process_modules.get(module_path)
+    if cached is None or cached[0] != version:
+        cached = _process_modules[module_path] = (version, _load_module(name, module_path))
+    module = cached[1]
+    result = module.run(params)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    return result
+
+def _next_step(generator):
+    """Advance a sync generator one item: (finished, item or return value)."""
+    try:
+        return False, next(generator)
+    except StopIteration as stop:
+        return True, stop.value
+
+class _Slot:
+    """
+    One of a skill's concurrency slots. Released when the call exits, or, if the call timed out while
+    work it handed to a pool is still running, only once that work has finished (tracked futures).
+    """
+
+    def __init__(self, semaphore: asyncio.Semaphore):
+        self._semaphore = semaphore
+        self._loop = asyncio.get_running_loop()
+        self._pending = 0
+        self._exited = False
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self._exited = True
+        self._release_if_idle()
+
+    def track(self, future: Future):
+        self._pending += 1
+        future.add_done_callback(self._work_done)
+
+    def _work_done(self, future: Future):
+        try:
+            self._loop.call_soon_threadsafe(self._settle_one)
+        except RuntimeError:  # loop already closed, nothing left to release into
+            pass
+
+    def _settle_one(self):
+        self._pending -= 1
+        self._release_if_idle()
+
+    def _release_if_idle(self):
+        if self._exited and self._pending == 0:
+            self._exited = False  # release once
+            self._semaphore.release()
+
+def _stream_event(item: Any) -> Dict[str, Any]:
+    """Normalise an item yielded by a streaming skill into {"event", "data"}."""
+    if isinstance(item, dict):
+        kind = item.get("type")
+        if kind in STREAM_EVENTS:
+            return {"event": kind, "data": {k: v for k, v in item.items() if k != "type"}}
+        return {"event": "partial", "data": item}
+    return {"event": "partial", "data": {"text": str(item)}}
 
 class SkillManager:
-    def __init__(self, skills_dir: str):
+    def __init__(self, skills_dir: str, index_path: Optional[str] = None, thread_workers: int = 16, process_workers: Optional[int] = None,
+                 default_executor: str = "thread", default_concurrency: int = 4, default_timeout: float = 60.0):
         self.skills_dir = skills_dir
+        # kept next to (not inside) the skills dir so writing it does not change the dir mtime
+        self.index_path = index_path or os.getenv("SKILL_INDEX_PATH") or os.path.join(
+            os.path.dirname(os.path.abspath(skills_dir)), f".{os.path.basename(skills_dir)}_index.json")
+        self.discovery_stats: Dict[str, Any] = {}
         self.registry: Dict[str, Dict[str, Any]] = {}
+        self.router = SkillRouter()
+        self.default_executor = default_executor
+        self.default_concurrency = default_concurrency
+        self.default_timeout = default_timeout
+        self._thread_pool = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="skill")
+        self._process_workers = process_workers
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._retiring: List[Dict[str, Any]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
 
     def discover_skills(self):
-        """Scan the skills directory for valid atomic skills."""
+        """Scan the skills directory for valid atomic skills, reusing the manifest index for unchanged folders."""
+        started = time.perf_counter()
         if not os.path.exists(self.skills_dir):
             os.makedirs(self.skills_dir, exist_ok=True)
             return
 
-        for skill_name in os.listdir(self.skills_dir):
-            skill_path = os.path.join(self.skills_dir, skill_name)
-            if os.path.isdir(skill_path):
-                manifest_path = os.path.join(skill_path, "manifest.json")
-                if os.path.exists(manifest_path):
-                    self._register_skill(skill_name, manifest_path)
+        index = self._load_index()
+        cached = index.get("skills", {})
+        # always list the root: a manifest added to an existing folder does not change the root mtime
+        folders = [e.name for e in os.scandir(self.skills_dir) if e.is_dir() and not e.name.startswith(".")]
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        stale = []
+        for folder in folders:
+            key = self._folder_key(folder)
+            if key is None:
+                continue
+            entry = cached.get(folder)
+            if entry and entry["key"] == key:
+                entries[folder] = entry
+            else:
+                stale.append((folder, key))
+
+        # Cold scan: parse changed manifests across the pool, in chunks to keep submit overhead low
+        chunks = [stale[i:i + DISCOVERY_CHUNK] for i in range(0, len(stale), DISCOVERY_CHUNK)]
+        for chunk, manifests in zip(chunks, self._thread_pool.map(
+                lambda chunk: [self._read_manifest(folder) for folder, _ in chunk], chunks)):
+            for (folder, key), manifest in zip(chunk, manifests):
+                entries[folder] = {"key": key, "manifest": manifest}
 
-    def _register_skill(self, folder_name: str, manifest_path: str):
-        """Read manifest and add to registry."""
+        registry: Dict[str, Dict[str, Any]] = {}
+        for folder in sorted(entries):
+            manifest = entries[folder]["manifest"]
+            if manifest is not None:
+                self._register_skill(folder, os.path.join(self.skills_dir, folder, "manifest.json"), manifest, registry)
+        self._swap_registry(registry)
+
+        if stale or len(entries) != len(cached):
+            self._save_index({"version": INDEX_VERSION, "skills": entries})
+
+        self.rebuild_router()
+        self.discovery_stats = {
+            "skills": len(self.registry),
+            "parsed": len(stale),
+            "from_index": len(entries) - len(stale),
+            "seconds": time.perf_counter() - started
+        }
+        print(f"[SkillManager] Discovered {self.discovery_stats['skills']} skills "
+              f"({self.discovery_stats['parsed']} parsed, {self.discovery_stats['from_index']} from index) "
+              f"in {self.discovery_stats['seconds'] * 1000:.1f} ms")
+
+    def _folder_key(self, folder: str) -> Optional[list]:
+        """Change key of a skill folder: its own mtime plus the manifest's (in-place edits keep the dir mtime)."""
+        try:
+            dir_mtime = os.stat(os.path.join(self.skills_dir, folder)).st_mtime_ns
+            manifest_stat = os.stat(os.path.join(self.skills_dir, folder, "manifest.json"))
+        except OSError:
+            return None
+        return [dir_mtime, manifest_stat.st_mtime_ns, manifest_stat.st_size]
+
+    def _read_manifest(self, folder: str) -> Optional[Dict[str, Any]]:
+        """Parse and validate a manifest, None if it is not a usable skill."""
         try:
-            with open(manifest_path, 'r') as f:
+            with open(os.path.join(self.skills_dir, folder, "manifest.json"), 'r') as f:
                 manifest = json.load(f)
-            
+
             # Basic validation
             required_keys = ["name", "description", "entry_point"]
-            if all(key in manifest for key in required_keys):
-                self.registry[folder_name] = {
-                    "manifest": manifest,
-                    "path": os.path.dirname(manifest_path),
-                    "loaded_module": None
-                }
-                print(f"[SkillManager] Registered skill: {manifest['name']}")
+            if not all(key in manifest for key in required_keys):
+                return None
+            executor = manifest.get("executor", self.default_executor)
+            if executor not in EXECUTORS:
+                raise ValueError(f"unknown executor '{executor}', expected one of {EXECUTORS}")
+            print(f"[SkillManager] Registered skill: {manifest['name']}")
+            return manifest
         except Exception as e:
-            print(f"[SkillManager] Failed to register skill in {folder_name}: {e}")
+            print(f"[SkillManager] Failed to register skill in {folder}: {e}")
+            return None
 
-    def execute_skill(self, folder_name: str, params: Dict[str, Any] = None):
-        """Dynamically load and execute a skill's entry point."""
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and index.get("skills_dir") == self.skills_dir:
+                return index
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_index(self, index: Dict[str, Any]):
+        index["skills_dir"] = self.skills_dir
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"[SkillManager] Could not write skill index {self.index_path}: {e}")
+
+    def rebuild_router(self):
+        """Recompile the trigger index from the current registry, or reuse the compiled one saved for the same triggers."""
+        triggers = {
+            k: v["manifest"].get("trigger_keywords", [])
+            for k, v in self.registry.items()
+        }
+        fingerprint = hashlib.sha256(json.dumps(triggers, sort_keys=True).encode("utf-8")).hexdigest()
+        router_path = f"{self.index_path}.router"
+        if self.router.load(router_path, fingerprint):
+            return
+        self.router.rebuild(triggers)
+        try:
+            self.router.save(router_path, fingerprint)
+        except OSError as e:
+            print(f"[SkillManager] Could not write router cache {router_path}: {e}")
+
+    def match_skill(self, task: str) -> Optional[str]:
+        """Return the id of the skill whose triggers best match the task, if any."""
+        return self.router.match(task)
+
+    def match_skills(self, tasks: List[str]) -> List[Optional[str]]:
+        """Route many tasks against one index snapshot; identical task texts are matched once."""
+        router = self.router
+        matches: Dict[str, Optional[str]] = {}
+        for task in tasks:
+            if task not in matches:
+                matches[task] = router.match(task)
+        return [matches[task] for task in tasks]
+
+    def _register_skill(self, folder_name: str, manifest_path: str, manifest: Dict[str, Any], registry: Dict[str, Dict[str, Any]]):
+        """Add a parsed manifest to the registry; the module itself is imported on first execution."""
+        previous = self.registry.get(folder_name)
+        if previous and previous["manifest"] == manifest and (
+            not previous["loaded_module"]
+            or previous["module_key"] == _module_key(self._entry_point(folder_name, previous))
+        ):
+            registry[folder_name] = previous  # keep the loaded module and semaphore
+            return
+        max_concurrency = int(manifest.get("max_concurrency", self.default_concurrency))
+        registry[folder_name] = {
+            "manifest": manifest,
+            "path": os.path.dirname(manifest_path),
+            "loaded_module": None,
+            "module_key": None,
+            "executor": manifest.get("executor", self.default_executor),
+            "max_concurrency": max_concurrency,
+            "timeout": float(manifest.get("timeout_seconds", self.default_timeout)),
+            # a new version shares the old one's slots, so limits hold across a reload
+            "semaphore": previous["semaphore"] if previous and previous["max_concurrency"] == max_concurrency else None,
+            "inflight": 0
+        }
+
+    def _swap_registry(self, registry: Dict[str, Dict[str, Any]]):
+        """Activate a new registry; replaced versions are pre-imported first and retired once drained."""
+        for folder_name, skill_info in registry.items():
+            previous = self.registry.get(folder_name)
+            if previous is None or previous is skill_info or not previous["loaded_module"]:
+                continue
+            try:
+                self._load_run(folder_name, skill_info)
+                print(f"[SkillManager] Reloaded skill: {skill_info['manifest']['name']}")
+            except Exception as e:
+                print(f"[SkillManager] Reload of {folder_name} failed, keeping the running version: {e}")
+                registry[folder_name] = previous
+
+        with self._lock:
+            kept = {id(v) for v in registry.values()}
+            self._retiring.extend(v for v in self.registry.values() if id(v) not in kept and v["loaded_module"])
+            self.registry = registry
+        self._discard_drained()
+
+    def _discard_drained(self):
+        """Drop the modules of retired skill versions with no executions left in flight."""
+        with self._lock:
+            for skill_info in [v for v in self._retiring if v["inflight"] == 0]:
+                skill_info["loaded_module"] = None
+                self._retiring.remove(skill_info)
+
+    def watch(self, interval: float = 2.0):
+        """Poll the skills directory in a background thread and hot-reload changed skills."""
+        if self._watcher and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        # baseline taken now, so changes made right after watch() returns are not folded into it
+        self._watcher = threading.Thread(target=self._watch_loop, args=(interval, self._snapshot()), name="skill-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop_watching.set()
+        if self._watcher:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch_loop(self, interval: float, snapshot: tuple):
+        while not self._stop_watching.wait(interval):
+            try:
+                current = self._snapshot()
+                if current != snapshot:
+                    print("[SkillManager] Change detected in skills directory, reloading")
+                    self.discover_skills()
+                    snapshot = current
+                self._discard_drained()
+            except Exception as e:
+                print(f"[SkillManager] Skill watcher error: {e}")
+
+    def _snapshot(self) -> tuple:
+        """Cheap change fingerprint: folder and manifest keys, plus entry points of imported modules."""
+        try:
+            folders = sorted(e.name for e in os.scandir(self.skills_dir) if e.is_dir() and not e.name.startswith("."))
+        except OSError:
+            return ()
+        registry = self.registry
+        state = []
+        for folder in folders:
+            skill_info = registry.get(folder)
+            module_key = None
+            if skill_info and (skill_info["loaded_module"] or skill_info["executor"] == "process"):
+                module_key = _module_key(self._entry_point(folder, skill_info))
+            state.append((folder, self._folder_key(folder), module_key))
+        return tuple(state)
+
+    def _skill_info(self, folder_name: str) -> Dict[str, Any]:
         if folder_name not in self.registry:
             raise ValueError(f"Skill '{folder_name}' not found.")
+        return self.registry[folder_name]
+
+    def _entry_point(self, folder_name: str, skill_info: Dict[str, Any]) -> str:
+        return os.path.join(skill_info["path"], skill_info["manifest"]["entry_point"])
 
-        skill_info = self.registry[folder_name]
-        manifest = skill_info["manifest"]
-        
-        # Dynamic Import
+    def _load_run(self, folder_name: str, skill_info: Dict[str, Any]):
+        """Import the skill module on first use and return its run() function."""
         if not skill_info["loaded_module"]:
-            module_path = os.path.join(skill_info["path"], manifest["entry_point"])
-            spec = importlib.util.spec_from_file_location(folder_name, module_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            skill_info["loaded_module"] = module
+            module_path = self._entry_point(folder_name, skill_info)
+            module_key = _module_key(module_path)
+            skill_info["loaded_module"] = _load_module(folder_name, module_path)
+            skill_info["module_key"] = module_key
 
-        # Execution
         if hasattr(skill_info["loaded_module"], "run"):
-            return skill_info["loaded_module"].run(params or {})
+            return skill_info["loaded_module"].run
         else:
             raise AttributeError(f"Skill '{folder_name}' missing 'run()' function.")
 
+    def _track(self, skill_info: Dict[str, Any], delta: int):
+        with self._lock:
+            skill_info["inflight"] += delta
+
+    def execute_skill(self, folder_name: str, params: Dict[str, Any] = None):
+        """Dynamically load and execute a skill's entry point (blocking)."""
+        skill_info = self._skill_info(folder_name)
+        self._track(skill_info, 1)
+        try:
+            result = self._load_run(folder_name, skill_info)(params or {})
+            if inspect.isawaitable(result):
+                result = asyncio.run(result)
+            return result
+        finally:
+            self._track(skill_info, -1)
+
+    async def execute_skill_async(self, folder_name: str, params: Dict[str, Any] = None):
+        """Execute a skill without blocking the event loop, honouring its executor, concurrency limit and timeout."""
+        skill_info = self._skill_info(folder_name)
+        if skill_info["semaphore"] is None:
+            skill_info["semaphore"] = asyncio.Semaphore(skill_info["max_concurrency"])
+
+        # the version resolved here runs to completion even if a reload swaps it out meanwhile
+        self._track(skill_info, 1)
+        try:
+            with metrics.skill_call(folder_name):
+                # a timed-out thread or process keeps its slot until it actually finishes
+                async with _Slot(skill_info["semaphore"]) as slot:
+                    return await asyncio.wait_for(
+                        self._dispatch(folder_name, skill_info, params or {}, slot), skill_info["timeout"])
+        finally:
+            self._track(skill_info, -1)
+
+    async def _dispatch(self, folder_name: str, skill_info: Dict[str, Any], params: Dict[str, Any], slot: Optional[_Slot] = None):
+        executor = skill_info["executor"]
+
+        if executor == "process":
+            module_path = self._entry_point(folder_name, skill_info)
+            if self._process_pool is None:
+                # spawn, not fork: by now the thread pools, watcher and event loop are running,
+                # and a forked child would inherit their locks in whatever state they were in
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self._process_workers, mp_context=multiprocessing.get_context("spawn"))
+            return await self._submit(
+                self._process_pool,
+                functools.partial(_run_in_process, folder_name, module_path, _module_key(module_path), params),
+                slot,
+            )
+
+        run = await self._resolve_run(folder_name, skill_info, slot)
+        if inspect.isasyncgenfunction(run) or inspect.isgeneratorfunction(run):
+            # a streaming skill called without streaming: run it through and keep the final result
+            final = None
+            async for event in self._iterate(run, params, executor, None, slot):
+                final = event["data"]
+            return final
+        if inspect.iscoroutinefunction(run):
+            return await run(params)
+        if executor == "inline":
+            result = run(params)
+        else:
+            # on timeout the worker thread is abandoned, not interrupted
+            result = await self._submit(self._thread_pool, functools.partial(run, params), slot)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def preload(self, folder_name: str):
+        """Import a skill's module ahead of a burst of executions, so they don't race to import it."""
+        skill_info = self._skill_info(folder_name)
+        if skill_info["executor"] != "process":
+            await self._resolve_run(folder_name, skill_info)
+
+    async def _resolve_run(self, folder_name: str, skill_info: Dict[str, Any], slot: Optional[_Slot] = None):
+        if skill_info["loaded_module"]:
+            return self._load_run(folder_name, skill_info)
+        # first use: import off the loop, the module body may be slow
+        return await self._submit(self._thread_pool, functools.partial(self._load_run, folder_name, skill_info), slot)
+
+    @staticmethod
+    async def _submit(pool, fn, slot: Optional[_Slot]):
+        """Run fn on a pool; the slot (if any) stays held until fn finishes, even if the caller stops waiting."""
+        future = pool.submit(fn)
+        if slot is not None:
+            slot.track(future)
+        return await asyncio.wrap_future(future)
+
+    async def stream_skill(self, folder_name: str, params: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a skill and yield {"event", "data"} dicts as it produces them, ending with one "result" event.
+        Skills stream by making run() a (sync or async) generator that yields progress/partial items;
+        the next item is only requested once the previous one was consumed, so slow clients slow the skill down.
+        The skill's timeout covers the whole stream.
+        """
+        skill_info = self._skill_info(folder_name)
+        if skill_info["semaphore"] is None:
+            skill_info["semaphore"] = asyncio.Semaphore(skill_info["max_concurrency"])
+        params = params or {}
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + skill_info["timeout"]
+
+        self._track(skill_info, 1)
+        try:
+            with metrics.skill_call(folder_name):
+                async with _Slot(skill_info["semaphore"]) as slot:
+                    run = None
+                    if skill_info["executor"] != "process":
+                        run = await self._resolve_run(folder_name, skill_info, slot)
+                    if run is not None and (inspect.isasyncgenfunction(run) or inspect.isgeneratorfunction(run)):
+                        async for event in self._iterate(run, params, skill_info["executor"], deadline, slot):
+                            yield event
+                    else:
+                        result = await asyncio.wait_for(
+                            self._dispatch(folder_name, skill_info, params, slot), max(0.0, deadline - loop.time()))
+                        yield {"event": "result", "data": result}
+        finally:
+            self._track(skill_info, -1)
+
+    async def _iterate(self, run, params: Dict[str, Any], executor: str, deadline: Optional[float],
+                       slot: Optional[_Slot] = None) -> AsyncIterator[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - loop.time())
+
+        texts: List[str] = []
+        final = None
+        if inspect.isasyncgenfunction(run):
+            generator = run(params)
+            try:
+                while True:
+                    try:
+                        item = await asyncio.wait_for(generator.__anext__(), remaining())
+                    except StopAsyncIteration:
+                        break
+                    event = _stream_event(item)
+                    if event["event"] == "result":
+                        final = event["data"]
+                        continue
+                    if event["event"] == "partial" and "text" in event["data"]:
+                        texts.append(str(event["data"]["text"]))
+                    yield event
+            finally:
+                await generator.aclose()
+        else:
+            generator = run(params)
+            step = functools.partial(_next_step, generator)
+            try:
+                while True:
+                    if executor == "inline":
+                        finished, item = step()
+                    else:
+                        finished, item = await asyncio.wait_for(self._submit(self._thread_pool, step, slot), remaining())
+                    if finished:
+                        if item is not None:
+                            final = item
+                        break
+                    event = _stream_event(item)
+                    if event["event"] == "result":
+                        final = event["data"]
+                        continue
+                    if event["event"] == "partial" and "text" in event["data"]:
+                        texts.append(str(event["data"]["text"]))
+                    yield event
+            finally:
+                try:
+                    generator.close()
+                except ValueError:
+                    pass  # still running in an abandoned worker thread after a timeout
+
+        if final is None:
+            final = {"message": "".join(texts) or "Skill executed."}
+        yield {"event": "result", "data": final}
+
+    def shutdown(self):
+        """Stop the watcher and the executor pools."""
+        self.stop_watching()
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+
     def list_skills(self):
         """Return metadata for all registered skills."""
         return [
@@ -68,14 +551,17 @@ class SkillManager:
                 "id": k,
                 "name": v["manifest"]["name"],
                 "description": v["manifest"]["description"],
-                "triggers": v["manifest"].get("trigger_keywords", [])
+                "triggers": v["manifest"].get("trigger_keywords", []),
+                "executor": v["executor"],
+                "max_concurrency": v["max_concurrency"],
+                "timeout_seconds": v["timeout"]
             }
             for k, v in self.registry.items()
         ]
 
-# Initialize global SkillManager
+# Initialize global SkillManager; skills are discovered by the app's startup hook, not on import,
+# so process-pool workers (which import this module) never scan the skills directory
 # Redirecting to root Agencies plane (Technical wing)
 _current_dir = os.path.dirname(__file__)
 SKILLS_PATH = os.path.abspath(os.path.join(_current_dir, "..", "..", "..", "Agencies", "Technical", "Skills"))
 skills = SkillManager(SKILLS_PATH)
-skills.discover_skills()
@@ -0,0 +1,189 @@
+import hashlib
+import itertools
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Transitions are kept in one flat dict keyed by (state << 21 | ord(char)),
+# which is far more compact than a dict per trie node for tens of thousands of triggers.
+_CHAR_BITS = 21
+
+
+class SkillRouter:
+    """
+    Multi-pattern trigger index (Aho-Corasick) over all skills' trigger keywords.
+    A task is matched in a single pass over its text, regardless of how many triggers exist.
+
+    When several skills match, the winner is chosen deterministically by:
+    1. the longest matched trigger (most specific),
+    2. the number of distinct triggers matched,
+    3. the earliest match position in the task,
+    4. the skill id (alphabetical).
+    """
+
+    def __init__(self, triggers: Optional[Dict[str, List[str]]] = None):
+        self._index = self._build(triggers or {})
+
+    def rebuild(self, triggers: Dict[str, List[str]]):
+        """Replace the index; readers keep using the old one until the swap."""
+        self._index = self._build(triggers)
+
+    def save(self, path: str, fingerprint: str):
+        """Persist the compiled index (as JSON, never pickle) so an unchanged trigger set can skip the build."""
+        goto, fail, keyword_at, output_link, keywords, keyword_skills = self._index
+        data = {
+            "fingerprint": fingerprint,
+            "goto_keys": list(goto), "goto_values": list(goto.values()),
+            "fail": fail, "keyword_at": keyword_at, "output_link": output_link,
+            "keywords": keywords, "keyword_skills": keyword_skills,
+        }
+        body = json.dumps(data, separators=(",", ":"))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # digest of the body on the first line, so a truncated or edited file is never loaded
+            f.write(hashlib.sha256(body.encode("utf-8")).hexdigest() + "\n" + body)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str, fingerprint: str) -> bool:
+        """Swap in a saved index if it was built from the same trigger set; any unreadable file means rebuild."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                digest, _, body = f.read().partition("\n")
+            if hashlib.sha256(body.encode("utf-8")).hexdigest() != digest:
+                return False
+            data = json.loads(body)
+            if data.get("fingerprint") != fingerprint:
+                return False
+            goto = dict(zip(data["goto_keys"], data["goto_values"]))
+            fail, keyword_at, output_link = data["fail"], data["keyword_at"], data["output_link"]
+            keywords, keyword_skills = data["keywords"], data["keyword_skills"]
+            if not self._valid(goto, len(data["goto_keys"]), fail, keyword_at, output_link, keywords, keyword_skills):
+                return False
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return False
+        self._index = (goto, fail, keyword_at, output_link, keywords, keyword_skills)
+        return True
+
+    @staticmethod
+    def _valid(goto, goto_count, fail, keyword_at, output_link, keywords, keyword_skills) -> bool:
+        """Check the shape, types and ranges of every table, so a loaded index can't fail mid-match."""
+        states = len(fail)
+        if (not states or len(goto) != goto_count or goto_count != states - 1 or len(keyword_at) != states
+                or len(output_link) != states or len(keyword_skills) != len(keywords)):
+            return False
+        # min/max raise TypeError on anything but numbers; the digest already rules out hand edits
+        if goto and (min(goto) < 0 or min(goto.values()) < 1 or max(goto.values()) >= states):
+            return False
+        if min(fail) < 0 or max(fail) >= states or min(output_link) < 0 or max(output_link) >= states:
+            return False
+        # the root links to itself only, any other state is reached through the trie
+        if fail[0] or output_link[0] or keyword_at[0] != -1:
+            return False
+        if min(keyword_at) < -1 or max(keyword_at) >= len(keywords):
+            return False
+        if keywords and (set(map(type, keywords)) != {str} or not all(keywords)):
+            return False
+        if keyword_skills and set(map(type, keyword_skills)) != {list}:
+            return False
+        return set(map(type, itertools.chain.from_iterable(keyword_skills))) <= {str}
+
+    @staticmethod
+    def _build(triggers: Dict[str, List[str]]):
+        goto: Dict[int, int] = {}
+        fail: List[int] = [0]
+        parent: List[int] = [0]
+        char: List[int] = [0]
+        depth: List[int] = [0]
+        keyword_at: List[int] = [-1]  # keyword id ending at each state, -1 if none
+        keywords: List[str] = []
+        keyword_ids: Dict[str, int] = {}
+        keyword_skills: List[List[str]] = []
+
+        for skill_id in sorted(triggers):
+            for raw in triggers[skill_id]:
+                keyword = str(raw).lower()
+                if not keyword:
+                    continue
+                kid = keyword_ids.get(keyword)
+                if kid is None:
+                    kid = keyword_ids[keyword] = len(keywords)
+                    keywords.append(keyword)
+                    keyword_skills.append([])
+                    state = 0
+                    for ch in keyword:
+                        key = state << _CHAR_BITS | ord(ch)
+                        nxt = goto.get(key)
+                        if nxt is None:
+                            nxt = len(fail)
+                            goto[key] = nxt
+                            fail.append(0)
+                            parent.append(state)
+                            char.append(ord(ch))
+                            depth.append(depth[state] + 1)
+                            keyword_at.append(-1)
+                        state = nxt
+                    keyword_at[state] = kid
+                if skill_id not in keyword_skills[kid]:
+                    keyword_skills[kid].append(skill_id)
+
+        # failure links in breadth-first order, output links skip states without keywords
+        output_link: List[int] = [0] * len(fail)
+        for state in sorted(range(1, len(fail)), key=depth.__getitem__):
+            p = parent[state]
+            if p:
+                f = fail[p]
+                c = char[state]
+                while True:
+                    nxt = goto.get(f << _CHAR_BITS | c)
+                    if nxt is not None:
+                        fail[state] = nxt
+                        break
+                    if f == 0:
+                        break
+                    f = fail[f]
+            f = fail[state]
+            output_link[state] = f if keyword_at[f] >= 0 else output_link[f]
+
+        return goto, fail, keyword_at, output_link, keywords, keyword_skills
+
+    def match_all(self, text: str) -> Dict[str, Tuple[int, int, int]]:
+        """Return {skill_id: (longest trigger, distinct triggers, first position)} for every matching skill."""
+        goto, fail, keyword_at, output_link, keywords, keyword_skills = self._index
+        found: Dict[int, int] = {}  # keyword id -> first start position
+        state = 0
+        for pos, ch in enumerate(text.lower()):
+            c = ord(ch)
+            while True:
+                nxt = goto.get(state << _CHAR_BITS | c)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            s = state if keyword_at[state] >= 0 else output_link[state]
+            while s:
+                kid = keyword_at[s]
+                if kid not in found:
+                    found[kid] = pos - len(keywords[kid]) + 1
+                s = output_link[s]
+
+        scores: Dict[str, List[int]] = {}
+        for kid, start in found.items():
+            length = len(keywords[kid])
+            for skill_id in keyword_skills[kid]:
+                score = scores.get(skill_id)
+                if score is None:
+                    scores[skill_id] = [length, 1, start]
+                else:
+                    score[0] = max(score[0], length)
+                    score[1] += 1
+                    score[2] = min(score[2], start)
+        return {skill_id: tuple(score) for skill_id, score in scores.items()}
+
+    def match(self, text: str) -> Optional[str]:
+        """Return the best matching skill id for a task, or None."""
+        scores = self.match_all(text)
+        if not scores:
+            return None
+        return min(scores, key=lambda s: (-scores[s][0], -scores[s][1], scores[s][2], s))
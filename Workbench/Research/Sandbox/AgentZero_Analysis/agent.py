@@ -19,7 +19,10 @@ from python.helpers import (
     tokens,
     context as context_helper,
     dirty_json,
-    subagents
+    signals,
+    subagents,
+    sync_bridge,
+    tool_registry,
 )
 from python.helpers.print_style import PrintStyle
 
@@ -29,7 +32,7 @@ from langchain_core.prompts import (
 from langchain_core.messages import SystemMessage, BaseMessage
 
 import python.helpers.log as Log
-from python.helpers.dirty_json import DirtyJson
+from python.helpers.json_stream import DirtyJsonStream
 from python.helpers.defer import DeferredTask
 from typing import Callable
 from python.helpers.localization import Localization
@@ -86,7 +89,9 @@ class AgentContext:
         self.output_data = output_data or {}
         self.log = log or Log.Log()
         self.log.context = self
-        self.paused = paused
+        # pause signal, agents await it instead of polling
+        self.unpaused = signals.AsyncFlag(not paused)
+        self.intervened = signals.AsyncFlag()
         self.streaming_agent = streaming_agent
         self.task: DeferredTask | None = None
         self.created_at = created_at or datetime.now(timezone.utc)
@@ -162,6 +167,37 @@ class AgentContext:
             context.task.kill()
         return context
 
+    @property
+    def paused(self) -> bool:
+        return not self.unpaused.is_set()
+
+    @paused.setter
+    def paused(self, value: bool):
+        if value:
+            self.unpaused.clear()
+        else:
+            self.unpaused.set()  # wakes up all waiting agents immediately
+
+    async def wait_if_paused(self):
+        while self.paused:
+            await self.unpaused.wait()
+
+    async def wait_for_intervention(self, timeout: float | None = None) -> bool:
+        """Wait until a user message reaches the running chain; False if timeout passes first."""
+        try:
+            return await asyncio.wait_for(self.intervened.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+    def clear_intervention_signal(self):
+        # only once every agent in the chain has consumed its message
+        agent = self.get_agent()
+        while agent:
+            if agent.intervention:
+                return
+            agent = agent.data.get(Agent.DATA_NAME_SUPERIOR, None)
+        self.intervened.clear()
+
     def get_data(self, key: str, recursive: bool = True):
         # recursive is not used now, prepared for context hierarchy
         return self.data.get(key, None)
@@ -258,6 +294,7 @@ class AgentContext:
                 intervention_agent = intervention_agent.data.get(
                     Agent.DATA_NAME_SUPERIOR, None
                 )
+            self.intervened.set()  # wakes agents waiting on it, e.g. in a retry backoff
         else:
             self.task = self.run_task(self._process_chain, current_agent, msg)
 
@@ -277,9 +314,9 @@ class AgentContext:
     async def _process_chain(self, agent: "Agent", msg: "UserMessage|str", user=True):
         try:
             msg_template = (
-                agent.hist_add_user_message(msg)  # type: ignore
+                await agent.hist_add_user_message_async(msg)  # type: ignore
                 if user
-                else agent.hist_add_tool_result(
+                else await agent.hist_add_tool_result_async(
                     tool_name="call_subordinate", tool_result=msg  # type: ignore
                 )
             )
@@ -336,6 +373,7 @@ class LoopData:
         self.params_temporary: dict = {}
         self.params_persistent: dict = {}
         self.current_tool = None
+        self.response_parser = DirtyJsonStream()
 
         # override values with kwargs
         for key, value in kwargs.items():
@@ -379,7 +417,19 @@ class Agent:
         self.intervention: UserMessage | None = None
         self.data: dict[str, Any] = {}  # free data object all the tools can use
 
-        asyncio.run(self.call_extensions("agent_init"))
+        # agent_init runs here when no loop is running; an agent created inside a running loop
+        # (e.g. a new context from a request handler) runs it on the loop that first uses it,
+        # before any other extension point (history writes included)
+        self._init_pending = True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            sync_bridge.run_sync(self._ensure_init())
+
+    async def _ensure_init(self):
+        if self._init_pending:
+            self._init_pending = False  # cleared first, init extensions may call other extension points
+            await call_extensions(extension_point="agent_init", agent=self)
 
     async def monologue(self):
         error_retries = 0  # counter for critical error retries
@@ -398,6 +448,7 @@ class Agent:
                     self.context.streaming_agent = self  # mark self as current streamer
                     self.loop_data.iteration += 1
                     self.loop_data.params_temporary = {}  # clear temporary params
+                    self.loop_data.response_parser.reset()  # new response stream
 
                     # call message_loop_start extensions
                     await self.call_extensions(
@@ -416,9 +467,11 @@ class Agent:
                         await self.handle_intervention()
 
 
-                        async def reasoning_callback(chunk: str, full: str):
+                        # full is a lazy models.StreamText: reading it builds the whole text,
+                        # so the defaults below only touch the delta and its length
+                        async def reasoning_callback(chunk: str, full: models.StreamText):
                             await self.handle_intervention()
-                            if chunk == full:
+                            if len(chunk) == len(full):
                                 printer.print("Reasoning: ")  # start of reasoning
                             # Pass chunk and full data to extensions for processing
                             stream_data = {"chunk": chunk, "full": full}
@@ -433,10 +486,10 @@ class Agent:
                             # Use the potentially modified full text for downstream processing
                             await self.handle_reasoning_stream(stream_data["full"])
 
-                        async def stream_callback(chunk: str, full: str):
+                        async def stream_callback(chunk: str, full: models.StreamText):
                             await self.handle_intervention()
                             # output the agent response stream
-                            if chunk == full:
+                            if len(chunk) == len(full):
                                 printer.print("Response: ")  # start of response
                             # Pass chunk and full data to extensions for processing
                             stream_data = {"chunk": chunk, "full": full}
@@ -448,8 +501,11 @@ class Agent:
                             # Stream masked chunk after extensions processed it
                             if stream_data.get("chunk"):
                                 printer.stream(stream_data["chunk"])
-                            # Use the potentially modified full text for downstream processing
-                            await self.handle_response_stream(stream_data["full"])
+                            # Use the potentially modified full text for downstream processing,
+                            # while it is unmodified only the delta needs parsing
+                            await self.handle_response_stream(
+                                stream_data["full"], chunk if stream_data["full"] is full else None
+                            )
 
                         # call main LLM
                         agent_response, _reasoning = await self.call_chat_model(
@@ -459,6 +515,9 @@ class Agent:
                         )
                         await self.handle_intervention(agent_response)
 
+                        # complete a trailing bare value the last chunk left open
+                        self.loop_data.response_parser.finish()
+
                         # Notify extensions to finalize their stream filters
                         await self.call_extensions(
                             "reasoning_stream_end", loop_data=self.loop_data
@@ -475,10 +534,10 @@ class Agent:
                             self.loop_data.last_response == agent_response
                         ):  # if assistant_response is the same as last message in history, let him know
                             # Append the assistant's response to the history
-                            self.hist_add_ai_response(agent_response)
+                            await self.hist_add_ai_response_async(agent_response)
                             # Append warning message to the history
                             warning_msg = self.read_prompt("fw.msg_repeat.md")
-                            self.hist_add_warning(message=warning_msg)
+                            await self.hist_add_warning_async(message=warning_msg)
                             PrintStyle(font_color="orange", padding=True).print(
                                 warning_msg
                             )
@@ -486,7 +545,7 @@ class Agent:
 
                         else:  # otherwise proceed with tool
                             # Append the assistant's response to the history
-                            self.hist_add_ai_response(agent_response)
+                            await self.hist_add_ai_response_async(agent_response)
                             # process tools requested in agent message
                             tools_result = await self.process_tools(agent_response)
                             if tools_result:  # final response of message loop available
@@ -500,7 +559,7 @@ class Agent:
                         # Forward repairable errors to the LLM, maybe it can fix them
                         msg = {"message": errors.format_error(e)}
                         await self.call_extensions("error_format", msg=msg)
-                        self.hist_add_warning(msg["message"])
+                        await self.hist_add_warning_async(msg["message"])
                         PrintStyle(font_color="red", padding=True).print(msg["message"])
                         self.context.log.log(type="warning", content=msg["message"])
                     except Exception as e:
@@ -596,12 +655,12 @@ class Agent:
         PrintStyle(font_color="orange", padding=True).print(
             "Critical error occurred, retrying..."
         )
-        await asyncio.sleep(delay)
+        await self.context.wait_for_intervention(timeout=delay)  # a user message cuts the backoff short
         await self.handle_intervention()
         agent_facing_error = self.read_prompt(
             "fw.msg_critical_error.md", error_message=error_message
         )
-        self.hist_add_warning(message=agent_facing_error)
+        await self.hist_add_warning_async(message=agent_facing_error)
         PrintStyle(font_color="orange", padding=True).print(
             agent_facing_error
         )
@@ -662,22 +721,37 @@ class Agent:
     def set_data(self, field: str, value):
         self.data[field] = value
 
+    # sync variants bridge extension calls without creating event loops; called inside a
+    # running event loop they still work (re-entering it) but are deprecated there,
+    # async code (monologue, tools) must use the *_async variants
+
     def hist_add_message(
         self, ai: bool, content: history.MessageContent, tokens: int = 0
     ):
         self.last_message = datetime.now(timezone.utc)
         # Allow extensions to process content before adding to history
         content_data = {"content": content}
-        asyncio.run(
+        sync_bridge.run_sync(
             self.call_extensions("hist_add_before", content_data=content_data, ai=ai)
         )
         return self.history.add_message(
             ai=ai, content=content_data["content"], tokens=tokens
         )
 
-    def hist_add_user_message(self, message: UserMessage, intervention: bool = False):
-        self.history.new_topic()  # user message starts a new topic in history
+    async def hist_add_message_async(
+        self, ai: bool, content: history.MessageContent, tokens: int = 0
+    ):
+        self.last_message = datetime.now(timezone.utc)
+        # Allow extensions to process content before adding to history
+        content_data = {"content": content}
+        await self.call_extensions(
+            "hist_add_before", content_data=content_data, ai=ai
+        )
+        return self.history.add_message(
+            ai=ai, content=content_data["content"], tokens=tokens
+        )
 
+    def _user_message_content(self, message: UserMessage, intervention: bool):
         # load message template based on intervention
         if intervention:
             content = self.parse_prompt(
@@ -697,30 +771,66 @@ class Agent:
         # remove empty parts from template
         if isinstance(content, dict):
             content = {k: v for k, v in content.items() if v}
+        return content
+
+    def hist_add_user_message(self, message: UserMessage, intervention: bool = False):
+        self.history.new_topic()  # user message starts a new topic in history
+        content = self._user_message_content(message, intervention)
 
         # add to history
         msg = self.hist_add_message(False, content=content)  # type: ignore
         self.last_user_message = msg
         return msg
 
+    async def hist_add_user_message_async(
+        self, message: UserMessage, intervention: bool = False
+    ):
+        self.history.new_topic()  # user message starts a new topic in history
+        content = self._user_message_content(message, intervention)
+
+        # add to history
+        msg = await self.hist_add_message_async(False, content=content)  # type: ignore
+        self.last_user_message = msg
+        return msg
+
     def hist_add_ai_response(self, message: str):
         self.loop_data.last_response = message
         content = self.parse_prompt("fw.ai_response.md", message=message)
         return self.hist_add_message(True, content=content)
 
+    async def hist_add_ai_response_async(self, message: str):
+        self.loop_data.last_response = message
+        content = self.parse_prompt("fw.ai_response.md", message=message)
+        return await self.hist_add_message_async(True, content=content)
+
     def hist_add_warning(self, message: history.MessageContent):
         content = self.parse_prompt("fw.warning.md", message=message)
         return self.hist_add_message(False, content=content)
 
+    async def hist_add_warning_async(self, message: history.MessageContent):
+        content = self.parse_prompt("fw.warning.md", message=message)
+        return await self.hist_add_message_async(False, content=content)
+
     def hist_add_tool_result(self, tool_name: str, tool_result: str, **kwargs):
         data = {
             "tool_name": tool_name,
             "tool_result": tool_result,
             **kwargs,
         }
-        asyncio.run(self.call_extensions("hist_add_tool_result", data=data))
+        sync_bridge.run_sync(self.call_extensions("hist_add_tool_result", data=data))
         return self.hist_add_message(False, content=data)
 
+    async def hist_add_tool_result_async(
+        self, tool_name: str, tool_result: str, **kwargs
+    ):
+        data = {
+            "tool_name": tool_name,
+            "tool_result": tool_result,
+            **kwargs,
+        }
+        await self.call_extensions("hist_add_tool_result", data=data)
+        return await self.hist_add_message_async(False, content=data)
+
     def concat_messages(
         self, messages
     ):  # TODO add param for message range, topic, history
@@ -796,8 +906,8 @@ class Agent:
     async def call_chat_model(
         self,
         messages: list[BaseMessage],
-        response_callback: Callable[[str, str], Awaitable[None]] | None = None,
-        reasoning_callback: Callable[[str, str], Awaitable[None]] | None = None,
+        response_callback: Callable[[str, models.StreamText], Awaitable[None]] | None = None,
+        reasoning_callback: Callable[[str, models.StreamText], Awaitable[None]] | None = None,
         background: bool = False,
     ):
         response = ""
@@ -825,29 +935,29 @@ class Agent:
         return False
 
     async def handle_intervention(self, progress: str = ""):
-        while self.context.paused:
-            await asyncio.sleep(0.1)  # wait if paused
+        if self.context.paused:
+            await self.context.wait_if_paused()  # woken up on resume
         if (
             self.intervention
         ):  # if there is an intervention message, but not yet processed
             msg = self.intervention
             self.intervention = None  # reset the intervention message
+            self.context.clear_intervention_signal()
             # If a tool was running, save its progress to history
             last_tool = self.loop_data.current_tool
             if last_tool:
                 tool_progress = last_tool.progress.strip()
                 if tool_progress:
-                    self.hist_add_tool_result(last_tool.name, tool_progress)
+                    await self.hist_add_tool_result_async(last_tool.name, tool_progress)
                     last_tool.set_progress(None)
             if progress.strip():
-                self.hist_add_ai_response(progress)
+                await self.hist_add_ai_response_async(progress)
             # append the intervention message
-            self.hist_add_user_message(msg, intervention=True)
+            await self.hist_add_user_message_async(msg, intervention=True)
             raise InterventionException(msg)
 
     async def wait_if_paused(self):
-        while self.context.paused:
-            await asyncio.sleep(0.1)
+        await self.context.wait_if_paused()
 
     async def process_tools(self, msg: str):
         # search for tool usage requests in agent message
@@ -929,14 +1039,14 @@ class Agent:
                 error_detail = (
                     f"Tool '{raw_tool_name}' not found or could not be initialized."
                 )
-                self.hist_add_warning(error_detail)
+                await self.hist_add_warning_async(error_detail)
                 PrintStyle(font_color="red", padding=True).print(error_detail)
                 self.context.log.log(
                     type="warning", content=f"{self.agent_name}: {error_detail}"
                 )
         else:
             warning_msg_misformat = self.read_prompt("fw.msg_misformat.md")
-            self.hist_add_warning(warning_msg_misformat)
+            await self.hist_add_warning_async(warning_msg_misformat)
             PrintStyle(font_color="red", padding=True).print(warning_msg_misformat)
             self.context.log.log(
                 type="warning",
@@ -951,12 +1061,19 @@ class Agent:
             text=stream,
         )
 
-    async def handle_response_stream(self, stream: str):
+    async def handle_response_stream(self, stream: "str | models.StreamText", delta: str | None = None):
         await self.handle_intervention()
         try:
+            # parse only the new part of the stream, state is kept between chunks;
+            # a rewritten stream (delta None) is compared with what was parsed so far
+            parser = self.loop_data.response_parser
+            if delta is not None:
+                parser.feed(delta)
+            else:
+                parser.feed_text(str(stream))
             if len(stream) < 25:
                 return  # no reason to try
-            response = DirtyJson.parse_string(stream)
+            response = parser.value  # brings an open string value up to date
             if isinstance(response, dict):
                 await self.call_extensions(
                     "response_stream",
@@ -980,18 +1097,8 @@ class Agent:
         from python.tools.unknown import Unknown
         from python.helpers.tool import Tool
 
-        classes = []
-
-        # search for tools in agent's folder hierarchy
-        paths = subagents.get_paths(self, "tools", name + ".py", default_root="python")
-        for path in paths:
-            try:
-                classes = extract_tools.load_classes_from_file(path, Tool)  # type: ignore[arg-type]
-                break
-            except Exception:
-                continue
-
-        tool_class = classes[0] if classes else Unknown
+        # search for tools in agent's folder hierarchy, cached process-wide
+        tool_class = tool_registry.get_tool_class(self, name, Tool) or Unknown
         return tool_class(
             agent=self,
             name=name,
@@ -1003,6 +1110,8 @@ class Agent:
         )
 
     async def call_extensions(self, extension_point: str, **kwargs) -> Any:
+        if self._init_pending:
+            await self._ensure_init()
         return await call_extensions(
             extension_point=extension_point, agent=self, **kwargs
         )
@@ -0,0 +1,54 @@
+"""
+Benchmark: accumulating a streamed response the way unified_call does.
+
+Each chunk is appended and handed to a stream callback with the full text so
+far, for responses of growing length:
+
+  read - the full text is materialized for every callback (previous behaviour)
+  lazy - StreamText handle, the callback only reads the delta and len()
+
+lazy should grow linearly with the number of chunks, read does not.
+
+    python bench_chat_result.py --chunks 20000 40000 80000
+"""
+
+import argparse
+import random
+import time
+
+from python_helpers_stream_text import StreamText
+
+
+def make_chunks(count: int, seed: int = 0) -> list[str]:
+    rnd = random.Random(seed)
+    words = ["alpha", " beta", " gamma", " delta", "\n", " {", "}", " tool", "_args", " </", "thi", "nk"]
+    return [rnd.choice(words) for _ in range(count)]
+
+
+def run_lazy(chunks: list[str], read_full: bool) -> float:
+    text = StreamText()
+    seen = 0
+    start = time.perf_counter()
+    for delta in chunks:
+        text.append(delta)
+        seen += len(delta) + len(text)
+        if read_full:
+            seen += len(text.value)
+    final = str(text)  # built once at the end, like unified_call's return value
+    assert len(final) == len(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, nargs="+", default=[20_000, 40_000, 80_000])
+    args = parser.parse_args()
+
+    print(f"{'chunks':>8} {'read s':>10} {'lazy s':>10}")
+    for count in args.chunks:
+        chunks = make_chunks(count)
+        print(f"{count:>8} {run_lazy(chunks, True):>10.4f} {run_lazy(chunks, False):>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: history appends per second with N registered hist_add_before extensions.
+
+  before  - asyncio.run(call_extensions(...)) per append (old hist_add_message)
+  bridge  - sync_bridge.run_sync(...) per append (new sync hist_add_message)
+  async   - await call_extensions(...) per append (new hist_add_message_async)
+
+    python bench_hist_add.py --appends 2000 --extensions 0 1 5 20
+"""
+
+import argparse
+import asyncio
+import time
+
+from python_helpers_sync_bridge import run_sync
+
+
+class Extension:
+    async def execute(self, content_data: dict, ai: bool, **kwargs):
+        content_data["content"] = content_data["content"]
+
+
+async def call_extensions(extensions: list[Extension], **kwargs):
+    for ext in extensions:
+        await ext.execute(**kwargs)
+
+
+def bench_before(extensions: list[Extension], appends: int) -> float:
+    history: list = []
+    start = time.perf_counter()
+    for i in range(appends):
+        content_data = {"content": f"message {i}"}
+        asyncio.run(call_extensions(extensions, content_data=content_data, ai=False))
+        history.append(content_data["content"])
+    return appends / (time.perf_counter() - start)
+
+
+def bench_bridge(extensions: list[Extension], appends: int) -> float:
+    history: list = []
+    start = time.perf_counter()
+    for i in range(appends):
+        content_data = {"content": f"message {i}"}
+        run_sync(call_extensions(extensions, content_data=content_data, ai=False))
+        history.append(content_data["content"])
+    return appends / (time.perf_counter() - start)
+
+
+async def bench_async(extensions: list[Extension], appends: int) -> float:
+    history: list = []
+    start = time.perf_counter()
+    for i in range(appends):
+        content_data = {"content": f"message {i}"}
+        await call_extensions(extensions, content_data=content_data, ai=False)
+        history.append(content_data["content"])
+    return appends / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--appends", type=int, default=2000)
+    parser.add_argument("--extensions", type=int, nargs="+", default=[0, 1, 5, 20])
+    args = parser.parse_args()
+
+    print(f"{'extensions':>10} {'before/s':>10} {'bridge/s':>10} {'async/s':>12}")
+    for n in args.extensions:
+        extensions = [Extension() for _ in range(n)]
+        before = bench_before(extensions, args.appends)
+        bridge = bench_bridge(extensions, args.appends)
+        native = asyncio.run(bench_async(extensions, args.appends))
+        print(f"{n:>10} {before:>10.0f} {bridge:>10.0f} {native:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
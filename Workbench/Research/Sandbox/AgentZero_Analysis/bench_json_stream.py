@@ -0,0 +1,102 @@
+"""
+Benchmark: incremental DirtyJsonStream vs. reparsing the accumulated response on every chunk.
+
+Replays chunk streams the way Agent.handle_response_stream receives them.
+Recorded streams can be passed as a JSON file containing a list of chunk lists:
+
+    python bench_json_stream.py --replay recorded_streams.json
+
+Without --replay, synthetic tool-call responses of 1k-100k characters are generated.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from python_helpers_json_stream import DirtyJsonStream
+
+try:
+    from python.helpers.dirty_json import DirtyJson  # type: ignore
+
+    def full_parse(text: str):
+        return DirtyJson.parse_string(text)
+
+    BASELINE = "DirtyJson.parse_string"
+except ImportError:
+
+    def full_parse(text: str):
+        return DirtyJsonStream().feed(text)
+
+    BASELINE = "DirtyJsonStream (fresh per chunk)"
+
+
+def synthetic_stream(size: int, seed: int = 0) -> list[str]:
+    rnd = random.Random(seed)
+    code = "\n".join(
+        f"    value_{i} = compute({i}, 'x' * {i % 7})  # step {i}" for i in range(size // 40 + 1)
+    )
+    response = json.dumps(
+        {
+            "thoughts": ["Need to run the script", "Then inspect the output"],
+            "headline": "Running generated script",
+            "tool_name": "code_execution_tool",
+            "tool_args": {"runtime": "python", "code": code},
+        },
+        indent=4,
+    )[:size]
+    chunks, i = [], 0
+    while i < len(response):
+        step = rnd.randint(1, 24)  # typical LLM delta sizes
+        chunks.append(response[i : i + step])
+        i += step
+    return chunks
+
+
+def replay(chunks: list[str], parse) -> float:
+    full = ""
+    start = time.perf_counter()
+    for chunk in chunks:
+        full += chunk
+        if len(full) < 25:
+            continue
+        parse(full)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--replay", help="JSON file with a list of recorded chunk lists")
+    parser.add_argument(
+        "--baseline-limit",
+        type=int,
+        default=50_000,
+        help="skip the quadratic baseline for streams longer than this",
+    )
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay, "r", encoding="utf-8") as f:
+            streams = json.load(f)
+    else:
+        streams = [synthetic_stream(size) for size in (1_000, 10_000, 50_000, 100_000)]
+
+    print(f"baseline: {BASELINE}")
+    print(f"{'chars':>8} {'chunks':>7} {'baseline s':>11} {'incremental s':>14} {'speedup':>8}")
+    for chunks in streams:
+        length = sum(len(c) for c in chunks)
+
+        stream_parser = DirtyJsonStream()
+        incremental = replay(chunks, stream_parser.feed_text)
+
+        if length <= args.baseline_limit:
+            baseline = replay(chunks, full_parse)
+            print(
+                f"{length:>8} {len(chunks):>7} {baseline:>11.4f} {incremental:>14.4f} {baseline / incremental:>7.1f}x"
+            )
+        else:
+            print(f"{length:>8} {len(chunks):>7} {'skipped':>11} {incremental:>14.4f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
+import json
 import logging
 import os
+import threading
 from typing import (
     Any,
     Awaitable,
@@ -24,9 +26,11 @@ from python.helpers import dotenv
 from python.helpers import settings, dirty_json
 from python.helpers.dotenv import load_dotenv
 from python.helpers.providers import ModelType as ProviderModelType, get_provider_config
-from python.helpers.rate_limiter import RateLimiter
-from python.helpers.tokens import approximate_tokens
-from python.helpers import dirty_json, browser_use_monkeypatch
+from python.helpers.rate_limiting import RateLimiterBackend, create_rate_limiter
+from python.helpers.token_counter import StreamTokenCounter, count_input, count_tokens
+from python.helpers import dirty_json, browser_use_monkeypatch, embedding_cache
+from python.helpers.embedding_cache import BatchedEmbedder
+from python.helpers.stream_text import StreamText
 
 from langchain_core.language_models.chat_models import SimpleChatModel
 from langchain_core.outputs.chat_generation import ChatGenerationChunk
@@ -43,6 +47,7 @@ from langchain_core.messages import (
 from langchain.embeddings.base import Embeddings
 from sentence_transformers import SentenceTransformer
 from pydantic import ConfigDict
+import numpy as np
 
 
 # disable extra logging, must be done repeatedly, otherwise browser-use will turn it back on for some reason
@@ -95,16 +100,33 @@ class ChatChunk(TypedDict):
 class ChatGenerationResult:
     """Chat generation result object"""
     def __init__(self, chunk: ChatChunk|None = None):
-        self.reasoning = ""
-        self.response = ""
+        # deltas are appended to lazy texts, the full strings are only built when read
+        self.reasoning_text = StreamText()
+        self.response_text = StreamText()
         self.thinking = False
         self.thinking_tag = ""
-        self.unprocessed = ""
+        self.unprocessed = ""  # never longer than a partial thinking tag
         self.native_reasoning = False
         self.thinking_pairs = [("<think>", "</think>"), ("<reasoning>", "</reasoning>")]
         if chunk:
             self.add_chunk(chunk)
 
+    @property
+    def response(self) -> str:
+        return self.response_text.value
+
+    @response.setter
+    def response(self, value: str):
+        self.response_text = StreamText(value)
+
+    @property
+    def reasoning(self) -> str:
+        return self.reasoning_text.value
+
+    @reasoning.setter
+    def reasoning(self, value: str):
+        self.reasoning_text = StreamText(value)
+
     def add_chunk(self, chunk: ChatChunk) -> ChatChunk:
         if chunk["reasoning_delta"]:
             self.native_reasoning = True
@@ -116,56 +138,47 @@ class ChatGenerationResult:
             # if the model outputs thinking tags, we ned to parse them manually as reasoning
             processed_chunk = self._process_thinking_chunk(chunk)
 
-        self.reasoning += processed_chunk.get("reasoning_delta", "")
-        self.response += processed_chunk.get("response_delta", "")
+        if processed_chunk["reasoning_delta"]:
+            self.reasoning_text.append(processed_chunk["reasoning_delta"])
+        if processed_chunk["response_delta"]:
+            self.response_text.append(processed_chunk["response_delta"])
 
         return processed_chunk
 
     def _process_thinking_chunk(self, chunk: ChatChunk) -> ChatChunk:
+        # only the new delta and a bounded partial tag tail are scanned
         response_delta = self.unprocessed + chunk["response_delta"]
         self.unprocessed = ""
         return self._process_thinking_tags(response_delta, chunk["reasoning_delta"])
 
     def _process_thinking_tags(self, response: str, reasoning: str) -> ChatChunk:
-        if self.thinking:
-            close_pos = response.find(self.thinking_tag)
-            if close_pos != -1:
-                reasoning += response[:close_pos]
-                response = response[close_pos + len(self.thinking_tag):]
-                self.thinking = False
-                self.thinking_tag = ""
-            else:
-                if self._is_partial_closing_tag(response):
-                    self.unprocessed = response
-                    response = ""
-                else:
-                    reasoning += response
-                    response = ""
-        else:
+        if not self.thinking:
             for opening_tag, closing_tag in self.thinking_pairs:
                 if response.startswith(opening_tag):
                     response = response[len(opening_tag):]
                     self.thinking = True
                     self.thinking_tag = closing_tag
-
-                    close_pos = response.find(closing_tag)
-                    if close_pos != -1:
-                        reasoning += response[:close_pos]
-                        response = response[close_pos + len(closing_tag):]
-                        self.thinking = False
-                        self.thinking_tag = ""
-                    else:
-                        if self._is_partial_closing_tag(response):
-                            self.unprocessed = response
-                            response = ""
-                        else:
-                            reasoning += response
-                            response = ""
                     break
                 elif len(response) < len(opening_tag) and self._is_partial_opening_tag(response, opening_tag):
                     self.unprocessed = response
-                    response = ""
-                    break
+                    return ChatChunk(response_delta="", reasoning_delta=reasoning)
+            else:
+                return ChatChunk(response_delta=response, reasoning_delta=reasoning)
+
+        close_pos = response.find(self.thinking_tag)
+        if close_pos != -1:
+            reasoning += response[:close_pos]
+            response = response[close_pos + len(self.thinking_tag):]
+            self.thinking = False
+            self.thinking_tag = ""
+        else:
+            # hold back only the tail that may be the start of the closing tag
+            keep = self._partial_closing_tag_length(response)
+            if keep:
+                self.unprocessed = response[-keep:]
+                response = response[:-keep]
+            reasoning += response
+            response = ""
 
         return ChatChunk(response_delta=response, reasoning_delta=reasoning)
 
@@ -175,14 +188,17 @@ class ChatGenerationResult:
                 return True
         return False
 
-    def _is_partial_closing_tag(self, text: str) -> bool:
+    def _partial_closing_tag_length(self, text: str) -> int:
         if not self.thinking_tag or not text:
-            return False
+            return 0
         max_check = min(len(text), len(self.thinking_tag) - 1)
-        for i in range(1, max_check + 1):
+        for i in range(max_check, 0, -1):
             if text.endswith(self.thinking_tag[:i]):
-                return True
-        return False
+                return i
+        return 0
+
+    def _is_partial_closing_tag(self, text: str) -> bool:
+        return self._partial_closing_tag_length(text) > 0
 
     def output(self) -> ChatChunk:
         response = self.response
@@ -195,7 +211,7 @@ class ChatGenerationResult:
         return ChatChunk(response_delta=response, reasoning_delta=reasoning)
 
 
-rate_limiters: dict[str, RateLimiter] = {}
+rate_limiters: dict[str, RateLimiterBackend] = {}
 api_keys_round_robin: dict[str, int] = {}
 
 
@@ -217,9 +233,11 @@ def get_api_key(service: str) -> str:
 
 def get_rate_limiter(
     provider: str, name: str, requests: int, input: int, output: int
-) -> RateLimiter:
+) -> RateLimiterBackend:
     key = f"{provider}\\{name}"
-    rate_limiters[key] = limiter = rate_limiters.get(key, RateLimiter(seconds=60))
+    limiter = rate_limiters.get(key)
+    if limiter is None:
+        rate_limiters[key] = limiter = create_rate_limiter(key, seconds=60)
     limiter.limits["requests"] = requests or 0
     limiter.limits["input"] = input or 0
     limiter.limits["output"] = output or 0
@@ -253,11 +271,13 @@ def _is_transient_litellm_error(exc: Exception) -> bool:
 
 async def apply_rate_limiter(
     model_config: ModelConfig | None,
-    input_text: str,
+    input_data: str | list,
     rate_limiter_callback: (
         Callable[[str, str, int, int], Awaitable[bool]] | None
     ) = None,
 ):
+    # input_data is a prompt text, a list of texts or a list of chat messages,
+    # messages are counted one by one so unchanged history hits the token count cache
     if not model_config:
         return
     limiter = get_rate_limiter(
@@ -267,27 +287,33 @@ async def apply_rate_limiter(
         model_config.limit_input,
         model_config.limit_output,
     )
-    limiter.add(input=approximate_tokens(input_text))
-    limiter.add(requests=1)
-    await limiter.wait(rate_limiter_callback)
+    await limiter.acquire(
+        rate_limiter_callback, input=count_input(input_data), requests=1
+    )
     return limiter
 
 
 def apply_rate_limiter_sync(
     model_config: ModelConfig | None,
-    input_text: str,
+    input_data: str | list,
     rate_limiter_callback: (
         Callable[[str, str, int, int], Awaitable[bool]] | None
     ) = None,
 ):
     if not model_config:
         return
-    import asyncio, nest_asyncio
-
-    nest_asyncio.apply()
-    return asyncio.run(
-        apply_rate_limiter(model_config, input_text, rate_limiter_callback)
+    limiter = get_rate_limiter(
+        model_config.provider,
+        model_config.name,
+        model_config.limit_requests,
+        model_config.limit_input,
+        model_config.limit_output,
     )
+    # blocking wait, no nested event loop needed
+    limiter.acquire_sync(
+        rate_limiter_callback, input=count_input(input_data), requests=1
+    )
+    return limiter
 
 
 class LiteLLMChatWrapper(SimpleChatModel):
@@ -377,7 +403,7 @@ class LiteLLMChatWrapper(SimpleChatModel):
         msgs = self._convert_messages(messages)
 
         # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, str(msgs))
+        apply_rate_limiter_sync(self.a0_model_conf, msgs)
 
         # Call the model
         resp = completion(
@@ -401,7 +427,7 @@ class LiteLLMChatWrapper(SimpleChatModel):
         msgs = self._convert_messages(messages)
 
         # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, str(msgs))
+        apply_rate_limiter_sync(self.a0_model_conf, msgs)
 
         result = ChatGenerationResult()
 
@@ -432,7 +458,7 @@ class LiteLLMChatWrapper(SimpleChatModel):
         msgs = self._convert_messages(messages)
 
         # Apply rate limiting if configured
-        await apply_rate_limiter(self.a0_model_conf, str(msgs))
+        await apply_rate_limiter(self.a0_model_conf, msgs)
 
         result = ChatGenerationResult()
 
@@ -459,8 +485,10 @@ class LiteLLMChatWrapper(SimpleChatModel):
         system_message="",
         user_message="",
         messages: List[BaseMessage] | None = None,
-        response_callback: Callable[[str, str], Awaitable[None]] | None = None,
-        reasoning_callback: Callable[[str, str], Awaitable[None]] | None = None,
+        # stream callbacks get (delta, full text so far); the full text is a lazy StreamText,
+        # only materialized if the callback reads it
+        response_callback: Callable[[str, StreamText], Awaitable[None]] | None = None,
+        reasoning_callback: Callable[[str, StreamText], Awaitable[None]] | None = None,
         tokens_callback: Callable[[str, int], Awaitable[None]] | None = None,
         rate_limiter_callback: (
             Callable[[str, str, int, int], Awaitable[bool]] | None
@@ -483,7 +511,7 @@ class LiteLLMChatWrapper(SimpleChatModel):
 
         # Apply rate limiting if configured
         limiter = await apply_rate_limiter(
-            self.a0_model_conf, str(msgs_conv), rate_limiter_callback
+            self.a0_model_conf, msgs_conv, rate_limiter_callback
         )
 
         # Prepare call kwargs and retry config (strip A0-only params before calling LiteLLM)
@@ -494,6 +522,9 @@ class LiteLLMChatWrapper(SimpleChatModel):
 
         # results
         result = ChatGenerationResult()
+        # output tokens are estimated per delta and reconciled once the stream is complete
+        reasoning_tokens = StreamTokenCounter()
+        response_tokens = StreamTokenCounter()
 
         attempt = 0
         while True:
@@ -508,47 +539,44 @@ class LiteLLMChatWrapper(SimpleChatModel):
                 )
 
                 if stream:
-                    # iterate over chunks
-                    async for chunk in _completion:  # type: ignore
-                        got_any_chunk = True
-                        # parse chunk
-                        parsed = _parse_chunk(chunk)
-                        output = result.add_chunk(parsed)
-
-                        # collect reasoning delta and call callbacks
-                        if output["reasoning_delta"]:
-                            if reasoning_callback:
-                                await reasoning_callback(output["reasoning_delta"], result.reasoning)
-                            if tokens_callback:
-                                await tokens_callback(
-                                    output["reasoning_delta"],
-                                    approximate_tokens(output["reasoning_delta"]),
-                                )
-                            # Add output tokens to rate limiter if configured
-                            if limiter:
-                                limiter.add(output=approximate_tokens(output["reasoning_delta"]))
-                        # collect response delta and call callbacks
-                        if output["response_delta"]:
-                            if response_callback:
-                                await response_callback(output["response_delta"], result.response)
-                            if tokens_callback:
-                                await tokens_callback(
-                                    output["response_delta"],
-                                    approximate_tokens(output["response_delta"]),
-                                )
-                            # Add output tokens to rate limiter if configured
-                            if limiter:
-                                limiter.add(output=approximate_tokens(output["response_delta"]))
+                    try:
+                        # iterate over chunks
+                        async for chunk in _completion:  # type: ignore
+                            got_any_chunk = True
+                            # parse chunk
+                            parsed = _parse_chunk(chunk)
+                            output = result.add_chunk(parsed)
+
+                            # collect reasoning delta and call callbacks
+                            if output["reasoning_delta"]:
+                                delta_tokens = reasoning_tokens.add(output["reasoning_delta"])
+                                if reasoning_callback:
+                                    await reasoning_callback(output["reasoning_delta"], result.reasoning_text)
+                                if tokens_callback:
+                                    await tokens_callback(output["reasoning_delta"], delta_tokens)
+                            # collect response delta and call callbacks
+                            if output["response_delta"]:
+                                delta_tokens = response_tokens.add(output["response_delta"])
+                                if response_callback:
+                                    await response_callback(output["response_delta"], result.response_text)
+                                if tokens_callback:
+                                    await tokens_callback(output["response_delta"], delta_tokens)
+                    finally:
+                        # charge output tokens once per call (exact count of what was streamed),
+                        # not one limiter transaction per chunk
+                        if limiter and got_any_chunk:
+                            reasoning_tokens.finalize(result.reasoning)
+                            response_tokens.finalize(result.response)
+                            await limiter.aadd(output=reasoning_tokens.estimated + response_tokens.estimated)
 
                 # non-stream response
                 else:
                     parsed = _parse_chunk(_completion)
                     output = result.add_chunk(parsed)
                     if limiter:
-                        if output["response_delta"]:
-                            limiter.add(output=approximate_tokens(output["response_delta"]))
-                        if output["reasoning_delta"]:
-                            limiter.add(output=approximate_tokens(output["reasoning_delta"]))
+                        await limiter.aadd(
+                            output=count_tokens(output["response_delta"] or "") + count_tokens(output["reasoning_delta"] or "")
+                        )
 
                 # Successful completion of stream
                 return result.response, result.reasoning
@@ -615,8 +643,8 @@ class BrowserCompatibleChatWrapper(ChatOpenRouter):
         run_manager: Optional[CallbackManagerForLLMRun] = None,
         **kwargs: Any,
     ):
-        # Apply rate limiting if configured
-        apply_rate_limiter_sync(self._wrapper.a0_model_conf, str(messages))
+        # Apply rate limiting if configured (async limiter: waiting must not block the event loop)
+        await apply_rate_limiter(self._wrapper.a0_model_conf, messages)
 
         # Call the model
         try:
@@ -658,6 +686,48 @@ class BrowserCompatibleChatWrapper(ChatOpenRouter):
 
         return resp
 
+# options that never change the vectors: credentials, endpoints and transport settings
+# they are left out of the cache namespace, so secrets are never written to the cache and
+# rotating a key or moving the endpoint keeps the cached embeddings
+_EMBED_NAMESPACE_EXCLUDED = {
+    "api_key", "api_base", "base_url", "api_version", "organization", "headers", "extra_headers",
+    "timeout", "stream_timeout", "request_timeout", "max_retries", "num_retries", "retry_strategy",
+    "use_auth_token", "token", "device", "cache_folder", "trust_remote_code",
+}
+_EMBED_NAMESPACE_SECRET_MARKERS = ("key", "token", "secret", "password", "credential")
+
+
+def _embed_namespace_kwargs(kwargs: dict) -> dict:
+    return {
+        k: v
+        for k, v in kwargs.items()
+        if k not in _EMBED_NAMESPACE_EXCLUDED
+        and not k.startswith("aws_") and not k.startswith("vertex_")
+        and not any(marker in k.lower() for marker in _EMBED_NAMESPACE_SECRET_MARKERS)
+    }
+
+
+def _create_embedder(
+    namespace: str, embed_batch: Callable[[List[str]], Any], kwargs: dict, default_batch_size: int
+) -> BatchedEmbedder:
+    # A0-only embedding options, stripped before kwargs reach the provider
+    batch_size = int(kwargs.pop("a0_embed_batch_size", default_batch_size))
+    as_numpy = bool(kwargs.pop("a0_embed_numpy", False))
+    cache_path = kwargs.pop("a0_embed_cache_path", None) or os.getenv("A0_EMBEDDING_CACHE_PATH")
+    use_cache = kwargs.pop("a0_embed_cache", True)
+    vector_kwargs = _embed_namespace_kwargs(kwargs)
+    if vector_kwargs:
+        # provider options such as `dimensions` change the vectors, keep them apart in the cache
+        namespace = f"{namespace}\0{json.dumps(vector_kwargs, sort_keys=True, default=repr)}"
+    return BatchedEmbedder(
+        namespace,
+        embed_batch,
+        batch_size=batch_size,
+        cache=embedding_cache.get_cache(cache_path) if use_cache else None,
+        as_numpy=as_numpy,
+    )
+
+
 class LiteLLMEmbeddingWrapper(Embeddings):
     model_name: str
     kwargs: dict = {}
@@ -671,12 +741,13 @@ class LiteLLMEmbeddingWrapper(Embeddings):
         **kwargs: Any,
     ):
         self.model_name = f"{provider}/{model}" if provider != "openai" else model
-        self.kwargs = kwargs
         self.a0_model_conf = model_config
+        self.embedder = _create_embedder(self.model_name, self._embed_batch, kwargs, 256)
+        self.kwargs = kwargs
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
         # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, " ".join(texts))
+        apply_rate_limiter_sync(self.a0_model_conf, texts)
 
         resp = embedding(model=self.model_name, input=texts, **self.kwargs)
         return [
@@ -684,13 +755,13 @@ class LiteLLMEmbeddingWrapper(Embeddings):
             for item in resp.data  # type: ignore
         ]
 
-    def embed_query(self, text: str) -> List[float]:
-        # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, text)
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # cached, deduplicated and split into batch_size requests
+        return self.embedder.embed_documents(texts)
 
-        resp = embedding(model=self.model_name, input=[text], **self.kwargs)
-        item = resp.data[0]  # type: ignore
-        return item.get("embedding") if isinstance(item, dict) else item.embedding  # type: ignore
+    def embed_query(self, text: str) -> List[float]:
+        # cached, concurrent queries are coalesced into one request
+        return self.embedder.embed_query(text)
 
 
 class LocalSentenceTransformerWrapper(Embeddings):
@@ -710,6 +781,8 @@ class LocalSentenceTransformerWrapper(Embeddings):
         if model.startswith("sentence-transformers/"):
             model = model[len("sentence-transformers/") :]
 
+        self.embedder = _create_embedder(model, self._embed_batch, kwargs, 64)
+
         # Filter kwargs for SentenceTransformer only (no LiteLLM params like 'stream_timeout')
         st_allowed_keys = {
             "device",
@@ -725,22 +798,21 @@ class LocalSentenceTransformerWrapper(Embeddings):
         self.model_name = model
         self.a0_model_conf = model_config
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def _embed_batch(self, texts: List[str]):
         # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, " ".join(texts))
+        apply_rate_limiter_sync(self.a0_model_conf, texts)
 
-        embeddings = self.model.encode(texts, convert_to_tensor=False)  # type: ignore
-        return embeddings.tolist() if hasattr(embeddings, "tolist") else embeddings  # type: ignore
+        return self.model.encode(  # type: ignore
+            texts,
+            batch_size=self.embedder.batch_size,
+            convert_to_numpy=True,
+        ).astype(np.float32)
 
-    def embed_query(self, text: str) -> List[float]:
-        # Apply rate limiting if configured
-        apply_rate_limiter_sync(self.a0_model_conf, text)
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embedder.embed_documents(texts)
 
-        embedding = self.model.encode([text], convert_to_tensor=False)  # type: ignore
-        result = (
-            embedding[0].tolist() if hasattr(embedding[0], "tolist") else embedding[0]
-        )
-        return result  # type: ignore
+    def embed_query(self, text: str) -> List[float]:
+        return self.embedder.embed_query(text)
 
 
 def _get_litellm_chat(
@@ -892,30 +964,127 @@ def _merge_provider_defaults(
     return provider_name, kwargs
 
 
-def get_chat_model(
-    provider: str, name: str, model_config: Optional[ModelConfig] = None, **kwargs: Any
-) -> LiteLLMChatWrapper:
+# model instances are cached per model config, call kwargs and resolved api key,
+# so the agent loop reuses the constructed wrapper and its http client; the whole cache
+# is dropped when .env or the settings merged into every model (litellm_global_kwargs) change
+_model_cache: dict[tuple, Any] = {}
+_model_cache_lock = threading.Lock()
+_model_cache_env: tuple | None = None
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _dotenv_signature() -> int | None:
+    try:
+        return os.stat(dotenv.get_dotenv_file_path()).st_mtime_ns
+    except Exception:
+        return None
+
+
+def _settings_signature() -> Any:
+    try:
+        return _freeze(settings.get_settings().get("litellm_global_kwargs", {}))  # type: ignore[union-attr]
+    except Exception:
+        return None
+
+
+def invalidate_model_cache():
+    """Drop all cached model instances; changes to .env and settings are picked up without it."""
+    with _model_cache_lock:
+        _model_cache.clear()
+
+
+def _get_cached_model(
+    kind: str,
+    provider: str,
+    name: str,
+    model_config: Optional[ModelConfig],
+    kwargs: dict,
+    factory: Callable[..., Any],
+):
+    global _model_cache_env
     orig = provider.lower()
+
+    # resolve the key here, exactly once per call, to keep round-robin rotation intact
+    if "api_key" not in kwargs:
+        key = get_api_key(orig)
+        if key and key not in ("None", "NA"):
+            kwargs["api_key"] = key
+
+    cache_key = (
+        kind,
+        orig,
+        name,
+        _freeze(model_config.__dict__) if model_config else None,
+        _freeze(kwargs),
+    )
+    env = (_dotenv_signature(), _settings_signature())
+    with _model_cache_lock:
+        if env != _model_cache_env:  # .env or settings changed, rebuild everything
+            _model_cache.clear()
+            _model_cache_env = env
+        model = _model_cache.get(cache_key)
+    if model is None:
+        model = factory(orig, name, model_config, dict(kwargs))
+        with _model_cache_lock:
+            _model_cache[cache_key] = model
+    return model
+
+
+def _build_chat_model(
+    orig: str, name: str, model_config: Optional[ModelConfig], kwargs: dict
+) -> LiteLLMChatWrapper:
     provider_name, kwargs = _merge_provider_defaults("chat", orig, kwargs)
     return _get_litellm_chat(
         LiteLLMChatWrapper, name, provider_name, model_config, **kwargs
     )
 
 
-def get_browser_model(
-    provider: str, name: str, model_config: Optional[ModelConfig] = None, **kwargs: Any
+def _build_browser_model(
+    orig: str, name: str, model_config: Optional[ModelConfig], kwargs: dict
 ) -> BrowserCompatibleChatWrapper:
-    orig = provider.lower()
     provider_name, kwargs = _merge_provider_defaults("chat", orig, kwargs)
     return _get_litellm_chat(
         BrowserCompatibleChatWrapper, name, provider_name, model_config, **kwargs
     )
 
 
-def get_embedding_model(
-    provider: str, name: str, model_config: Optional[ModelConfig] = None, **kwargs: Any
+def _build_embedding_model(
+    orig: str, name: str, model_config: Optional[ModelConfig], kwargs: dict
 ) -> LiteLLMEmbeddingWrapper | LocalSentenceTransformerWrapper:
-    orig = provider.lower()
     provider_name, kwargs = _merge_provider_defaults("embedding", orig, kwargs)
     return _get_litellm_embedding(name, provider_name, model_config, **kwargs)
 
+
+def get_chat_model(
+    provider: str, name: str, model_config: Optional[ModelConfig] = None, **kwargs: Any
+) -> LiteLLMChatWrapper:
+    return _get_cached_model(
+        "chat", provider, name, model_config, kwargs, _build_chat_model
+    )
+
+
+def get_browser_model(
+    provider: str, name: str, model_config: Optional[ModelConfig] = None, **kwargs: Any
+) -> BrowserCompatibleChatWrapper:
+    return _get_cached_model(
+        "browser", provider, name, model_config, kwargs, _build_browser_model
+    )
+
+
+def get_embedding_model(
+    provider: str, name: str, model_config: Optional[ModelConfig] = None, **kwargs: Any
+) -> LiteLLMEmbeddingWrapper | LocalSentenceTransformerWrapper:
+    return _get_cached_model(
+        "embedding", provider, name, model_config, kwargs, _build_embedding_model
+    )
@@ -0,0 +1,190 @@
+import hashlib, os, sqlite3, threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Sequence
+
+import numpy as np
+
+# shared machinery for embedding wrappers:
+#  - EmbeddingCache: content-hash keyed LRU in memory (bounded in bytes), optionally backed by a SQLite file
+#  - QueryBatcher: coalesces concurrent single-text requests into one batch call
+#  - BatchedEmbedder: cache lookup, deduplication and size-bounded batching
+
+EmbedBatchFn = Callable[[list[str]], Sequence[Sequence[float]]]
+
+# about 10k float32 vectors of 1536 dimensions
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class EmbeddingCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, path: str | None = None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(namespace: str, text: str) -> str:
+        return hashlib.sha256(f"{namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list[str]) -> list[np.ndarray | None]:
+        result: list[np.ndarray | None] = []
+        missing: list[int] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                else:
+                    missing.append(i)
+                result.append(vector)
+            if missing and self._db:
+                found = self._load([keys[i] for i in missing])
+                for i in missing:
+                    vector = found.get(keys[i])
+                    if vector is not None:
+                        result[i] = vector
+                        self._remember(keys[i], vector)
+        return result
+
+    def put_many(self, keys: list[str], vectors: Sequence[np.ndarray]):
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector)
+            if self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, vector.tobytes()) for key, vector in zip(keys, vectors)],
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._memory[key] = vector
+        self._bytes += vector.nbytes
+        while self._bytes > self.max_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def _load(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        for start in range(0, len(keys), 500):  # stay below the SQLite variable limit
+            chunk = keys[start : start + 500]
+            rows = self._db.execute(  # type: ignore[union-attr]
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+
+_caches: dict[str | None, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(path: str | None = None) -> EmbeddingCache:
+    """Process-wide cache per store path, None is memory only."""
+    with _caches_lock:
+        if path not in _caches:
+            max_bytes = int(os.getenv("A0_EMBEDDING_CACHE_MAX_BYTES") or DEFAULT_MAX_BYTES)
+            _caches[path] = EmbeddingCache(max_bytes=max_bytes, path=path)
+        return _caches[path]
+
+
+class QueryBatcher:
+    """Coalesces texts submitted from concurrent threads into batch calls.
+    A lone caller is embedded immediately; texts arriving while a batch is
+    in flight are sent together in the next one."""
+
+    def __init__(self, embed_batch: EmbedBatchFn, max_batch: int = 64):
+        self.embed_batch = embed_batch
+        self.max_batch = max_batch
+        self._pending: list[tuple[str, Future]] = []
+        self._lock = threading.Lock()
+        self._leader = False
+
+    def embed(self, text: str) -> Sequence[float]:
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((text, future))
+            leader = not self._leader
+            if leader:
+                self._leader = True
+        if leader:
+            self._lead()
+        return future.result()
+
+    def _lead(self):
+        while True:
+            with self._lock:
+                batch = self._pending[: self.max_batch]
+                self._pending = self._pending[self.max_batch :]
+                if not batch:
+                    self._leader = False
+                    return
+            try:
+                vectors = self.embed_batch([text for text, _ in batch])
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(vector)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+class BatchedEmbedder:
+    def __init__(
+        self,
+        namespace: str,
+        embed_batch: EmbedBatchFn,
+        batch_size: int = 128,
+        cache: EmbeddingCache | None = None,
+        as_numpy: bool = False,
+    ):
+        self.namespace = namespace
+        self._embed_batch = embed_batch
+        self.batch_size = max(1, batch_size)
+        self.cache = cache
+        self.as_numpy = as_numpy
+        self._batcher = QueryBatcher(self._embed_uncached, max_batch=self.batch_size)
+
+    def embed_documents(self, texts: list[str]):
+        vectors = self._lookup(texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            embedded: dict[str, np.ndarray] = {}
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start : start + self.batch_size]
+                embedded.update(zip(batch, self._embed_uncached(batch)))
+            vectors = [v if v is not None else embedded[t] for t, v in zip(texts, vectors)]
+        if self.as_numpy:
+            return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+        return [v.tolist() for v in vectors]  # type: ignore[union-attr]
+
+    def embed_query(self, text: str):
+        vector = self._lookup([text])[0]
+        if vector is None:
+            vector = self._batcher.embed(text)
+        return vector if self.as_numpy else vector.tolist()  # type: ignore[union-attr]
+
+    def _lookup(self, texts: list[str]) -> list[np.ndarray | None]:
+        if not self.cache:
+            return [None] * len(texts)
+        return self.cache.get_many([EmbeddingCache.key(self.namespace, t) for t in texts])
+
+    def _embed_uncached(self, texts: list[str]) -> list[np.ndarray]:
+        vectors = [np.asarray(v, dtype=np.float32) for v in self._embed_batch(texts)]
+        if self.cache:
+            self.cache.put_many([EmbeddingCache.key(self.namespace, t) for t in texts], vectors)
+        return vectors
@@ -0,0 +1,272 @@
+import re
+from typing import Any
+
+# incremental counterpart of DirtyJson for streamed LLM output
+# the parser keeps its state between chunks, so each feed() only scans the new delta
+
+_QUOTES = "\"'`"
+_LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "none": None,
+    "undefined": None,
+    "nan": None,
+}
+_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+}
+_STRING_STOPS = {q: re.compile(r"[\\%s]" % re.escape(q)) for q in _QUOTES}
+_BARE_KEY_STOPS = re.compile(r"[:,}]")
+_BARE_VALUE_STOPS = re.compile(r"[,}\]\n]")
+
+# how many trailing characters are remembered to detect a rewritten stream
+_TAIL_LENGTH = 32
+
+# container states
+_KEY, _COLON, _VALUE, _COMMA = range(4)
+
+
+class DirtyJsonStream:
+    """Resumable, lenient JSON object parser fed with stream deltas.
+
+    Text before the first '{' is skipped. The returned root dict is built in
+    place and is live - consumers must treat it as read-only. A string value that
+    is still open is only copied into it when `value` is read (or on finish()),
+    so feeding costs O(delta) however long the string grows.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._value: dict | None = None
+        self.done = False
+        self.consumed = 0
+        self._tail = ""
+        self._stack: list[list[Any]] = []  # [container, state, key]
+        self._token = ""  # "", "string" or "bare"
+        self._is_key = False
+        self._quote = ""
+        self._escape = ""
+        self._parts: list[str] = []
+        self._partial = ""
+        self._target: tuple[Any, Any] | None = None
+
+    @property
+    def value(self) -> dict | None:
+        """The parsed object so far, with the open string value brought up to date."""
+        if self._token == "string" and not self._is_key and self._parts:
+            self._partial += "".join(self._parts)
+            self._parts = []
+            container, key = self._target  # type: ignore[misc]
+            container[key] = self._partial
+        return self._value
+
+    def finish(self) -> dict | None:
+        """End of stream: complete a trailing bare value such as `{"n": 12` and return the object."""
+        if self._token == "bare" and not self.done:
+            if self._is_key:
+                self._token = ""  # a key without a value is dropped
+                self._parts = []
+            else:
+                self._end_bare()
+        return self.value
+
+    def feed_text(self, text: str) -> dict | None:
+        """Feed the full accumulated text, only the unseen suffix is parsed.
+        If the text does not continue the previously fed one, parsing restarts."""
+        tail_start = self.consumed - len(self._tail)
+        if len(text) < self.consumed or not text.startswith(self._tail, tail_start):
+            self.reset()
+        return self.feed(text[self.consumed :])
+
+    def feed(self, delta: str) -> dict | None:
+        if not delta:
+            return self._value
+        self.consumed += len(delta)
+        if len(delta) >= _TAIL_LENGTH:
+            self._tail = delta[-_TAIL_LENGTH:]
+        else:
+            self._tail = (self._tail + delta)[-_TAIL_LENGTH:]
+        if self.done:
+            return self._value
+
+        i, n = 0, len(delta)
+        if self._value is None:
+            i = delta.find("{")
+            if i == -1:
+                return None
+            self._value = {}
+            self._stack.append([self._value, _KEY, None])
+            i += 1
+
+        while i < n and not self.done:
+            if self._token == "string":
+                i = self._scan_string(delta, i)
+                continue
+            if self._token == "bare":
+                i = self._scan_bare(delta, i)
+                continue
+
+            ch = delta[i]
+            i += 1
+            if ch.isspace():
+                continue
+
+            frame = self._stack[-1]
+            if ch == "}" or ch == "]":
+                self._close()
+                continue
+            if ch == ",":
+                frame[1] = _KEY if isinstance(frame[0], dict) else _VALUE
+                continue
+
+            state = frame[1]
+            if state == _COMMA:
+                # missing comma, treat as the next item
+                frame[1] = _KEY if isinstance(frame[0], dict) else _VALUE
+                i -= 1
+                continue
+            if state == _KEY:
+                self._start_token(ch, key=True)
+                continue
+            if state == _COLON:
+                frame[1] = _VALUE
+                if ch != ":":
+                    i -= 1  # missing colon, reparse as value
+                continue
+
+            # state == _VALUE
+            if ch == "{":
+                obj: dict = {}
+                self._attach(obj)
+                self._stack.append([obj, _KEY, None])
+            elif ch == "[":
+                arr: list = []
+                self._attach(arr)
+                self._stack.append([arr, _VALUE, None])
+            else:
+                self._start_token(ch, key=False)
+
+        return self._value
+
+    def _start_token(self, ch: str, key: bool):
+        self._is_key = key
+        self._parts = []
+        self._partial = ""
+        if ch in _QUOTES:
+            self._token = "string"
+            self._quote = ch
+            if not key:
+                self._attach("")
+        else:
+            self._token = "bare"
+            self._parts.append(ch)
+
+    def _attach(self, value: Any):
+        frame = self._stack[-1]
+        container = frame[0]
+        if isinstance(container, dict):
+            container[frame[2]] = value
+            self._target = (container, frame[2])
+        else:
+            container.append(value)
+            self._target = (container, len(container) - 1)
+        frame[1] = _COMMA
+
+    def _close(self):
+        self._stack.pop()
+        if not self._stack:
+            self.done = True
+
+    def _scan_string(self, s: str, i: int) -> int:
+        n = len(s)
+        if self._escape:
+            i = self._scan_escape(s, i)
+        stop = _STRING_STOPS[self._quote]
+        while i < n:
+            m = stop.search(s, i)
+            if not m:
+                self._parts.append(s[i:])
+                return n
+            j = m.start()
+            if j > i:
+                self._parts.append(s[i:j])
+            if s[j] == "\\":
+                self._escape = "\\"
+                i = self._scan_escape(s, j + 1)
+                continue
+            self._end_string()
+            return j + 1
+        return n
+
+    def _scan_escape(self, s: str, i: int) -> int:
+        n = len(s)
+        while i < n and self._escape:
+            self._escape += s[i]
+            i += 1
+            esc = self._escape
+            if esc[1] == "u":
+                if len(esc) < 6:
+                    continue
+                try:
+                    self._parts.append(chr(int(esc[2:], 16)))
+                except ValueError:
+                    self._parts.append(esc)
+            else:
+                self._parts.append(_ESCAPES.get(esc[1], esc[1]))
+            self._escape = ""
+        return i
+
+    def _end_string(self):
+        text = self._partial + "".join(self._parts)
+        self._token = ""
+        self._parts = []
+        self._partial = ""
+        if self._is_key:
+            frame = self._stack[-1]
+            frame[2] = text
+            frame[1] = _COLON
+        else:
+            container, key = self._target  # type: ignore[misc]
+            container[key] = text
+
+    def _scan_bare(self, s: str, i: int) -> int:
+        stops = _BARE_KEY_STOPS if self._is_key else _BARE_VALUE_STOPS
+        m = stops.search(s, i)
+        if not m:
+            self._parts.append(s[i:])
+            return len(s)
+        self._parts.append(s[i : m.start()])
+        self._end_bare()
+        return m.start()  # the stop character is handled by the main loop
+
+    def _end_bare(self):
+        text = "".join(self._parts).strip()
+        self._token = ""
+        self._parts = []
+        if self._is_key:
+            frame = self._stack[-1]
+            frame[2] = text
+            frame[1] = _COLON
+        else:
+            self._attach(_convert_bare(text))
+
+
+def _convert_bare(text: str) -> Any:
+    lower = text.lower()
+    if lower in _LITERALS:
+        return _LITERALS[lower]
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
@@ -0,0 +1,194 @@
+import asyncio, os, sqlite3, tempfile, threading, time
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+
+from python.helpers import sync_bridge
+
+# token bucket rate limiters with interchangeable state backends
+#  - TokenBucketRateLimiter keeps buckets in process memory
+#  - SQLiteRateLimiter keeps them in a local SQLite file shared by all processes using it
+# every key (requests, input, output) is a bucket of `limit` tokens refilled over `seconds`
+# fair mode reserves tokens up front, each caller sleeps exactly until its reservation
+# is covered, so callers are served FIFO and nobody polls
+# non-fair mode waits until tokens are available and then takes them, first come wins
+
+RateLimiterCallback = Callable[[str, str, int, int], Awaitable[bool]]
+
+Buckets = dict[str, list[float]]  # key -> [level, updated]
+
+
+class RateLimiterBackend(ABC):
+
+    def __init__(self, seconds: int = 60, fair: bool = True):
+        self.seconds = seconds
+        self.fair = fair
+        self.limits: dict[str, int] = {}
+
+    @abstractmethod
+    def _transact(self, fn: Callable[[Buckets, float], tuple]) -> tuple:
+        """Run fn atomically over the current buckets and persist changes."""
+
+    def add(self, **amounts: int):
+        """Charge usage without waiting, e.g. output tokens after a call."""
+        self._transact(lambda buckets, now: self._charge(buckets, amounts, now))
+
+    async def aadd(self, **amounts: int):
+        """add() for async callers."""
+        self.add(**amounts)
+
+    async def acquire(self, callback: RateLimiterCallback | None = None, **amounts: int):
+        """Charge usage and wait until the limits allow it."""
+        while True:
+            delay, key, used = await self._reserve_async(amounts)
+            if delay <= 0:
+                return
+            await self._sleep(delay, key, used, callback)
+            if self.fair:
+                return  # reservation was already charged
+
+    def acquire_sync(self, callback: RateLimiterCallback | None = None, **amounts: int):
+        """Blocking variant of acquire for sync callers, no event loop needed."""
+        while True:
+            delay, key, used = self._reserve(amounts)
+            if delay <= 0:
+                return
+            self._sleep_sync(delay, key, used, callback)
+            if self.fair:
+                return
+
+    async def wait(self, callback: RateLimiterCallback | None = None):
+        await self.acquire(callback)
+
+    def _reserve(self, amounts: dict[str, int]) -> tuple[float, str, int]:
+        return self._transact(lambda buckets, now: self._schedule(buckets, amounts, now))
+
+    async def _reserve_async(self, amounts: dict[str, int]) -> tuple[float, str, int]:
+        return self._reserve(amounts)
+
+    def _refill(self, buckets: Buckets, key: str, limit: int, now: float) -> list[float]:
+        bucket = buckets.setdefault(key, [float(limit), now])
+        elapsed = max(0.0, now - bucket[1])
+        bucket[0] = min(float(limit), bucket[0] + elapsed * limit / self.seconds)
+        bucket[1] = now
+        return bucket
+
+    def _charge(self, buckets: Buckets, amounts: dict[str, int], now: float) -> tuple:
+        for key, amount in amounts.items():
+            limit = self.limits.get(key, 0)
+            if limit > 0 and amount:
+                self._refill(buckets, key, limit, now)[0] -= amount
+        return ()
+
+    def _schedule(self, buckets: Buckets, amounts: dict[str, int], now: float) -> tuple[float, str, int]:
+        delay, delay_key, used = 0.0, "", 0
+        for key, limit in self.limits.items():
+            if limit <= 0:
+                continue
+            bucket = self._refill(buckets, key, limit, now)
+            amount = amounts.get(key, 0)
+            rate = limit / self.seconds
+            if self.fair:
+                missing = amount - bucket[0]
+            else:
+                missing = min(amount, limit) - bucket[0]
+            if missing > 0 and missing / rate > delay:
+                delay, delay_key = missing / rate, key
+                used = int(limit - bucket[0] + amount)
+        if self.fair or delay <= 0:
+            self._charge(buckets, amounts, now)
+        return delay, delay_key, used
+
+    def _wait_message(self, key: str, used: int, remaining: float) -> str:
+        return f"Rate limit exceeded for {key} ({used}/{self.limits.get(key, 0)}), waiting {remaining:.0f}s"
+
+    async def _sleep(self, delay: float, key: str, used: int, callback: RateLimiterCallback | None):
+        end = time.monotonic() + delay
+        while (remaining := end - time.monotonic()) > 0:
+            if callback:
+                await callback(self._wait_message(key, used, remaining), key, used, self.limits.get(key, 0))
+            await asyncio.sleep(min(1.0, remaining) if callback else remaining)
+
+    def _sleep_sync(self, delay: float, key: str, used: int, callback: RateLimiterCallback | None):
+        end = time.monotonic() + delay
+        while (remaining := end - time.monotonic()) > 0:
+            if callback:
+                # status notification only: inside a running loop it is scheduled there, not awaited
+                sync_bridge.run_or_schedule(
+                    callback(self._wait_message(key, used, remaining), key, used, self.limits.get(key, 0))
+                )
+            time.sleep(min(1.0, remaining) if callback else remaining)
+
+
+class TokenBucketRateLimiter(RateLimiterBackend):
+    """In-process buckets, limits apply per process."""
+
+    def __init__(self, seconds: int = 60, fair: bool = True):
+        super().__init__(seconds, fair)
+        self._buckets: Buckets = {}
+        self._lock = threading.Lock()
+
+    def _transact(self, fn: Callable[[Buckets, float], tuple]) -> tuple:
+        with self._lock:
+            return fn(self._buckets, time.monotonic())
+
+
+class SQLiteRateLimiter(RateLimiterBackend):
+    """Buckets stored in a local SQLite file, limits apply to all processes sharing the file."""
+
+    def __init__(self, name: str, path: str, seconds: int = 60, fair: bool = True):
+        super().__init__(seconds, fair)
+        self.name = name
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                "name TEXT NOT NULL, key TEXT NOT NULL, level REAL NOT NULL, updated REAL NOT NULL, "
+                "PRIMARY KEY (name, key))"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _transact(self, fn: Callable[[Buckets, float], tuple]) -> tuple:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")  # serializes reservations across processes
+        try:
+            rows = conn.execute(
+                "SELECT key, level, updated FROM rate_buckets WHERE name = ?", (self.name,)
+            ).fetchall()
+            buckets: Buckets = {key: [level, updated] for key, level, updated in rows}
+            result = fn(buckets, time.time())
+            conn.executemany(
+                "INSERT OR REPLACE INTO rate_buckets (name, key, level, updated) VALUES (?, ?, ?, ?)",
+                [(self.name, key, b[0], b[1]) for key, b in buckets.items()],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    async def _reserve_async(self, amounts: dict[str, int]) -> tuple[float, str, int]:
+        # the database lock may be held by another process, don't block the event loop
+        return await asyncio.to_thread(self._reserve, amounts)
+
+    async def aadd(self, **amounts: int):
+        await asyncio.to_thread(self.add, **amounts)
+
+
+def create_rate_limiter(name: str, seconds: int = 60) -> RateLimiterBackend:
+    """Create a limiter for the backend selected by A0_RATE_LIMITER_BACKEND (memory | sqlite).
+    The shared store path is A0_RATE_LIMITER_DB, fair queueing is A0_RATE_LIMITER_FAIR."""
+    backend = os.getenv("A0_RATE_LIMITER_BACKEND", "memory").lower()
+    fair = os.getenv("A0_RATE_LIMITER_FAIR", "true").lower() not in ("0", "false", "no")
+    if backend == "sqlite":
+        path = os.getenv("A0_RATE_LIMITER_DB") or os.path.join(
+            tempfile.gettempdir(), "a0_rate_limits.db"
+        )
+        return SQLiteRateLimiter(name, path, seconds=seconds, fair=fair)
+    return TokenBucketRateLimiter(seconds=seconds, fair=fair)
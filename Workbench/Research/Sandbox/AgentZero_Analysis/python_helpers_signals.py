@@ -0,0 +1,54 @@
+import asyncio, threading
+
+
+class AsyncFlag:
+    """Awaitable boolean flag, like asyncio.Event but safe to set from other threads
+    and to await from any event loop. Contexts are driven from web handler threads
+    while the agent runs in its own DeferredTask loop, so a plain Event won't do."""
+
+    def __init__(self, value: bool = False):
+        self._value = value
+        self._lock = threading.Lock()
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def is_set(self) -> bool:
+        return self._value
+
+    def set(self):
+        with self._lock:
+            if self._value:
+                return
+            self._value = True
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # loop already closed, nobody is waiting anymore
+
+    def clear(self):
+        with self._lock:
+            self._value = False
+
+    async def wait(self) -> bool:
+        if self._value:
+            return True
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self._value:
+                return True
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+        try:
+            await future
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        return True
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(True)
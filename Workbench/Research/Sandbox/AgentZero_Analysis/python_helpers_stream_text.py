@@ -0,0 +1,72 @@
+from typing import Any
+
+# text accumulated from stream deltas, handed to stream callbacks instead of a full string
+# appends are O(delta); the full string is only built when it is read and then cached until
+# the next append, so consumers that only need the delta never pay for the whole text
+
+
+class StreamText:
+    """Lazy, read-only view of a streamed text.
+
+    Reads materialize it: str(text), text.value or any str method (text.strip(),
+    "x" in text, text + "...") work as on the full string. len() and bool() do not.
+    """
+
+    __slots__ = ("_parts", "_length", "_text")
+
+    def __init__(self, text: str = ""):
+        self._parts: list[str] = [text] if text else []
+        self._length = len(text)
+        self._text: str | None = text
+
+    def append(self, delta: str):
+        if delta:
+            self._parts.append(delta)
+            self._length += len(delta)
+            self._text = None
+
+    @property
+    def value(self) -> str:
+        if self._text is None:
+            self._text = "".join(self._parts)
+            self._parts = [self._text]
+        return self._text
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"StreamText({self.value!r})"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, StreamText):
+            other = other.value
+        return self.value == other
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.value
+
+    def __getitem__(self, index):
+        return self.value[index]
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __add__(self, other: Any) -> str:
+        return self.value + str(other)
+
+    def __radd__(self, other: Any) -> str:
+        return str(other) + self.value
+
+    def __getattr__(self, name: str):
+        # any other str method (strip, replace, startswith, ...) on the materialized text
+        return getattr(self.value, name)
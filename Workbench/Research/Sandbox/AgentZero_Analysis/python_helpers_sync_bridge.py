@@ -0,0 +1,57 @@
+import asyncio, threading, warnings
+from typing import Any, Coroutine, TypeVar
+
+from python.helpers.print_style import PrintStyle
+
+T = TypeVar("T")
+
+# sync -> async bridge for extension points called from sync code
+# no event loop is created per call: without a running loop, a persistent loop of the
+# calling thread is reused
+# inside a running loop callers should await, or schedule a task there; run_sync still
+# re-enters the running loop for them (needs nest_asyncio, which agent.py applies) with a
+# deprecation warning until the remaining sync callers are converted
+
+_local = threading.local()
+_tasks: set[asyncio.Task] = set()
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run coro to completion from sync code, meant for callers outside a running event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _thread_loop().run_until_complete(coro)
+    warnings.warn(
+        "sync_bridge.run_sync() called inside a running event loop, await the coroutine (use the *_async variant) instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    # same loop, so loop-bound objects keep working (the previous asyncio.run under nest_asyncio)
+    return loop.run_until_complete(coro)
+
+
+def run_or_schedule(coro: Coroutine[Any, Any, T]) -> "T | asyncio.Task[T]":
+    """Run coro to completion without a running loop, otherwise start it as a task on the
+    running loop and return the task (a reference is kept until it finishes)."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _thread_loop().run_until_complete(coro)
+    task = loop.create_task(coro)
+    _tasks.add(task)
+    task.add_done_callback(_task_done)
+    return task
+
+
+def _task_done(task: asyncio.Task):
+    _tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        PrintStyle(font_color="red", padding=True).print(f"Scheduled task failed: {task.exception()!r}")
+
+
+def _thread_loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _local.loop = asyncio.new_event_loop()
+    return loop
@@ -0,0 +1,154 @@
+import os, threading
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from python.helpers import tokens
+
+# token counting for rate limiting:
+#  - counts are cached per message content, so a history is tokenized once per message
+#    and every following call only sums the cached counts
+#  - the tokenizer backend is pluggable (approximate by default, exact BPE optional)
+#  - streamed deltas are estimated by length and reconciled with one exact count at the end
+
+MESSAGE_OVERHEAD = 4  # role and separator tokens per chat message
+CACHE_MIN_LENGTH = 64  # shorter texts are cheaper to count than to cache
+CHARS_PER_TOKEN = 4
+
+# cl100k_base split pattern, used when loading a local BPE vocabulary file
+_CL100K_PATTERN = r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]++[\r\n]*|\s*[\r\n]|\s+(?!\S)|\s+"""
+
+
+class TokenizerBackend(Protocol):
+    def count(self, text: str) -> int: ...
+
+
+class ApproximateBackend:
+    def count(self, text: str) -> int:
+        return tokens.approximate_tokens(text)
+
+
+class TiktokenBackend:
+    """Exact counts with a tiktoken encoding, or a local .tiktoken BPE vocabulary file."""
+
+    def __init__(
+        self,
+        encoding_name: str = "cl100k_base",
+        bpe_file: str | None = None,
+        pat_str: str = _CL100K_PATTERN,
+    ):
+        import tiktoken
+
+        if bpe_file:
+            from tiktoken.load import load_tiktoken_bpe
+
+            self.encoding = tiktoken.Encoding(
+                name=os.path.basename(bpe_file),
+                pat_str=pat_str,
+                mergeable_ranks=load_tiktoken_bpe(bpe_file),
+                special_tokens={},
+            )
+        else:
+            self.encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode_ordinary(text))
+
+
+class TokenCounter:
+    def __init__(self, backend: TokenizerBackend | None = None, max_entries: int = 4096):
+        self.backend: TokenizerBackend = backend or ApproximateBackend()
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set_backend(self, backend: TokenizerBackend):
+        with self._lock:
+            self.backend = backend
+            self._cache.clear()
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if len(text) < CACHE_MIN_LENGTH:
+            return self.backend.count(text)
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return cached
+        count = self.backend.count(text)
+        with self._lock:
+            self._cache[text] = count
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return count
+
+    def count_content(self, content: Any) -> int:
+        if isinstance(content, str):
+            return self.count(content)
+        if isinstance(content, list):
+            total = 0
+            for part in content:
+                if isinstance(part, dict) and part.get("type") == "text":
+                    total += self.count(part.get("text", ""))
+                else:
+                    total += self.count(str(part))
+            return total
+        return self.count(str(content)) if content else 0
+
+    def count_messages(self, messages: list) -> int:
+        total = 0
+        for msg in messages:
+            if isinstance(msg, dict):
+                total += MESSAGE_OVERHEAD + self.count_content(msg.get("content", ""))
+                if msg.get("tool_calls"):
+                    total += self.count(str(msg["tool_calls"]))
+            else:
+                total += MESSAGE_OVERHEAD + self.count_content(getattr(msg, "content", msg))
+        return total
+
+    def count_input(self, value: str | list) -> int:
+        """Count a prompt given as text, a list of texts or a list of chat messages."""
+        if isinstance(value, str):
+            return self.count(value)
+        if value and all(isinstance(v, str) for v in value):
+            return sum(self.count(v) for v in value)
+        return self.count_messages(value)
+
+
+class StreamTokenCounter:
+    """Per-stream output counter. add() estimates a delta by length without tokenizing,
+    finalize() counts the full text once and returns the correction to the estimates."""
+
+    def __init__(self, counter: TokenCounter | None = None):
+        self.counter = counter or default_counter
+        self.chars = 0
+        self.estimated = 0
+
+    def add(self, delta: str) -> int:
+        self.chars += len(delta)
+        total = -(-self.chars // CHARS_PER_TOKEN)
+        tokens_delta = total - self.estimated
+        self.estimated = total
+        return tokens_delta
+
+    def finalize(self, text: str) -> int:
+        exact = self.counter.count(text)
+        correction = exact - self.estimated
+        self.estimated = exact
+        return correction
+
+
+default_counter = TokenCounter()
+
+
+def set_backend(backend: TokenizerBackend):
+    default_counter.set_backend(backend)
+
+
+def count_tokens(text: str) -> int:
+    return default_counter.count(text)
+
+
+def count_input(value: str | list) -> int:
+    return default_counter.count_input(value)
@@ -0,0 +1,182 @@
+import os, threading, time
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from python.helpers import extract_tools, subagents
+
+T = TypeVar("T")
+
+# file signature used to detect changes without importing: (mtime_ns, size), None if missing
+Signature = tuple[int, int] | None
+
+# seconds a resolved list of candidate files is reused for the same tool, profile and context;
+# resolving checks which folders exist, and a project switch has to be seen eventually
+PATHS_TTL = 2.0
+PATHS_MAX = 1024
+
+
+def _signature(path: str) -> Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _snapshot(paths: list[str]) -> tuple[tuple[str, Signature], ...]:
+    return tuple((p, _signature(p)) for p in paths)
+
+
+def _is_current(snapshot: tuple[tuple[str, Signature], ...]) -> bool:
+    return all(_signature(p) == sig for p, sig in snapshot)
+
+
+@dataclass
+class _Lookup:
+    tool_class: Any  # None = negative entry, caller falls back to Unknown
+    snapshot: tuple[tuple[str, Signature], ...]  # every candidate file, missing ones as None
+
+
+class ToolRegistry:
+    """Process-wide cache of tool classes.
+
+    Classes are cached per resolved file path and (mtime, size), so a module is only
+    imported again after it changes. Name lookups are cached per tool name and list of
+    candidate files from the agent's folder hierarchy, names that resolve to no class
+    are cached as well (negative caching). A candidate file that appears, changes or
+    disappears invalidates the lookup, so new and edited tools are picked up.
+    Without a watcher each lookup is validated by a stat call per candidate, with a
+    watcher running the watcher drops stale entries instead. The candidate list itself
+    is resolved at most every PATHS_TTL seconds per tool name, profile and context.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._classes: dict[str, tuple[Signature, list[type]]] = {}
+        self._lookups: dict[tuple[str, tuple[str, ...]], _Lookup] = {}
+        self._paths: dict[tuple[str, str, str], tuple[float, tuple[str, ...]]] = {}
+        self._watcher: threading.Thread | None = None
+        self._watch_stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def get_tool_class(self, agent: Any, name: str, base_class: type[T]) -> type[T] | None:
+        # the candidates depend on more than the profile (e.g. the project), so they are the key
+        paths = self._candidate_paths(agent, name)
+        key = (name, paths)
+        with self._lock:
+            entry = self._lookups.get(key)
+            if entry and (self.watching or _is_current(entry.snapshot)):
+                self.hits += 1
+                return entry.tool_class
+            self.misses += 1
+
+        # resolve outside the lock, imports may take a while
+        tool_class = None
+        for path in paths:
+            try:
+                classes = self.load_classes(path, base_class)
+            except Exception:
+                continue
+            tool_class = classes[0] if classes else None
+            break
+
+        with self._lock:
+            self._lookups[key] = _Lookup(tool_class, _snapshot(paths))
+        return tool_class
+
+    def _candidate_paths(self, agent: Any, name: str) -> tuple[str, ...]:
+        config = getattr(agent, "config", None)
+        context = getattr(agent, "context", None)
+        memo_key = (name, str(getattr(config, "profile", "")), str(getattr(context, "id", "")))
+        now = time.monotonic()
+        with self._lock:
+            memo = self._paths.get(memo_key)
+        if memo and memo[0] > now:
+            return memo[1]
+        paths = tuple(subagents.get_paths(agent, "tools", name + ".py", default_root="python"))
+        with self._lock:
+            if len(self._paths) >= PATHS_MAX:
+                self._paths = {k: v for k, v in self._paths.items() if v[0] > now}
+            self._paths[memo_key] = (now + PATHS_TTL, paths)
+        return paths
+
+    def load_classes(self, path: str, base_class: type[T]) -> list[type[T]]:
+        abs_path = os.path.realpath(path)
+        sig = _signature(abs_path)
+        with self._lock:
+            cached = self._classes.get(abs_path)
+            if cached and cached[0] == sig:
+                return cached[1]  # type: ignore[return-value]
+        classes = extract_tools.load_classes_from_file(abs_path, base_class)
+        with self._lock:
+            if cached:
+                self.reloads += 1
+            self._classes[abs_path] = (sig, classes)  # type: ignore[assignment]
+        return classes
+
+    def invalidate(self, path: str | None = None):
+        """Drop cached entries for a file, or everything if no path is given."""
+        with self._lock:
+            if path is None:
+                self._lookups.clear()
+                self._classes.clear()
+                self._paths.clear()
+                return
+            abs_path = os.path.realpath(path)
+            self._classes.pop(abs_path, None)
+            for key, entry in list(self._lookups.items()):
+                if any(os.path.realpath(p) == abs_path for p, _ in entry.snapshot):
+                    del self._lookups[key]
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def watch(self, interval: float = 1.0):
+        """Start a background thread polling candidate tool files for changes."""
+        if self.watching:
+            return
+        self._watch_stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(interval,), name="ToolRegistryWatcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._watch_stop.set()
+        if self._watcher:
+            self._watcher.join()
+        self._watcher = None
+
+    def _watch_loop(self, interval: float):
+        while not self._watch_stop.wait(interval):
+            with self._lock:
+                lookups = list(self._lookups.items())
+            stale = [key for key, entry in lookups if not _is_current(entry.snapshot)]
+            if stale:
+                with self._lock:
+                    for key in stale:
+                        self._lookups.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "classes": len(self._classes),
+                "lookups": len(self._lookups),
+            }
+
+
+_registry = ToolRegistry()
+
+
+def get_registry() -> ToolRegistry:
+    return _registry
+
+
+def get_tool_class(agent: Any, name: str, base_class: type[T]) -> type[T] | None:
+    return _registry.get_tool_class(agent, name, base_class)